@@ -0,0 +1,169 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Benchmarks for funpy
+
+Run `python -m bench --help` for usage.  Every benchmark is a `(name,
+implementation, prepare)` tuple, `prepare` taking a size and returning the
+`(setup, stmt)` pair of callables to time.  `setup` (if not `None`) is
+called before every single run of `stmt`, which is useful to time
+operations whose result is cached.
+'''
+
+import sys
+import json
+import timeit
+import platform
+
+from . import cons, maybe
+
+BENCHMARKS = cons.BENCHMARKS + maybe.BENCHMARKS
+
+SIZES = 10, 100, 1000, 10000, 100000, 1000000
+
+def measure(setup, stmt, min_time=0.2, repeat=3):
+    '''Measure the time a single call of `stmt` takes
+
+    Without `setup`, `stmt` is called as many times as needed to take at
+    least `min_time` seconds.  The best of `repeat` measurements is used.
+
+    :param setup: callable run before every call of `stmt`, or `None`
+    :type setup: callable
+    :param stmt: callable to time
+    :type stmt: callable
+    :param min_time: minimal duration of a measurement in seconds
+    :type min_time: float
+    :param repeat: number of measurements
+    :type repeat: int
+
+    :return: duration of a single call in seconds
+    :rtype: float
+    '''
+    if setup is not None:
+        timer = timeit.Timer(stmt, setup)
+        return min(timer.repeat(repeat * 3, 1))
+
+    timer = timeit.Timer(stmt)
+
+    number = 1
+    while True:
+        time = timer.timeit(number)
+        if time >= min_time:
+            break
+
+        number *= 10 if time < min_time / 10 else 2
+
+    return min([time] + timer.repeat(repeat - 1, number)) / number
+
+def run(benchmarks, sizes, min_time=0.2, repeat=3, report=None):
+    '''Run benchmarks for all sizes
+
+    Benchmarks of implementations not supporting an operation (raising
+    `TypeError`, e.g. hashing a `list`) are skipped.
+
+    :param benchmarks: benchmarks to run
+    :type benchmarks: iterable
+    :param sizes: sizes to run every benchmark with
+    :type sizes: iterable
+    :param min_time: minimal duration of a measurement in seconds
+    :type min_time: float
+    :param repeat: number of measurements
+    :type repeat: int
+    :param report: callable receiving every result when it's available
+    :type report: callable
+
+    :return: results as dictionaries with `name`, `implementation`, `size`
+        and `time` keys
+    :rtype: list
+    '''
+    results = list()
+
+    for (name, implementation, prepare) in benchmarks:
+        for size in sizes:
+            setup, stmt = prepare(size)
+
+            try:
+                if setup is not None:
+                    setup()
+                stmt()
+            except TypeError:
+                continue
+
+            result = dict(name=name, implementation=implementation,
+                          size=size, time=measure(setup, stmt, min_time,
+                                                  repeat))
+            results.append(result)
+
+            if report:
+                report(result)
+
+    return results
+
+def compare(results, baseline, threshold=0.1):
+    '''Compare results to a baseline
+
+    :param results: results of `run`
+    :type results: list
+    :param baseline: results of an earlier `run`
+    :type baseline: list
+    :param threshold: relative slowdown considered a regression
+    :type threshold: float
+
+    :return: `(result, ratio, regression)` tuples for every result with a
+        baseline, `ratio` being the duration relative to the baseline
+    :rtype: list
+    '''
+    key = lambda result: \
+            (result['name'], result['implementation'], result['size'])
+    times = dict((key(result), result['time']) for result in baseline)
+
+    comparison = list()
+    for result in results:
+        time = times.get(key(result))
+        if not time:
+            continue
+
+        ratio = result['time'] / time
+        comparison.append((result, ratio, ratio > 1 + threshold))
+
+    return comparison
+
+def save(results, file_):
+    '''Save results as JSON
+
+    :param results: results of `run`
+    :type results: list
+    :param file_: file to write to
+    :type file_: file
+    '''
+    json.dump(dict(python=sys.version, platform=platform.platform(),
+                   results=results),
+              file_, indent=1, sort_keys=True)
+
+def load(file_):
+    '''Load results saved by `save`
+
+    :param file_: file to read from
+    :type file_: file
+
+    :return: results
+    :rtype: list
+    '''
+    return json.load(file_)['results']
@@ -0,0 +1,95 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Command line benchmark runner
+
+Results are printed while the benchmarks run, and can be saved as JSON.
+When a baseline is given, the exit status is 1 if any benchmark regressed.
+'''
+
+import sys
+import optparse
+
+from bench import BENCHMARKS, SIZES, compare, load, run, save
+
+def main(args):
+    '''Run the benchmarks'''
+    parser = optparse.OptionParser(usage='%prog [options] [pattern...]',
+                                   description='Run benchmarks whose name '
+                                   'or implementation contains a pattern, '
+                                   'or all of them.')
+    parser.add_option('-s', '--sizes', default=','.join(map(str, SIZES)),
+                      help='comma-separated sizes [%default]')
+    parser.add_option('-t', '--min-time', type='float', default=0.2,
+                      help='minimal duration of a measurement [%default]')
+    parser.add_option('-r', '--repeat', type='int', default=3,
+                      help='number of measurements [%default]')
+    parser.add_option('-o', '--output', metavar='FILE',
+                      help='save results as JSON')
+    parser.add_option('-c', '--compare', metavar='FILE',
+                      help='compare to baseline results')
+    parser.add_option('--threshold', type='float', default=0.1,
+                      help='relative slowdown considered a regression '
+                      '[%default]')
+
+    options, patterns = parser.parse_args(args)
+
+    benchmarks = [benchmark for benchmark in BENCHMARKS
+                  if not patterns or any(pattern in '%s/%s' % benchmark[:2]
+                                         for pattern in patterns)]
+    sizes = [int(size) for size in options.sizes.split(',')]
+
+    baseline = None
+    if options.compare:
+        with open(options.compare) as file_:
+            baseline = load(file_)
+
+    def report(result):
+        '''Print a result, compared to the baseline if available'''
+        line = '%(name)-20s %(implementation)-10s %(size)8d ' \
+                '%(time)12.9f' % result
+
+        if baseline is not None:
+            for (_, ratio, regression) in compare([result], baseline,
+                                                  options.threshold):
+                line += ' %6.2fx%s' % (ratio, ' REGRESSION' * regression)
+
+        print line
+        sys.stdout.flush()
+
+    results = run(benchmarks, sizes, options.min_time, options.repeat,
+                  report)
+
+    if options.output:
+        with open(options.output, 'w') as file_:
+            save(results, file_)
+
+    if baseline is not None:
+        regressions = [result for (result, _, regression)
+                       in compare(results, baseline, options.threshold)
+                       if regression]
+        if regressions:
+            print '%d regression(s)' % len(regressions)
+            return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,118 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Benchmarks of Cons list implementations and builtin sequences
+
+Every benchmark is a function taking a function which builds a sequence from
+an iterable and the size of the sequence, returning the `(setup, stmt)` pair
+to time.
+'''
+
+from funpy.cons import iterative_from_iterable, recursive_from_iterable, \
+        sized_from_iterable, unrolled_from_iterable, interned_from_iterable
+from funpy.ralist import skew_from_iterable
+
+IMPLEMENTATIONS = (
+    ('iterative', iterative_from_iterable),
+    ('recursive', recursive_from_iterable),
+    ('sized', sized_from_iterable),
+    ('unrolled', unrolled_from_iterable),
+    ('interned', interned_from_iterable),
+    ('skew', skew_from_iterable),
+    ('list', list),
+    ('tuple', tuple),
+)
+
+def fresh(build, size, fun):
+    '''Time `fun` on a freshly built sequence, so no cached state is used'''
+    state = [None]
+
+    def setup():
+        '''Build a new sequence'''
+        state[0] = build(xrange(size))
+
+    return setup, lambda: fun(state[0])
+
+def len_(build, size):
+    '''Calculate the length'''
+    return fresh(build, size, len)
+
+def index(build, size):
+    '''Retrieve the item in the middle'''
+    seq = build(xrange(size))
+    return None, lambda: seq[size // 2]
+
+def contains(build, size):
+    '''Look for an item which isn't present'''
+    seq = build(xrange(size))
+    return None, lambda: -1 in seq
+
+def eq(build, size):
+    '''Compare two equal sequences sharing no cells'''
+    seq1 = build(xrange(size))
+    seq2 = build(xrange(size))
+    return None, lambda: seq1 == seq2
+
+def hash_(build, size):
+    '''Calculate the hash of a sequence'''
+    return fresh(build, size, hash)
+
+def str_(build, size):
+    '''Create the string representation'''
+    seq = build(xrange(size))
+    return None, lambda: str(seq)
+
+def repr_(build, size):
+    '''Create the string representation using `repr`'''
+    seq = build(xrange(size))
+    return None, lambda: repr(seq)
+
+def iter_(build, size):
+    '''Iterate over all items'''
+    seq = build(xrange(size))
+
+    def stmt():
+        '''Iterate over the sequence'''
+        for _ in seq:
+            pass
+
+    return None, stmt
+
+def from_iterable(build, size):
+    '''Build a sequence from an iterable'''
+    items = range(size)
+    return None, lambda: build(items)
+
+BENCHMARKS = tuple(
+    ('cons.%s' % name, implementation,
+     (lambda benchmark, build: lambda size: benchmark(build, size))(
+         benchmark, build))
+    for (name, benchmark) in (
+        ('len', len_),
+        ('index', index),
+        ('contains', contains),
+        ('eq', eq),
+        ('hash', hash_),
+        ('str', str_),
+        ('repr', repr_),
+        ('iter', iter_),
+        ('from_iterable', from_iterable),
+    )
+    for (implementation, build) in IMPLEMENTATIONS)
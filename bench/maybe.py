@@ -0,0 +1,85 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Benchmarks of Maybe binding and arithmetic
+
+Every benchmark processes a batch of `size` values, starting from `Just`
+values, from `Nothing`, or from values failing halfway.
+'''
+
+from funpy.maybe import Just, Nothing
+from funpy.monad import liftM
+
+STEPS = 10
+
+IMPLEMENTATIONS = (
+    ('just', lambda size: [Just(i) for i in xrange(size)], 1),
+    ('nothing', lambda size: [Nothing] * size, 1),
+    ('failing', lambda size: [Just(i) for i in xrange(size)], 0),
+)
+
+def bind(values, divisor):
+    '''Bind a chain of `STEPS` functions'''
+    funs = [lambda x: Just(x + 1)] * (STEPS // 2) + \
+            [lambda x: Just(x // divisor)] + \
+            [lambda x: Just(x * 2)] * (STEPS - STEPS // 2 - 1)
+
+    def stmt():
+        '''Bind all functions to all values'''
+        for value in values:
+            for fun in funs:
+                value = value.bind(fun)
+
+    return stmt
+
+def lift(values, divisor):
+    '''Bind a chain of `STEPS` functions lifted using `liftM`'''
+    funs = [lambda x: x + 1] * (STEPS // 2) + \
+            [lambda x: x // divisor] + \
+            [lambda x: x * 2] * (STEPS - STEPS // 2 - 1)
+
+    def stmt():
+        '''Lift and bind all functions to all values'''
+        for value in values:
+            for fun in funs:
+                value = liftM(fun)(value)
+
+    return stmt
+
+def arithmetic(values, divisor):
+    '''Calculate a formula of `STEPS` operators'''
+    def stmt():
+        '''Calculate the formula for all values'''
+        for value in values:
+            (-((value + 1) * 3 - 2) // divisor % 7 + abs(value) ** 2) / 5
+
+    return stmt
+
+BENCHMARKS = tuple(
+    ('maybe.%s' % name, implementation,
+     (lambda benchmark, values, divisor: lambda size: \
+         (None, benchmark(values(size), divisor)))(
+             benchmark, values, divisor))
+    for (name, benchmark) in (
+        ('bind', bind),
+        ('liftM', lift),
+        ('arithmetic', arithmetic),
+    )
+    for (implementation, values, divisor) in IMPLEMENTATIONS)
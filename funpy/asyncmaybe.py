@@ -0,0 +1,264 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Maybe values computed concurrently
+
+An `AsyncMaybe` is a Maybe value which may not be available yet.  `spawn`
+runs a function in a background thread, binding functions to its result
+chains them without blocking, and `gather` combines several values being
+computed concurrently.  `result` waits for the final Maybe value:
+
+    >>> user = spawn(lookup_user, user_id)
+    >>> profile = user.bind(lambda user: spawn(lookup_profile, user))
+    >>> both = gather(profile, spawn(lookup_settings, user_id))
+    >>> both.result()
+    Just((profile, settings))
+
+Exceptions raised by spawned or bound functions result in `Nothing`, like
+they do in `Just.bind`.  Functions returning anything but a Maybe value or
+an `AsyncMaybe` are an error instead: `result` raises a `TypeError` for the
+value and for all values depending on it.
+'''
+
+import threading
+
+from .monad import Monad
+from .maybe import Maybe, Just, Nothing
+
+class AsyncMaybe(Monad):
+    '''Maybe value which becomes available later
+
+    Bound functions are called by the thread resolving the value, or right
+    away if it's resolved already.  When they return an `AsyncMaybe`, its
+    result is used once available.
+    '''
+    __slots__ = '_lock', '_event', '_value', '_error', '_callbacks',
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._value = None
+        self._error = None
+        self._callbacks = list()
+
+    @classmethod
+    def resolved(cls, value):
+        '''Create an AsyncMaybe which is available already
+
+        :param value: resolved value
+        :type value: Maybe
+
+        :return: new AsyncMaybe
+        :rtype: AsyncMaybe
+        '''
+        pending = cls()
+        pending._resolve(value) #pylint: disable-msg=W0212
+        return pending
+
+    return_ = lambda self, value: self.resolved(Just(value))
+    fail = lambda self, _: self.resolved(Nothing)
+
+    done = property(lambda self: self._event.isSet(),
+                    doc='Value is available')
+
+    def _resolve(self, value):
+        '''Resolve the value, unless resolved before
+
+        Anything but a Maybe value or an AsyncMaybe is rejected with a
+        `TypeError`.
+
+        :param value: resolved value, or an AsyncMaybe to resolve with
+        :type value: Maybe
+        '''
+        if isinstance(value, AsyncMaybe):
+            value._then(self._resolve, self) #pylint: disable-msg=W0212
+        elif isinstance(value, Maybe):
+            self._settle(value, None)
+        else:
+            self._reject(TypeError(
+                'Expected a Maybe value or an AsyncMaybe, got %r' % (value, )))
+
+    def _reject(self, error):
+        '''Resolve the value as an error, unless resolved before
+
+        :param error: exception raised by `result`
+        :type error: Exception
+        '''
+        self._settle(None, error)
+
+    def _settle(self, value, error):
+        '''Store the value or error and run the callbacks waiting for it'''
+        with self._lock:
+            if self._event.isSet():
+                return
+
+            self._value = value
+            self._error = error
+            self._event.set()
+
+            callbacks, self._callbacks = self._callbacks, None
+
+        for (callback, dependent) in callbacks:
+            self._run_callback(callback, dependent)
+
+    def _then(self, callback, dependent):
+        '''Call `callback` with the value once it's available
+
+        If the value is an error, or `callback` raises an exception,
+        `dependent` is rejected with it instead.
+
+        :param callback: function taking the resolved Maybe value
+        :type callback: callable
+        :param dependent: value resolved by `callback`
+        :type dependent: AsyncMaybe
+        '''
+        with self._lock:
+            if not self._event.isSet():
+                self._callbacks.append((callback, dependent))
+                return
+
+        self._run_callback(callback, dependent)
+
+    def _run_callback(self, callback, dependent):
+        '''Call `callback` with the available value, or reject `dependent`'''
+        #pylint: disable-msg=W0212
+        if self._error is not None:
+            dependent._reject(self._error)
+            return
+
+        try:
+            callback(self._value)
+        except Exception, exc: #pylint: disable-msg=W0703
+            dependent._reject(exc)
+
+    def bind(self, fun):
+        '''Bind a function to the value once it's available
+
+        :param fun: function taking a value and returning a Maybe value or
+            an AsyncMaybe
+        :type fun: callable
+
+        :return: result of the bind
+        :rtype: AsyncMaybe
+        '''
+        pending = AsyncMaybe()
+        #pylint: disable-msg=W0212
+        self._then(lambda value: pending._resolve(value.bind(fun)), pending)
+        return pending
+
+    def result(self, timeout=None):
+        '''Wait for the value
+
+        :param timeout: maximal number of seconds to wait, if any
+        :type timeout: float
+
+        :return: resolved value
+        :rtype: Maybe
+
+        :raise TypeError: a function returned anything but a Maybe value or
+            an AsyncMaybe
+        '''
+        self._event.wait(timeout)
+        if not self._event.isSet():
+            raise RuntimeError('Value not available yet')
+
+        if self._error is not None:
+            raise self._error
+
+        return self._value
+
+    _state = lambda self: Ellipsis if not self.done \
+            else self._error if self._error is not None else self._value
+    __str__ = lambda self: 'AsyncMaybe(%s)' % \
+            ('...' if not self.done else self._state())
+    __repr__ = lambda self: 'AsyncMaybe(%r)' % (self._state(), )
+
+
+def _run(pending, fun, args, kwargs):
+    '''Resolve an AsyncMaybe with the result of `fun`'''
+    try:
+        value = fun(*args, **kwargs)
+    except Exception: #pylint: disable-msg=W0703
+        value = Nothing
+
+    pending._resolve(value) #pylint: disable-msg=W0212
+
+def spawn(fun, *args, **kwargs):
+    '''Call a function in a new background thread
+
+    :param fun: function returning a Maybe value or an AsyncMaybe
+    :type fun: callable
+
+    :return: result of the call
+    :rtype: AsyncMaybe
+    '''
+    pending = AsyncMaybe()
+
+    thread = threading.Thread(target=_run, args=(pending, fun, args, kwargs))
+    thread.setDaemon(True)
+    thread.start()
+
+    return pending
+
+def gather(*maybes):
+    '''Combine values being computed concurrently
+
+    The result is resolved as `Nothing` as soon as any of the values is
+    `Nothing`, without waiting for the others, or as `Just` a tuple of all
+    values once they're available.
+
+    :param maybes: AsyncMaybe or Maybe values
+    :type maybes: tuple
+
+    :return: combined value
+    :rtype: AsyncMaybe
+    '''
+    result = AsyncMaybe()
+    collected = [None] * len(maybes)
+    remaining = [len(maybes)]
+    lock = threading.Lock()
+
+    if not maybes:
+        result._resolve(Just(())) #pylint: disable-msg=W0212
+
+    def collect(index, value):
+        '''Store a value, resolving the result if possible'''
+        #pylint: disable-msg=W0212
+        if value is Nothing:
+            result._resolve(Nothing)
+            return
+
+        with lock:
+            collected[index] = value._value
+            remaining[0] -= 1
+            complete = not remaining[0]
+
+        if complete:
+            result._resolve(Just(tuple(collected)))
+
+    for (index, maybe) in enumerate(maybes):
+        if not isinstance(maybe, AsyncMaybe):
+            maybe = AsyncMaybe.resolved(maybe)
+
+        #pylint: disable-msg=W0212
+        maybe._then(lambda value, index=index: collect(index, value),
+                    result)
+
+    return result
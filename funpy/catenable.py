@@ -0,0 +1,233 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Persistent catenable list
+
+A catenable list is a non-empty Cons list followed by a deque of non-empty
+catenable lists, after Okasaki's catenable lists.  Cons lists of any
+implementation are wrapped without copying them.  Concatenation appends to
+the deque of the left-hand list, taking amortised constant time, `head` and
+`tail` take amortised constant time, and iteration walks all wrapped lists
+without creating any intermediate tails.
+
+Catenable lists compare equal to Cons lists holding the same items, and
+have the same hash.
+'''
+
+from itertools import izip
+
+from .cons import ConsCell, IterativeNil, const, assert_not_reached
+from .deque import EmptyDeque
+
+class Catenable(object):
+    '''Persistent list supporting constant-time concatenation'''
+    __slots__ = '_list', '_queue', '_tail', '_length', '_hash',
+
+    def __init__(self, list_, queue):
+        '''Initialize a new catenable list
+
+        :param list_: first items
+        :type list_: ConsCell
+        :param queue: catenable lists following `list_`
+        :type queue: Deque
+        '''
+        self._list = list_
+        self._queue = queue
+        self._tail = None
+        self._length = None
+        self._hash = None
+
+    empty = property(const(False), doc='List is empty')
+    __nonzero__ = const(True)
+
+    head = property(lambda self: self._list.head, doc='Head value')
+
+    def _get_tail(self):
+        '''Retrieve the list following the head, creating it once'''
+        if self._tail is None:
+            self._tail = self._create_tail()
+
+        return self._tail
+
+    def _create_tail(self):
+        '''Create the list following the head'''
+        #pylint: disable-msg=W0212
+        tail = self._list.tail
+        if not tail.empty:
+            return Catenable(tail, self._queue)
+
+        if self._queue.empty:
+            return EmptyCatenable
+
+        lists = list(self._queue)
+        result = lists.pop()
+        while lists:
+            list_ = lists.pop()
+            result = Catenable(list_._list, list_._queue.push_back(result))
+
+        return result
+
+    tail = property(_get_tail, doc='Tail list')
+
+    def __add__(self, other):
+        other = catenable(other)
+        if other.empty:
+            return self
+
+        return Catenable(self._list, self._queue.push_back(other))
+
+    def __radd__(self, other):
+        return catenable(other) + self
+
+    concat = __add__
+
+    __lshift__ = lambda self, other: Catenable(self._list << other,
+                                               self._queue)
+
+    def _lists(self):
+        '''Generate all wrapped Cons lists, in order'''
+        #pylint: disable-msg=W0212
+        stack = [self]
+        while stack:
+            list_ = stack.pop()
+            yield list_._list
+            stack.extend(reversed(tuple(list_._queue)))
+
+    def __iter__(self):
+        for list_ in self._lists():
+            for item in list_:
+                yield item
+
+    def __len__(self):
+        if self._length is None:
+            self._length = sum(len(list_) for list_ in self._lists())
+
+        return self._length
+
+    def __getitem__(self, key):
+        if not isinstance(key, (int, long)):
+            raise TypeError
+
+        if key < 0:
+            key += len(self)
+            if key < 0:
+                raise IndexError
+
+        for list_ in self._lists():
+            length = len(list_)
+            if key < length:
+                return list_[key]
+
+            key -= length
+
+        raise IndexError
+
+    __contains__ = lambda self, item: \
+            any(item in list_ for list_ in self._lists())
+
+    def __eq__(self, other):
+        if isinstance(other, Catenable):
+            #pylint: disable-msg=W0212
+            if self._hash is not None and other._hash is not None and \
+                    self._hash != other._hash:
+                return False
+
+            return len(self) == len(other) and \
+                    all(a == b for (a, b) in izip(self, other))
+
+        if not hasattr(other, 'empty') or not hasattr(other, 'tail'):
+            return NotImplemented
+
+        cell = other
+        for item in self:
+            if cell.empty or cell.head != item:
+                return False
+
+            cell = cell.tail
+
+        return cell.empty
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        if self._hash is None:
+            hash_ = hash(IterativeNil)
+            for item in reversed(tuple(self)):
+                hash_ = hash(31 * hash_ + hash(item))
+
+            self._hash = hash_
+
+        return self._hash
+
+    _stringify = lambda self, fun: \
+            'Catenable([' + ', '.join(fun(item) for item in self) + '])'
+    __str__ = lambda self: self._stringify(str)
+    __unicode__ = lambda self: unicode(self._stringify(unicode))
+    __repr__ = lambda self: self._stringify(repr)
+
+    __reduce__ = lambda self: (catenable, (IterativeNil._build(self), ))
+
+
+class EmptyCatenable(Catenable):
+    '''Empty catenable list'''
+    __slots__ = tuple()
+
+    #pylint: disable-msg=W0231
+    __init__ = const(None)
+
+    empty = property(const(True), doc='List is empty')
+    __nonzero__ = const(False)
+
+    head = property(assert_not_reached)
+    tail = property(assert_not_reached)
+
+    __add__ = concat = lambda self, other: catenable(other)
+    __lshift__ = lambda self, other: catenable(IterativeNil << other)
+
+    _lists = lambda self: iter(tuple())
+    __len__ = const(0)
+    __eq__ = lambda self, other: self.empty is getattr(other, 'empty', None)
+    __hash__ = lambda self: hash(IterativeNil)
+
+    _stringify = const('EmptyCatenable')
+    __reduce__ = lambda self: 'EmptyCatenable'
+EmptyCatenable = EmptyCatenable() #pylint: disable-msg=C0103
+
+def catenable(list_):
+    '''Wrap a list into a catenable list, without copying it
+
+    :param list_: Cons list or catenable list
+    :type list_: ConsCell
+
+    :return: catenable list
+    :rtype: Catenable
+    '''
+    if isinstance(list_, Catenable):
+        return list_
+
+    if not isinstance(list_, ConsCell):
+        raise TypeError('Not a Cons list: %r' % (list_, ))
+
+    if list_.empty:
+        return EmptyCatenable
+
+    return Catenable(list_, EmptyDeque)
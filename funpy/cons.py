@@ -19,7 +19,14 @@
 
 '''Cons list implementation'''
 
+import array
 import operator
+import weakref
+import multiprocessing
+
+from itertools import ifilter, imap, islice, izip, izip_longest
+
+from .trampoline import call, done, run, then
 
 swap_args = lambda fun: lambda a, b: fun(b, a) #pylint: disable-msg=C0103,E0601
 swap_args.__doc__ = '''
@@ -53,7 +60,7 @@ def assert_not_reached(*_):
 
 class ConsCell(object): #pylint: disable-msg=R0903
     '''Base class for Cons cell implementations'''
-    __slots__ = '_head', '_tail',
+    __slots__ = '_head', '_tail', '_hash',
 
     def __init__(self, head, tail):
         '''Initialize a new cell
@@ -65,6 +72,7 @@ class ConsCell(object): #pylint: disable-msg=R0903
         '''
         self._head = head
         self._tail = tail
+        self._hash = None
 
     head = property(operator.attrgetter('_head'), doc='Head value')
     tail = property(operator.attrgetter('_tail'), doc='Tail cell')
@@ -72,19 +80,53 @@ class ConsCell(object): #pylint: disable-msg=R0903
     __nonzero__ = const(True)
     __lshift__ = lambda self, other: type(self)(other, self)
 
-    _stringify = not_implemented
+    _stringify = lambda self, fun: _stringify(self, fun, STRINGIFY_LIMIT)
     #pylint: disable-msg=W0212
     __str__ = lambda self: self._stringify(str)
     __unicode__ = lambda self: self._stringify(unicode)
     __repr__ = lambda self: self._stringify(repr)
     #pylint: enable-msg=W0212
 
+    def write(self, file_, fun=str, limit=None):
+        '''Write the string-representation of the list to a file
+
+        The representation is written in chunks while traversing the list
+        once, so it is never built in memory as a whole.  When `limit` is
+        given and the list holds more items, the ones beyond `limit` are
+        elided as `...`.  If the length of the list is known cheaply, the
+        elided items are the ones in the middle, so the last items are
+        written too.  Otherwise no items beyond `limit` are retrieved at
+        all, so lazy lists aren't forced further.
+
+        :param file_: file-like object to write to
+        :type file_: object
+        :param fun: function to turn an item into a string
+        :type fun: callable
+        :param limit: maximum number of items to write, or `None`
+        :type limit: int
+        '''
+        _write(self, file_, fun, limit)
+
+    _length_hint = const(None)
+    _length_hint.__doc__ = '''
+    Retrieve the length of the list if it's known without traversing it
+
+    :return: length of the list, or `None` if not known
+    :rtype: int
+    '''.strip()
+
     __len__ = not_implemented
     __getitem__ = not_implemented
     __contains__ = not_implemented
     __iter__ = not_implemented
     __eq__ = not_implemented
 
+    _build = staticmethod(not_implemented)
+
+    #pylint: disable-msg=W0212
+    __reduce__ = lambda self: (_unflatten, (type(self), tuple(self)))
+    #pylint: enable-msg=W0212
+
     def __ne__(self, other):
         result = self.__eq__(other)
         if result is NotImplemented:
@@ -94,6 +136,77 @@ class ConsCell(object): #pylint: disable-msg=R0903
 
     empty = property(const(False), doc='Cell is empty (Nil)')
 
+    map = lambda self, fun: Pipeline(self, ((imap, fun), ))
+    map.__doc__ = '''
+    Lazily apply `fun` to every item of the list
+
+    :param fun: function to apply
+    :type fun: callable
+
+    :return: pipeline yielding the results
+    :rtype: Pipeline
+    '''.strip()
+
+    filter = lambda self, predicate: Pipeline(self, ((ifilter, predicate), ))
+    filter.__doc__ = '''
+    Lazily select the items of the list for which `predicate` holds
+
+    :param predicate: function to test items with
+    :type predicate: callable
+
+    :return: pipeline yielding the selected items
+    :rtype: Pipeline
+    '''.strip()
+
+    fold = lambda self, fun, initial: reduce(fun, self, initial)
+    fold.__doc__ = '''
+    Combine all items of the list from left to right
+
+    :param fun: function combining the accumulator with an item
+    :type fun: callable
+    :param initial: initial value of the accumulator
+    :type initial: object
+
+    :return: final value of the accumulator
+    :rtype: object
+    '''.strip()
+
+    reverse = lambda self: _reverse(self, self)
+    reverse.__doc__ = '''
+    Create a list of the items of the list in reversed order
+
+    :return: reversed list
+    :rtype: ConsCell
+    '''.strip()
+
+    append = lambda self, other: _append(self, self, other)
+    append.__doc__ = '''
+    Create a list of the items of the list followed by `other`
+
+    The cells of the list are copied, `other` is shared.
+
+    :param other: list to append
+    :type other: ConsCell
+
+    :return: concatenated list
+    :rtype: ConsCell
+    '''.strip()
+
+    #pylint: disable-msg=W0212
+    zip = lambda self, other: self._build(izip(self, other))
+    #pylint: enable-msg=W0212
+    zip.__doc__ = '''
+    Create a list of pairs of the items of the list and `other`
+
+    The resulting list is as long as the shortest input.
+
+    :param other: items to pair with
+    :type other: iterable
+
+    :return: list of pairs
+    :rtype: ConsCell
+    '''.strip()
+
 
 class Nil(ConsCell): #pylint: disable-msg=R0903
     '''Base class for Nil cell types'''
@@ -110,6 +223,7 @@ class Nil(ConsCell): #pylint: disable-msg=R0903
     tail = property(assert_not_reached)
 
     __nonzero__ = const(False)
+    _length_hint = const(0)
     __len__ = const(0)
     __contains__ = const(False)
 
@@ -122,32 +236,281 @@ class Nil(ConsCell): #pylint: disable-msg=R0903
 
     #pylint: disable-msg=W0212
     __lshift__ = lambda self, other: self._CONS(other, self)
+    _build = property(lambda self: self._CONS._build,
+                      doc='Function creating a list from an iterable')
     #pylint: enable-msg=W0212
 
+    # Nil values are singletons, named after their class
+    __reduce__ = lambda self: type(self).__name__
+
     empty = property(const(True), doc='Cell is empty (Nil)')
 
 
+STRINGIFY_LIMIT = 1000
+WRITE_CHUNK_SIZE = 4096
+
+def _write(list_, file_, fun, limit):
+    '''Write the string-representation of a list to a file'''
+    if limit is not None and limit < 0:
+        raise ValueError('limit must be non-negative')
+
+    parts = list()
+
+    def emit(part):
+        '''Buffer a part, writing the buffer once it is large enough'''
+        parts.append(part)
+        if len(parts) >= WRITE_CHUNK_SIZE:
+            file_.write(''.join(parts))
+            del parts[:]
+
+    def emit_items(items):
+        '''Buffer the parts of some items, returning their number'''
+        count = 0
+        for item in items:
+            emit('cons(')
+            emit(fun(item))
+            emit(', ')
+            count += 1
+
+        return count
+
+    items = iter(list_)
+    if limit is None:
+        written = emit_items(items)
+    else:
+        # Only elide the middle of the list if its length is known cheaply,
+        # writing the last items as well
+        length = list_._length_hint() #pylint: disable-msg=W0212
+        last = limit // 2 if length is not None and length > limit else 0
+
+        written = emit_items(islice(items, limit - last))
+
+        # Retrieve at most one item beyond `limit`, to tell it's there
+        for _ in items:
+            emit('..., ')
+            break
+
+        written += emit_items(islice(items, length - limit - 1, None)) \
+                if last else 0
+
+    emit('Nil')
+    while written:
+        count = min(written, WRITE_CHUNK_SIZE)
+        emit(')' * count)
+        written -= count
+
+    if parts:
+        file_.write(''.join(parts))
+
+class _Parts(list): #pylint: disable-msg=R0903
+    '''File-like object collecting the parts written to it'''
+    __slots__ = tuple()
+
+    write = list.append
+
+def _stringify(list_, fun, limit):
+    '''Create string-representation of a list, eliding beyond `limit`'''
+    parts = _Parts()
+    _write(list_, parts, fun, limit)
+    return ''.join(parts)
+
+
+class Pipeline(object):
+    '''Lazily evaluated chain of `map` and `filter` calls on a Cons list
+
+    Stages are only applied once the pipeline is consumed, in a single pass
+    over the source list, without creating any intermediate cells.  Folding
+    or iterating the pipeline creates no cells at all.  Using it as a list
+    forces it into a list of the same implementation as the source, which
+    is kept.
+    '''
+    __slots__ = '_source', '_stages', '_forced',
+
+    def __init__(self, source, stages):
+        '''Initialize a new pipeline
+
+        :param source: list to apply the stages to
+        :type source: ConsCell
+        :param stages: pairs of `itertools` functions and their argument
+        :type stages: tuple
+        '''
+        self._source = source
+        self._stages = stages
+        self._forced = None
+
+    map = lambda self, fun: \
+            Pipeline(self._source, self._stages + ((imap, fun), ))
+    map.__doc__ = ConsCell.map.__doc__
+
+    filter = lambda self, predicate: \
+            Pipeline(self._source, self._stages + ((ifilter, predicate), ))
+    filter.__doc__ = ConsCell.filter.__doc__
+
+    def __iter__(self):
+        if self._forced is not None:
+            return iter(self._forced)
+
+        iterator = iter(self._source)
+        for stage, fun in self._stages:
+            iterator = stage(fun, iterator)
+
+        return iterator
+
+    fold = ConsCell.fold.im_func
+
+    def force(self):
+        '''Create the list of all items yielded by the pipeline
+
+        :return: list of the same implementation as the source list
+        :rtype: ConsCell
+        '''
+        if self._forced is None:
+            #pylint: disable-msg=W0212
+            self._forced = self._source._build(iter(self))
+
+        return self._forced
+
+    reverse = lambda self: _reverse(self._source, self)
+    reverse.__doc__ = ConsCell.reverse.__doc__
+    append = lambda self, other: _append(self._source, self, other)
+    append.__doc__ = ConsCell.append.__doc__
+    #pylint: disable-msg=W0212
+    zip = lambda self, other: self._source._build(izip(self, other))
+    #pylint: enable-msg=W0212
+    zip.__doc__ = ConsCell.zip.__doc__
+
+    # Everything else is handled by the forced list
+    __getattr__ = lambda self, name: getattr(self.force(), name)
+
+    __nonzero__ = lambda self: bool(self.force())
+    __len__ = lambda self: len(self.force())
+    __getitem__ = lambda self, key: self.force()[key]
+    __contains__ = lambda self, item: item in self.force()
+    __eq__ = lambda self, other: self.force() == other
+    __ne__ = lambda self, other: self.force() != other
+    __hash__ = lambda self: hash(self.force())
+    __lshift__ = lambda self, other: self.force() << other
+
+    __str__ = lambda self: str(self.force())
+    __unicode__ = lambda self: unicode(self.force())
+    __repr__ = lambda self: repr(self.force())
+
+    __reduce__ = lambda self: self.force().__reduce__()
+
+_MISSING = object()
+
+def _equal_items(list1, list2):
+    '''Compare the items of two lists pairwise
+
+    Only the items up to the first difference are retrieved, so comparing
+    a list with a longer or infinite one stops at the end of the shortest.
+
+    :return: whether the lists hold equal items
+    :rtype: bool
+    '''
+    for (item1, item2) in izip_longest(list1, list2, fillvalue=_MISSING):
+        if item1 is _MISSING or item2 is _MISSING or item1 != item2:
+            return False
+
+    return True
+
+def _unflatten(cls, items):
+    '''Recreate a list flattened by `ConsCell.__reduce__`
+
+    :param cls: implementation of the list
+    :type cls: type
+    :param items: items of the list
+    :type items: iterable
+
+    :return: new list
+    :rtype: ConsCell
+    '''
+    return cls._build(items) #pylint: disable-msg=W0212
+
+def _reverse(model, iterable):
+    '''Create a reversed list of the implementation of `model`'''
+    return model._build(tuple(iterable)[::-1]) #pylint: disable-msg=W0212
+
+def _append(model, iterable, other):
+    '''Prepend the items of `iterable` to `other`
+
+    :param model: list whose implementation is used for the new cells
+    :type model: ConsCell
+    :param iterable: items to prepend
+    :type iterable: iterable
+    :param other: list to prepend the items to
+    :type other: ConsCell
+
+    :return: concatenated list
+    :rtype: ConsCell
+    '''
+    #pylint: disable-msg=W0212
+    unit = model._CONS if model.empty else type(model)
+
+    cell = other
+    for head in reversed(tuple(iterable)):
+        cell = unit(head, cell)
+
+    return cell
+
+
 # Some utility functions
-#pylint: disable-msg=C0103,E0601
-from_iterable = lambda unit, zero: lambda iterable: reduce(swap_args(unit),
-                                                     reversed(iterable), zero)
-#pylint: enable-msg=C0103,E0601
-from_iterable.__doc__ = '''
-Helper to create a function which creates a Cons list from any iterable
-
-:param unit: Unit function of Cons implementation
-:type unit: ConsCell
-:param zero: Nil cell value
-:type zero: Nil
-
-:return: function which creates a Cons list from an iterable
-:rtype: callable
-'''.strip()
+def from_iterable(unit, zero):
+    '''Helper to create a function which creates a Cons list from any iterable
+
+    If `unit` is a `ConsCell` class defining `_freeze` itself, rather than
+    inheriting it, the resulting function consumes the iterable in a single
+    forward pass.  Every new cell is created with `zero` as its tail, which
+    is replaced by setting the `_tail` slot to the next cell once it's
+    known.  This is only done while the list isn't visible outside the
+    function, after which `unit._freeze(first_cell, length)` finishes it.
+    Classes opt in explicitly, since subclasses may derive other state from
+    the tail, or share cells.
+
+    Any other unit function is called with every item and the list built
+    so far, from the last item to the first.
+
+    :param unit: Unit function of Cons implementation
+    :type unit: ConsCell
+    :param zero: Nil cell value
+    :type zero: Nil
+
+    :return: function which creates a Cons list from an iterable
+    :rtype: callable
+    '''
+    #pylint: disable-msg=W0212
+    if '_freeze' not in getattr(unit, '__dict__', ()):
+        return lambda iterable: reduce(swap_args(unit),
+                                       reversed(tuple(iterable)), zero)
+
+    def build(iterable):
+        '''Create a Cons list from an iterable'''
+        iterator = iter(iterable)
+
+        for head in iterator:
+            first = last = unit(head, zero)
+            break
+        else:
+            return zero
+
+        length = 1
+        for head in iterator:
+            cell = unit(head, zero)
+            last._tail = cell
+            last = cell
+            length += 1
+
+        return unit._freeze(first, length)
+
+    return build
 
 
 # Iterative implementation
 class IterativeConsCell(ConsCell): #pylint: disable-msg=R0903
     '''Cons list implementation using iterative algorithms'''
+    # Lists built by `from_iterable` need no finishing
+    _freeze = staticmethod(lambda cell, _: cell)
+
     def __len__(self):
         len_ = 1
 
@@ -204,6 +567,9 @@ class IterativeConsCell(ConsCell): #pylint: disable-msg=R0903
         cell2 = other
 
         while not cell1.empty and not cell2.empty:
+            if cell1 is cell2:
+                return True
+
             if cell1.head != cell2.head:
                 return False
 
@@ -215,28 +581,19 @@ class IterativeConsCell(ConsCell): #pylint: disable-msg=R0903
 
         return True
 
-    def _stringify(self, fun):
-        '''Create string-representation of the list'''
-        def partim_generator():
-            '''Create string-representation of one list item'''
-            cell = self
-            while not cell.empty:
-                yield fun('cons(%s, ') % fun(cell.head)
-                cell = cell.tail
-
-            yield fun(cell)
-
-        return fun('%s%s') % (''.join(partim_generator()), ')' * len(self))
-
     def __hash__(self):
-        hash_ = 1
+        #pylint: disable-msg=W0212
+        cells = list()
 
         cell = self
-        while not cell.empty:
-            hash_ = hash_ * 31 + hash(cell.head)
+        while not cell.empty and cell._hash is None:
+            cells.append(cell)
             cell = cell.tail
 
-        hash_ = hash_ * 31 + hash(cell)
+        hash_ = hash(cell) if cell.empty else cell._hash
+        for cell in reversed(cells):
+            hash_ = cell._hash = hash(31 * hash_ + hash(cell.head))
+
         return hash_
 
 class IterativeNil(Nil): #pylint: disable-msg=R0903
@@ -249,13 +606,33 @@ iterative_from_iterable = from_iterable(IterativeConsCell, IterativeNil)
 #pylint: enable-msg=C0103
 iterative_from_iterable.__doc__ = \
         'Create an iterative Cons list from an iterable'
+#pylint: disable-msg=W0212
+IterativeConsCell._build = staticmethod(iterative_from_iterable)
+#pylint: enable-msg=W0212
 
 
 # Recursive implementation
 class RecursiveConsCell(ConsCell): #pylint: disable-msg=R0903
-    '''Cons list implementation using recursive algorithms'''
-    def __len__(self):
-        return len(self.tail) + 1
+    '''Cons list implementation using recursive algorithms
+
+    All recursion is run through `funpy.trampoline`, every `_*_step` method
+    handling a single cell, so the stack doesn't grow with the list length.
+    Once the end of the recursive cells is reached, the remainder of the
+    list is handled by its own implementation.
+    '''
+    # Lists built by `from_iterable` need no finishing
+    _freeze = staticmethod(lambda cell, _: cell)
+
+    #pylint: disable-msg=W0212
+    __len__ = lambda self: run(self._len_step, 0)
+
+    def _len_step(self, acc):
+        '''Trampoline step of `__len__`'''
+        tail = self.tail
+        if isinstance(tail, RecursiveConsCell):
+            return call(tail._len_step, acc + 1)
+
+        return done(acc + 1 + len(tail))
 
     def __getitem__(self, key):
         if not isinstance(key, (int, long)):
@@ -266,25 +643,82 @@ class RecursiveConsCell(ConsCell): #pylint: disable-msg=R0903
             if key < 0:
                 raise IndexError
 
-        return self.head if key == 0 else self.tail[key - 1]
+        return run(self._getitem_step, key)
+
+    def _getitem_step(self, key):
+        '''Trampoline step of `__getitem__`'''
+        if key == 0:
+            return done(self.head)
+
+        tail = self.tail
+        if isinstance(tail, RecursiveConsCell):
+            return call(tail._getitem_step, key - 1)
+
+        return done(tail[key - 1])
 
-    __contains__ = lambda self, item: (self.head == item) or (item in self.tail)
+    __contains__ = lambda self, item: run(self._contains_step, item)
+
+    def _contains_step(self, item):
+        '''Trampoline step of `__contains__`'''
+        if self.head == item:
+            return done(True)
+
+        tail = self.tail
+        if isinstance(tail, RecursiveConsCell):
+            return call(tail._contains_step, item)
+
+        return done(item in tail)
 
     def __iter__(self):
-        yield self.head
-        for item in iter(self.tail):
+        cell = self
+        while isinstance(cell, RecursiveConsCell):
+            yield cell.head
+            cell = cell.tail
+
+        for item in iter(cell):
             yield item
 
     def __eq__(self, other):
         if not hasattr(other, 'head') or not hasattr(other, 'tail'):
             return NotImplemented
 
-        return (self.head == other.head) and (self.tail == other.tail)
+        return run(self._eq_step, other)
+
+    def _eq_step(self, other):
+        '''Trampoline step of `__eq__`'''
+        if self is other:
+            return done(True)
+
+        result = self.head == other.head
+        if not result:
+            return done(result)
+
+        tail = self.tail
+        other_tail = other.tail
+        if isinstance(tail, RecursiveConsCell) and \
+                hasattr(other_tail, 'head') and hasattr(other_tail, 'tail'):
+            return call(tail._eq_step, other_tail)
+
+        return done(tail == other_tail)
+
+    __hash__ = lambda self: run(self._hash_step)
+
+    def _hash_step(self):
+        '''Trampoline step of `__hash__`'''
+        if self._hash is not None:
+            return done(self._hash)
+
+        tail = self.tail
+        if isinstance(tail, RecursiveConsCell):
+            return then(self._hash_cont, tail._hash_step)
 
-    _stringify = lambda self, fun: fun('cons(%s, %s)') % \
-                                    (fun(self.head), fun(self.tail))
+        return self._hash_cont(hash(tail))
 
-    __hash__ = lambda self: 31 * hash(self.tail) + hash(self.head)
+    def _hash_cont(self, tail_hash):
+        '''Calculate the hash of the list given the hash of its tail'''
+        self._hash = hash(31 * tail_hash + hash(self.head))
+        return done(self._hash)
+    #pylint: enable-msg=W0212
 
 class RecursiveNil(Nil): #pylint: disable-msg=R0903
     '''Nil value to construct recursive Cons lists'''
@@ -296,3 +730,914 @@ recursive_from_iterable = from_iterable(RecursiveConsCell, RecursiveNil)
 #pylint: enable-msg=C0103
 recursive_from_iterable.__doc__ = \
         'Create a recursive Cons list from an iterable'
+#pylint: disable-msg=W0212
+RecursiveConsCell._build = staticmethod(recursive_from_iterable)
+#pylint: enable-msg=W0212
+
+
+# Size-carrying implementation
+class SizedConsCell(IterativeConsCell): #pylint: disable-msg=R0903
+    '''Cons list implementation storing the list length in every cell'''
+    __slots__ = '_length',
+
+    def __init__(self, head, tail):
+        '''Initialize a new cell
+
+        The length of the new list is calculated from the length of `tail`,
+        which is a constant-time operation if `tail` is a sized list as well.
+
+        :param head: value of head element
+        :type head: object
+        :param tail: tail element of cons list
+        :type tail: ConsCell
+        '''
+        super(SizedConsCell, self).__init__(head, tail)
+        self._length = len(tail) + 1
+
+    __len__ = lambda self: self._length #pylint: disable-msg=W0212
+    _length_hint = __len__
+
+    @staticmethod
+    def _freeze(cell, length):
+        '''Set the lengths of a list whose tails were set by `from_iterable`'''
+        #pylint: disable-msg=W0212
+        first = cell
+
+        while length:
+            cell._length = length
+            length -= 1
+            cell = cell._tail
+
+        return first
+
+    def __getitem__(self, key):
+        if not isinstance(key, (int, long)):
+            raise TypeError
+
+        if key < 0:
+            key = self._length + key
+            if key < 0:
+                raise IndexError
+
+        if key >= self._length:
+            raise IndexError
+
+        cell = self
+        for _ in xrange(key):
+            cell = cell.tail
+
+        return cell.head
+
+class SizedNil(Nil): #pylint: disable-msg=R0903
+    '''Nil value to construct sized Cons lists'''
+    _CONS = SizedConsCell
+SizedNil = SizedNil() #pylint: disable-msg=C0103
+
+#pylint: disable-msg=C0103
+sized_from_iterable = from_iterable(SizedConsCell, SizedNil)
+#pylint: enable-msg=C0103
+sized_from_iterable.__doc__ = \
+        'Create a sized Cons list from an iterable'
+#pylint: disable-msg=W0212
+SizedConsCell._build = staticmethod(sized_from_iterable)
+#pylint: enable-msg=W0212
+
+
+# Unrolled implementation
+UNROLLED_BLOCK_SIZE = 32
+
+class UnrolledConsCell(ConsCell): #pylint: disable-msg=R0903
+    '''Cons list implementation storing heads in blocks
+
+    Every cell holds a block of up to `UNROLLED_BLOCK_SIZE` heads, the cell
+    itself representing the list starting at `_index` in its block.  The
+    `_tail` slot refers to the cell following the block, the tail of a cell
+    is a new view on the same block starting at the next index.  Views
+    aren't kept, so walking a list doesn't keep a cell per item alive.
+    Views on a block share the hashes of its suffixes in `_hashes`, so
+    hashing any of them hashes every head once.
+    '''
+    __slots__ = '_block', '_index', '_hashes',
+
+    #pylint: disable-msg=W0212
+    def __init__(self, head, tail):
+        '''Initialize a new cell
+
+        If `tail` is an unrolled cell whose block isn't full yet, `head` is
+        prepended to a copy of the remaining part of that block.
+
+        :param head: value of head element
+        :type head: object
+        :param tail: tail element of cons list
+        :type tail: ConsCell
+        '''
+        if type(tail) is type(self) and \
+                len(tail._block) - tail._index < UNROLLED_BLOCK_SIZE:
+            self._init((head, ) + tail._block[tail._index:], 0, tail._tail)
+        else:
+            self._init((head, ), 0, tail)
+
+    def _init(self, block, index, next_):
+        '''Initialize the slots of a cell
+
+        :param block: block of head values
+        :type block: tuple
+        :param index: index of the head of this cell in `block`
+        :type index: int
+        :param next_: cell following `block`
+        :type next_: ConsCell
+        '''
+        super(UnrolledConsCell, self).__init__(block[index], next_)
+        self._block = block
+        self._index = index
+        # `[hashes, index]` list holding an array of the hashes of the
+        # suffixes of the block, which are known from `index` onwards
+        self._hashes = None
+
+    @classmethod
+    def _from_block(cls, block, index, next_):
+        '''Create a cell viewing `block` starting at `index`
+
+        :param block: block of head values
+        :type block: tuple
+        :param index: index of the head of the new cell in `block`
+        :type index: int
+        :param next_: cell following `block`
+        :type next_: ConsCell
+
+        :return: new cell
+        :rtype: UnrolledConsCell
+        '''
+        cell = ConsCell.__new__(cls)
+        cell._init(block, index, next_)
+        return cell
+
+    def _get_tail(self):
+        '''Retrieve the tail of the cell, sharing the block if possible'''
+        if self._hashes is None:
+            self._hashes = [None, len(self._block)]
+
+        return self._advance(1)
+
+    tail = property(_get_tail, doc='Tail cell')
+
+    def __len__(self):
+        len_ = 0
+
+        cell = self
+        while isinstance(cell, UnrolledConsCell):
+            len_ += len(cell._block) - cell._index
+            cell = cell._tail
+
+        return len_ + len(cell)
+
+    def _length_hint(self):
+        len_ = 0
+
+        cell = self
+        while isinstance(cell, UnrolledConsCell):
+            len_ += len(cell._block) - cell._index
+            cell = cell._tail
+
+        tail_length = cell._length_hint()
+        return None if tail_length is None else len_ + tail_length
+
+    def __getitem__(self, key):
+        if not isinstance(key, (int, long)):
+            raise TypeError
+
+        if key < 0:
+            key = len(self) + key
+            if key < 0:
+                raise IndexError
+
+        cell = self
+        while isinstance(cell, UnrolledConsCell):
+            index = cell._index + key
+            if index < len(cell._block):
+                return cell._block[index]
+
+            key = index - len(cell._block)
+            cell = cell._tail
+
+        return cell[key]
+
+    def __contains__(self, item):
+        cell = self
+        while isinstance(cell, UnrolledConsCell):
+            if item in islice(cell._block, cell._index, None):
+                return True
+
+            cell = cell._tail
+
+        return item in cell
+
+    def __iter__(self):
+        cell = self
+        while isinstance(cell, UnrolledConsCell):
+            for item in islice(cell._block, cell._index, None):
+                yield item
+
+            cell = cell._tail
+
+        for item in cell:
+            yield item
+
+    def __eq__(self, other):
+        if not hasattr(other, 'head') or not hasattr(other, 'tail'):
+            return NotImplemented
+
+        cell1 = self
+        cell2 = other
+
+        while isinstance(cell1, UnrolledConsCell) and \
+                isinstance(cell2, UnrolledConsCell):
+            if cell1 is cell2 or (cell1._block is cell2._block and
+                                  cell1._index == cell2._index and
+                                  cell1._tail is cell2._tail):
+                return True
+
+            block1, block2 = cell1._block, cell2._block
+            count = min(len(block1) - cell1._index,
+                        len(block2) - cell2._index)
+            if type(block1) is type(block2):
+                items1 = block1[cell1._index:cell1._index + count]
+                items2 = block2[cell2._index:cell2._index + count]
+            else:
+                # Slices of tuples and arrays never compare equal
+                items1 = tuple(islice(block1, cell1._index,
+                                      cell1._index + count))
+                items2 = tuple(islice(block2, cell2._index,
+                                      cell2._index + count))
+
+            if items1 != items2:
+                return False
+
+            cell1 = cell1._advance(count)
+            cell2 = cell2._advance(count)
+
+        return _equal_items(cell1, cell2)
+
+    def _advance(self, count):
+        '''Skip `count` heads, which should all be in the block of this cell
+
+        :param count: number of heads to skip
+        :type count: int
+
+        :return: cell `count` positions further in the list
+        :rtype: ConsCell
+        '''
+        index = self._index + count
+        if index == len(self._block):
+            return self._tail
+
+        cell = self._from_block(self._block, index, self._tail)
+        cell._hashes = self._hashes
+        return cell
+
+    def _known_hash(self):
+        '''Retrieve the hash of the list if it's known already
+
+        :return: hash of the list, or `None`
+        :rtype: int
+        '''
+        if self._hash is None and self._hashes is not None and \
+                self._hashes[1] <= self._index:
+            self._hash = self._hashes[0][self._index]
+
+        return self._hash
+
+    def _hash_block(self, tail_hash):
+        '''Hash the heads of the block up to this cell
+
+        :param tail_hash: hash of the cell following the block
+        :type tail_hash: int
+
+        :return: hash of the list
+        :rtype: int
+        '''
+        block = self._block
+        if self._hashes is None:
+            self._hashes = [None, len(block)]
+
+        holder = self._hashes
+        if holder[0] is None:
+            holder[0] = array.array('l', (0, )) * len(block)
+
+        hashes, known = holder
+        hash_ = tail_hash if known == len(block) else hashes[known]
+        for index in xrange(known - 1, self._index - 1, -1):
+            hash_ = hash(31 * hash_ + hash(block[index]))
+            hashes[index] = hash_
+
+        holder[1] = self._index
+        self._hash = hash_
+        return hash_
+
+    def __hash__(self):
+        cells = list()
+
+        cell = self
+        while isinstance(cell, UnrolledConsCell) and \
+                cell._known_hash() is None:
+            cells.append(cell)
+            cell = cell._tail
+
+        hash_ = cell._known_hash() if isinstance(cell, UnrolledConsCell) \
+                                   else hash(cell)
+        for cell in reversed(cells):
+            hash_ = cell._hash_block(hash_)
+
+        return hash_
+    #pylint: enable-msg=W0212
+
+class UnrolledNil(Nil): #pylint: disable-msg=R0903
+    '''Nil value to construct unrolled Cons lists'''
+    _CONS = UnrolledConsCell
+UnrolledNil = UnrolledNil() #pylint: disable-msg=C0103
+
+def unrolled_from_iterable(iterable):
+    '''Create an unrolled Cons list from an iterable
+
+    The iterable is consumed in blocks of `UNROLLED_BLOCK_SIZE` items, which
+    are used as-is as the blocks of the resulting list.
+
+    :param iterable: items of the list
+    :type iterable: iterable
+
+    :return: unrolled Cons list
+    :rtype: ConsCell
+    '''
+    #pylint: disable-msg=W0212
+    iterator = iter(iterable)
+    blocks = list(iter(lambda: tuple(islice(iterator, UNROLLED_BLOCK_SIZE)),
+                       tuple()))
+
+    cell = UnrolledNil
+    for block in reversed(blocks):
+        cell = UnrolledConsCell._from_block(block, 0, cell)
+
+    return cell
+
+#pylint: disable-msg=W0212
+UnrolledConsCell._build = staticmethod(unrolled_from_iterable)
+#pylint: enable-msg=W0212
+
+
+# Lazy implementation
+class LazyConsCell(IterativeConsCell): #pylint: disable-msg=R0903
+    '''Cons list implementation with lazily evaluated tails
+
+    The tail of a lazy cell can be given as a callable without arguments
+    (a thunk) instead of a cell.  It is called the first time the tail is
+    accessed, after which its result is kept.
+    '''
+    __slots__ = '_thunk',
+
+    def __init__(self, head, tail):
+        '''Initialize a new cell
+
+        :param head: value of head element
+        :type head: object
+        :param tail: tail element of cons list, or callable returning it
+        :type tail: ConsCell or callable
+        '''
+        if callable(tail):
+            super(LazyConsCell, self).__init__(head, None)
+            self._thunk = tail
+        else:
+            super(LazyConsCell, self).__init__(head, tail)
+            self._thunk = None
+
+    def _get_tail(self):
+        '''Retrieve the tail of the cell, evaluating it if necessary'''
+        if self._thunk is not None:
+            self._tail = self._thunk()
+            self._thunk = None
+
+        return self._tail
+
+    tail = property(_get_tail, doc='Tail cell')
+
+    take = lambda self, count: _take(self, count)
+    take.__doc__ = '''
+    Create a lazy list of the first `count` items of the list
+
+    Cells of this list are only evaluated when the corresponding cells of
+    the new list are.
+
+    :param count: number of items to take
+    :type count: int
+
+    :return: lazy list of at most `count` items
+    :rtype: ConsCell
+    '''.strip()
+
+    def drop(self, count):
+        '''Skip the first `count` items of the list
+
+        Only the skipped cells are evaluated.
+
+        :param count: number of items to skip
+        :type count: int
+
+        :return: remainder of the list
+        :rtype: ConsCell
+        '''
+        cell = self
+        for _ in xrange(count):
+            if cell.empty:
+                break
+
+            cell = cell.tail
+
+        return cell
+
+def _take(cell, count):
+    '''Create a lazy list of the first `count` items of any cons list'''
+    if count <= 0 or cell.empty:
+        return LazyNil
+
+    if count == 1:
+        return LazyConsCell(cell.head, LazyNil)
+
+    return LazyConsCell(cell.head, lambda: _take(cell.tail, count - 1))
+
+class LazyNil(Nil): #pylint: disable-msg=R0903
+    '''Nil value to construct lazy Cons lists'''
+    _CONS = LazyConsCell
+
+    take = lambda self, _: self
+    drop = lambda self, _: self
+LazyNil = LazyNil() #pylint: disable-msg=C0103
+
+def lazy_from_iterable(iterable):
+    '''Create a lazy Cons list from an iterable
+
+    Items are only retrieved from `iterable` when the corresponding cells
+    are evaluated, so `iterable` can be a generator or even be infinite.
+
+    :param iterable: items of the list
+    :type iterable: iterable
+
+    :return: lazy Cons list
+    :rtype: ConsCell
+    '''
+    iterator = iter(iterable)
+
+    def next_cell():
+        '''Create the cell holding the next item of `iterator`'''
+        for head in iterator:
+            return LazyConsCell(head, next_cell)
+
+        return LazyNil
+
+    return next_cell()
+
+#pylint: disable-msg=W0212
+LazyConsCell._build = staticmethod(lazy_from_iterable)
+#pylint: enable-msg=W0212
+
+
+# Interned implementation
+_INTERNED = weakref.WeakValueDictionary()
+
+class _InternKey(object): #pylint: disable-msg=R0903
+    '''Key of an interned cell, using the hash of its head calculated once'''
+    __slots__ = '_type', '_head', '_tail', '_hash',
+
+    def __init__(self, head, head_hash, tail):
+        '''Initialize a new key
+
+        :param head: value of head element
+        :type head: object
+        :param head_hash: hash of `head`
+        :type head_hash: int
+        :param tail: tail element of cons list
+        :type tail: ConsCell
+        '''
+        self._type = type(head)
+        self._head = head
+        self._tail = id(tail)
+        self._hash = hash((self._type, head_hash, self._tail))
+
+    __hash__ = lambda self: self._hash
+
+    def __eq__(self, other):
+        #pylint: disable-msg=W0212
+        return self._hash == other._hash and self._type is other._type and \
+                self._tail == other._tail and \
+                (self._head is other._head or self._head == other._head)
+
+class InternedConsCell(IterativeConsCell): #pylint: disable-msg=R0903
+    '''Cons list implementation sharing structurally equal cells
+
+    Creating a cell whose head equals, and is of the same type as, the head
+    of an existing cell in front of the same tail object returns that
+    existing cell.  Cells are kept in a weak-valued table, so interning
+    doesn't keep any list alive.
+
+    Cells with a hashable head in front of `InternedNil` or another interned
+    cell are canonical: equal lists of canonical cells are the same object.
+    Their hash is calculated when they're created.
+    '''
+    __slots__ = '_canonical',
+
+    #pylint: disable-msg=W0212
+    def __new__(cls, head, tail):
+        '''Retrieve or create a cell
+
+        :param head: value of head element
+        :type head: object
+        :param tail: tail element of cons list
+        :type tail: ConsCell
+
+        :return: new or interned cell
+        :rtype: InternedConsCell
+        '''
+        canonical = tail is InternedNil or \
+                (isinstance(tail, InternedConsCell) and tail._canonical)
+
+        if canonical:
+            try:
+                head_hash = hash(head)
+            except TypeError:
+                canonical = False
+            else:
+                key = _InternKey(head, head_hash, tail)
+                cell = _INTERNED.get(key)
+                if cell is not None:
+                    return cell
+
+        cell = super(InternedConsCell, cls).__new__(cls)
+        ConsCell.__init__(cell, head, tail)
+        cell._canonical = canonical
+
+        if canonical:
+            cell._hash = hash(31 * hash(tail) + head_hash)
+            _INTERNED[key] = cell
+
+        return cell
+
+    __init__ = const(None)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+
+        if isinstance(other, InternedConsCell) and self._canonical and \
+                other._canonical and self._hash != other._hash:
+            return False
+
+        return super(InternedConsCell, self).__eq__(other)
+    #pylint: enable-msg=W0212
+
+class InternedNil(Nil): #pylint: disable-msg=R0903
+    '''Nil value to construct interned Cons lists'''
+    _CONS = InternedConsCell
+InternedNil = InternedNil() #pylint: disable-msg=C0103
+
+def interned_from_iterable(iterable):
+    '''Create an interned Cons list from an iterable
+
+    Cells are interned back to front, so the items are collected first.
+
+    :param iterable: items of the list
+    :type iterable: iterable
+
+    :return: interned Cons list
+    :rtype: ConsCell
+    '''
+    cell = InternedNil
+    for head in reversed(list(iterable)):
+        cell = InternedConsCell(head, cell)
+
+    return cell
+
+#pylint: disable-msg=W0212
+InternedConsCell._build = staticmethod(interned_from_iterable)
+#pylint: enable-msg=W0212
+
+
+# Array-backed implementation
+_INTEGER_TYPECODES = 'bBhHiIlL'
+_FLOAT_TYPECODES = 'fd'
+
+def _numeric_array(values, typecode=None):
+    '''Store numbers in an array of `typecode` if they fit it, or else in an
+    array of integers (`'l'`), or of floats (`'d'`) if any is a float
+
+    :param values: numbers to store
+    :type values: sequence
+    :param typecode: preferred typecode of the array
+    :type typecode: str
+
+    :return: array holding `values`
+    :rtype: array.array
+
+    :raise TypeError: some value isn't a number
+    :raise OverflowError: some integer doesn't fit in an array
+    '''
+    types = set(type(value) for value in values)
+    if types <= set((bool, int, long)):
+        typecodes, default = _INTEGER_TYPECODES, 'l'
+    elif types <= set((bool, int, long, float)):
+        typecodes, default = _FLOAT_TYPECODES, 'd'
+    else:
+        raise TypeError('Only numbers can be stored in arrays')
+
+    if typecode is not None and typecode in typecodes:
+        try:
+            return array.array(typecode, values)
+        except OverflowError:
+            pass
+
+    return array.array(default, values)
+
+def _array_or_iterative(items, typecode):
+    '''Create an array-backed list of some items, preferably using
+    `typecode`, or an iterative list if they don't fit in an array'''
+    try:
+        return array_from_iterable(_numeric_array(items, typecode))
+    except (TypeError, OverflowError):
+        return iterative_from_iterable(items)
+
+class ArrayConsCell(UnrolledConsCell): #pylint: disable-msg=R0903
+    '''Cons list implementation storing numeric heads in `array.array`s
+
+    This is an unrolled list whose blocks are arrays, which can be of any
+    length.  Lists created by `array_from_iterable` consist of a single
+    array, whose tails share it through their offset into it.  Prepending a
+    number creates a single-item array, of the typecode of the array it's
+    prepended to if the number fits it.  Prepending anything else, like an
+    integer too large for any array, creates an unrolled cell instead.
+
+    Bulk operations work on whole arrays at a time, using builtins and
+    `itertools` instead of a Python loop over the cells.
+    '''
+    __slots__ = tuple()
+
+    #pylint: disable-msg=W0212
+    def __new__(cls, head, tail):
+        '''Create a new cell
+
+        :param head: value of head element
+        :type head: int or float
+        :param tail: tail element of cons list
+        :type tail: ConsCell
+
+        :return: new cell
+        :rtype: ArrayConsCell or UnrolledConsCell
+        '''
+        typecode = tail._block.typecode if isinstance(tail, ArrayConsCell) \
+                                          else None
+        try:
+            block = _numeric_array((head, ), typecode)
+        except (TypeError, OverflowError):
+            return UnrolledConsCell(head, tail)
+
+        return cls._from_block(block, 0, tail)
+
+    __init__ = const(None)
+
+    def _segments(self):
+        '''Generate the iterables of items of all arrays in the list
+
+        Items following the array cells are generated as one final iterable.
+        '''
+        cell = self
+        while isinstance(cell, ArrayConsCell):
+            yield cell._block if cell._index == 0 \
+                              else islice(cell._block, cell._index, None)
+            cell = cell._tail
+
+        yield cell
+
+    def _typecode(self):
+        '''Retrieve the typecode of the first array of the list'''
+        return self._block.typecode
+    #pylint: enable-msg=W0212
+
+    sum = lambda self: sum(sum(segment) for segment in self._segments())
+    sum.__doc__ = '''Calculate the sum of all items of the list'''
+
+    def fold(self, fun, initial):
+        '''Combine all items of the list from left to right
+
+        :param fun: function combining the accumulator with an item
+        :type fun: callable
+        :param initial: initial value of the accumulator
+        :type initial: object
+
+        :return: final value of the accumulator
+        :rtype: object
+        '''
+        for segment in self._segments():
+            initial = reduce(fun, segment, initial)
+
+        return initial
+
+    def map(self, fun, typecode=None):
+        '''Create a list of the results of applying `fun` to every item
+
+        Without a `typecode`, the results are stored in an array of the
+        typecode of the first array of this list if they fit, or else in an
+        array of integers or floats, or else in an iterative list.
+
+        :param fun: function to apply
+        :type fun: callable
+        :param typecode: typecode of the new array
+        :type typecode: str
+
+        :return: new list, backed by a single array if possible
+        :rtype: ConsCell
+        '''
+        if typecode is not None:
+            return array_from_iterable(imap(fun, self), typecode)
+
+        return _array_or_iterative(map(fun, self), self._typecode())
+
+    def filter(self, predicate):
+        '''Create a list of all items for which `predicate` holds
+
+        :param predicate: function to test items with
+        :type predicate: callable
+
+        :return: new list, backed by a single array if possible
+        :rtype: ConsCell
+        '''
+        return _array_or_iterative(filter(predicate, self), self._typecode())
+
+    def __reduce__(self):
+        items = tuple(self)
+        try:
+            items = _numeric_array(items, self._typecode())
+        except (TypeError, OverflowError):
+            # Lists holding unrolled cells load as iterative lists
+            return iterative_from_iterable, (items, )
+
+        return _unflatten, (type(self), items)
+
+    reverse = lambda self: _array_or_iterative(tuple(self)[::-1],
+                                               self._typecode())
+    reverse.__doc__ = ConsCell.reverse.__doc__
+
+    zip = lambda self, other: iterative_from_iterable(izip(self, other))
+    zip.__doc__ = '''
+    Create an iterative list of pairs of the items of the list and `other`
+
+    The resulting list is as long as the shortest input.
+
+    :param other: items to pair with
+    :type other: iterable
+
+    :return: list of pairs
+    :rtype: ConsCell
+    '''.strip()
+
+class ArrayNil(Nil): #pylint: disable-msg=R0903
+    '''Nil value to construct array-backed Cons lists'''
+    _CONS = ArrayConsCell
+
+    sum = const(0)
+    fold = lambda self, _, initial: initial
+    map = lambda self, fun, typecode=None: self
+    filter = lambda self, _: self
+    reverse = lambda self: self
+    zip = lambda self, _: IterativeNil
+ArrayNil = ArrayNil() #pylint: disable-msg=C0103
+
+def array_from_iterable(iterable, typecode=None):
+    '''Create an array-backed Cons list from an iterable
+
+    An `array.array` is used as-is, without copying it, so it should not be
+    modified afterwards.  Any other iterable is copied into a new array, of
+    `typecode` if given, or else of integers (`'l'`) if all items are
+    integers, or of floats (`'d'`).
+
+    :param iterable: items of the list
+    :type iterable: iterable
+    :param typecode: typecode of the array to copy `iterable` into
+    :type typecode: str
+
+    :return: array-backed Cons list
+    :rtype: ConsCell
+    '''
+    #pylint: disable-msg=W0212
+    if not isinstance(iterable, array.array):
+        iterable = _numeric_array(tuple(iterable)) if typecode is None \
+                   else array.array(typecode, iterable)
+
+    if not iterable:
+        return ArrayNil
+
+    return ArrayConsCell._from_block(iterable, 0, ArrayNil)
+
+#pylint: disable-msg=W0212
+ArrayConsCell._build = staticmethod(array_from_iterable)
+#pylint: enable-msg=W0212
+
+
+# Parallel processing
+PARALLEL_CHUNKS_PER_PROCESS = 4
+
+def _chunks(list_, count):
+    '''Split a list into at most `count` balanced chunks of items
+
+    :param list_: list to split
+    :type list_: ConsCell
+    :param count: maximal number of chunks
+    :type count: int
+
+    :return: chunks, as tuples
+    :rtype: list
+    '''
+    items = tuple(list_)
+    size, extra = divmod(len(items), count)
+
+    chunks = list()
+    start = 0
+    for index in xrange(min(count, len(items))):
+        end = start + size + (index < extra)
+        chunks.append(items[start:end])
+        start = end
+
+    return chunks
+
+def _map_chunk((fun, chunk)):
+    '''Apply a function to every item of a chunk'''
+    return map(fun, chunk)
+
+def _reduce_chunk((fun, chunk)):
+    '''Reduce a non-empty chunk'''
+    return reduce(fun, chunk)
+
+def _parallel(worker, fun, list_, pool, processes):
+    '''Run `worker` on chunks of `list_` in a process pool
+
+    :return: results of `worker` for every chunk
+    :rtype: list
+    '''
+    count = (processes or multiprocessing.cpu_count()) * \
+            PARALLEL_CHUNKS_PER_PROCESS
+    chunks = [(fun, chunk) for chunk in _chunks(list_, count)]
+    if not chunks:
+        return list()
+
+    own_pool = pool is None
+    if own_pool:
+        pool = multiprocessing.Pool(processes)
+
+    try:
+        return pool.map(worker, chunks, 1)
+    finally:
+        if own_pool:
+            pool.close()
+            pool.join()
+
+def parallel_map(fun, list_, pool=None, processes=None):
+    '''Apply a function to every item of a list in parallel processes
+
+    The list is split into balanced chunks, which are sent to the worker
+    processes as flat tuples.  `fun` and the items must be picklable.
+
+    :param fun: function to apply
+    :type fun: callable
+    :param list_: list to map
+    :type list_: ConsCell
+    :param pool: process pool to use, a new one is created if not given
+    :type pool: multiprocessing.Pool
+    :param processes: number of processes of a new pool, defaults to the
+        number of CPUs
+    :type processes: int
+
+    :return: list of the results, of the same implementation as `list_`
+    :rtype: ConsCell
+    '''
+    results = _parallel(_map_chunk, fun, list_, pool, processes)
+    return list_._build(item for chunk in results for item in chunk)
+
+def parallel_reduce(fun, list_, initial, pool=None, processes=None):
+    '''Reduce a list in parallel processes
+
+    Every chunk of the list is reduced in a worker process, after which the
+    results are reduced, starting with `initial`.  `fun` should be
+    associative, and `initial` its identity.
+
+    :param fun: function to reduce with
+    :type fun: callable
+    :param list_: list to reduce
+    :type list_: ConsCell
+    :param initial: initial value
+    :type initial: object
+    :param pool: process pool to use, a new one is created if not given
+    :type pool: multiprocessing.Pool
+    :param processes: number of processes of a new pool, defaults to the
+        number of CPUs
+    :type processes: int
+
+    :return: reduced value
+    :rtype: object
+    '''
+    return reduce(fun, _parallel(_reduce_chunk, fun, list_, pool,
+                                 processes), initial)
@@ -0,0 +1,259 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Deferred arithmetic on Maybe values
+
+Arithmetic on expressions builds an expression graph instead of calculating
+a Maybe value right away:
+
+    >>> x, y = Var('x'), Var('y')
+    >>> score = (x + y) * (x + y) / lazy(Just(2))
+    >>> score.evaluate(x=Just(1), y=Just(3))
+    Just(8)
+    >>> score.evaluate(x=Just(1), y=Nothing)
+    Nothing
+
+An expression is compiled into a single Python function once, which is
+reused for every evaluation.  Equal subexpressions, like `x + y` above, are
+calculated once per evaluation, in a single exception handler, without
+creating intermediate Maybe values.
+
+Operands of an expression are `Var` inputs, `Just` and `Nothing` values,
+which are combined by value, and plain values.  The result of an evaluation
+is `Nothing` if any operand is `Nothing` or if any operation raises an
+exception, just like arithmetic on Maybe values.
+'''
+
+import keyword
+
+from .maybe import Maybe, Just, Nothing
+from .monad import Deferred, BINARY_OPERATORS, UNARY_OPERATORS
+
+class Expression(Deferred):
+    '''Base class of expression graph nodes'''
+    __slots__ = '_evaluator',
+
+    def __init__(self):
+        self._evaluator = None
+
+    def compile(self):
+        '''Compile the expression into a function
+
+        The function takes the values of all variables of the expression as
+        arguments, either as keyword arguments or in the order of
+        `variables`, and returns a Maybe value.  It is only created once.
+
+        :return: evaluator of the expression
+        :rtype: callable
+        '''
+        if self._evaluator is None:
+            self._evaluator = _compile(self)
+
+        return self._evaluator
+
+    evaluate = lambda self, *args, **kwargs: \
+            self.compile()(*args, **kwargs)
+
+    variables = property(lambda self: tuple(sorted(set(
+        node._name for node in _nodes(self) #pylint: disable-msg=W0212
+        if isinstance(node, Var)))), doc='Names of all variables')
+
+    _operands = ()
+
+
+class Var(Expression):
+    '''Variable, i.e. an input of an expression'''
+    __slots__ = '_name',
+
+    def __init__(self, name):
+        '''Initialize a new variable
+
+        :param name: name of the variable, a Python identifier not starting
+            with an underscore
+        :type name: str
+        '''
+        if not isinstance(name, str) or not name or name[0] == '_' or \
+                keyword.iskeyword(name) or \
+                not name.replace('_', 'a').isalnum() or name[0].isdigit():
+            raise ValueError('Invalid variable name %r' % name)
+
+        super(Var, self).__init__()
+        self._name = name
+
+    name = property(lambda self: self._name, doc='Name of the variable')
+
+    __repr__ = lambda self: 'Var(%r)' % self._name
+
+
+class Const(Expression):
+    '''Constant Maybe or plain value'''
+    __slots__ = '_value',
+
+    def __init__(self, value):
+        '''Initialize a new constant
+
+        :param value: value of the constant
+        :type value: object
+        '''
+        super(Const, self).__init__()
+        self._value = value
+
+    value = property(lambda self: self._value, doc='Value of the constant')
+
+    __repr__ = lambda self: 'lazy(%r)' % (self._value, )
+
+
+class Apply(Expression):
+    '''Application of an operator to operand expressions'''
+    __slots__ = '_name', '_fun', '_operands',
+
+    def __init__(self, name, fun, operands):
+        '''Initialize a new application
+
+        :param name: name of the operator
+        :type name: str
+        :param fun: function implementing the operator
+        :type fun: callable
+        :param operands: operand expressions
+        :type operands: tuple
+        '''
+        super(Apply, self).__init__()
+        self._name = name
+        self._fun = fun
+        self._operands = operands
+
+    __repr__ = lambda self: '%s(%s)' % (
+        self._name, ', '.join(repr(operand) for operand in self._operands))
+
+
+def lazy(value):
+    '''Turn a value into an expression
+
+    :param value: expression, Maybe value or plain value
+    :type value: object
+
+    :return: expression
+    :rtype: Expression
+    '''
+    return value if isinstance(value, Expression) else Const(value)
+
+def _unary_operator(name, fun):
+    '''Create an operator building an application of `fun`'''
+    return lambda self: Apply(name, fun, (self, ))
+
+def _binary_operator(name, fun, reflected=False):
+    '''Create an operator building an application of `fun`'''
+    if reflected:
+        return lambda self, other: Apply(name, fun, (lazy(other), self))
+
+    return lambda self, other: Apply(name, fun, (self, lazy(other)))
+
+for (name, fun) in BINARY_OPERATORS:
+    setattr(Expression, '__%s__' % name, _binary_operator(name, fun))
+    setattr(Expression, '__r%s__' % name, _binary_operator(name, fun, True))
+
+for (name, fun) in UNARY_OPERATORS:
+    setattr(Expression, '__%s__' % name, _unary_operator(name, fun))
+
+del name, fun
+
+
+def _nodes(expression):
+    '''Generate all nodes of an expression, operands before the nodes using
+    them, every node once'''
+    #pylint: disable-msg=W0212
+    seen = set()
+    stack = [(expression, False)]
+
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            yield node
+            continue
+
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+
+        stack.append((node, True))
+        for operand in reversed(node._operands):
+            if id(operand) not in seen:
+                stack.append((operand, False))
+
+def _compile(expression):
+    '''Compile an expression into a function'''
+    #pylint: disable-msg=W0212
+    names = dict() # Name of the value of every node, by id
+    slots = dict() # Name of the value of every distinct calculation
+    # Everything the generated code refers to starts with an underscore, so
+    # variables, which can't, never shadow it
+    namespace = dict(_Maybe=Maybe, _Nothing=Nothing, _Just=Just,
+                     _isinstance=isinstance, _Exception=Exception)
+    variables = set()
+    body = list()
+
+    for node in _nodes(expression):
+        if isinstance(node, Var):
+            names[id(node)] = node._name
+            variables.add(node._name)
+            continue
+
+        if isinstance(node, Const):
+            value = node._value
+            if value is Nothing:
+                return lambda *args, **kwargs: Nothing
+
+            if isinstance(value, Maybe):
+                value = value._value
+
+            key = 'const', id(node._value)
+        else:
+            key = (node._fun, ) + \
+                    tuple(names[id(operand)] for operand in node._operands)
+
+        name = slots.get(key)
+        if name is None:
+            name = slots[key] = '_v%d' % len(slots)
+
+            if isinstance(node, Const):
+                namespace[name] = value
+            else:
+                namespace['_f' + name] = node._fun
+                body.append('        %s = _f%s(%s)' % (
+                    name, name, ', '.join(key[1:])))
+
+        names[id(node)] = name
+
+    variables = sorted(variables)
+    source = ['def evaluate(%s):' % ', '.join(variables)]
+    for variable in variables:
+        source.append('    if _isinstance(%s, _Maybe):' % variable)
+        source.append('        if %s is _Nothing:' % variable)
+        source.append('            return _Nothing')
+        source.append('        %s = %s._value' % (variable, variable))
+
+    source.append('    try:')
+    source.extend(body)
+    source.append('        return _Just(%s)' % names[id(expression)])
+    source.append('    except _Exception:')
+    source.append('        return _Nothing')
+
+    exec compile('\n'.join(source), '<expression>', 'exec') in namespace
+    return namespace['evaluate']
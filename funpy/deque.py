@@ -0,0 +1,239 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Persistent double-ended queue
+
+A deque is stored as a front list and a reversed back list, both iterative
+Cons lists, as in Okasaki's banker's deque.  Whenever one of the lists
+grows longer than `BALANCE` times the other one (plus one), the items are
+redistributed evenly, so pushing and popping at both ends take amortised
+constant time.
+
+Deques compare equal to Cons lists holding the same items, and have the
+same hash.
+'''
+
+from itertools import islice, izip
+
+from .cons import IterativeNil, iterative_from_iterable
+
+BALANCE = 3
+
+def _drop(list_, count):
+    '''Drop the first `count` items of a list'''
+    for _ in xrange(count):
+        list_ = list_.tail
+
+    return list_
+
+def _balance(front, front_length, back, back_length):
+    '''Create a deque, redistributing its items if necessary'''
+    if not front_length + back_length:
+        return EmptyDeque
+
+    if front_length > BALANCE * back_length + 1:
+        length = (front_length + back_length) // 2
+        back = back.append(_drop(front, length).reverse())
+        front = iterative_from_iterable(islice(front, length))
+        front_length, back_length = \
+                length, front_length + back_length - length
+    elif back_length > BALANCE * front_length + 1:
+        length = (front_length + back_length) // 2
+        front = front.append(_drop(back, length).reverse())
+        back = iterative_from_iterable(islice(back, length))
+        front_length, back_length = \
+                front_length + back_length - length, length
+
+    return Deque(front, front_length, back, back_length)
+
+
+class Deque(object):
+    '''Persistent double-ended queue'''
+    __slots__ = '_front', '_front_length', '_back', '_back_length', '_hash',
+
+    def __init__(self, front, front_length, back, back_length):
+        '''Initialize a new deque
+
+        :param front: first items
+        :type front: IterativeConsCell
+        :param front_length: length of `front`
+        :type front_length: int
+        :param back: last items, in reverse order
+        :type back: IterativeConsCell
+        :param back_length: length of `back`
+        :type back_length: int
+        '''
+        self._front = front
+        self._front_length = front_length
+        self._back = back
+        self._back_length = back_length
+        self._hash = None
+
+    __len__ = lambda self: self._front_length + self._back_length
+    __nonzero__ = lambda self: bool(len(self))
+    empty = property(lambda self: not len(self), doc='Deque is empty')
+
+    def _end(self, first, second):
+        '''Retrieve the head of `first`, or else of `second`'''
+        if not first.empty:
+            return first.head
+
+        if not second.empty:
+            return second.head
+
+        raise IndexError('Deque is empty')
+
+    front = property(lambda self: self._end(self._front, self._back),
+                     doc='First item')
+    back = property(lambda self: self._end(self._back, self._front),
+                    doc='Last item')
+
+    def push_front(self, value):
+        '''Create a deque with `value` prepended
+
+        :param value: value to prepend
+        :type value: object
+
+        :return: new deque
+        :rtype: Deque
+        '''
+        return _balance(self._front << value, self._front_length + 1,
+                        self._back, self._back_length)
+
+    def push_back(self, value):
+        '''Create a deque with `value` appended
+
+        :param value: value to append
+        :type value: object
+
+        :return: new deque
+        :rtype: Deque
+        '''
+        return _balance(self._front, self._front_length,
+                        self._back << value, self._back_length + 1)
+
+    def pop_front(self):
+        '''Create a deque without the first item
+
+        :return: new deque
+        :rtype: Deque
+        '''
+        if self._front.empty:
+            if self._back.empty:
+                raise IndexError('Deque is empty')
+
+            return EmptyDeque
+
+        return _balance(self._front.tail, self._front_length - 1,
+                        self._back, self._back_length)
+
+    def pop_back(self):
+        '''Create a deque without the last item
+
+        :return: new deque
+        :rtype: Deque
+        '''
+        if self._back.empty:
+            if self._front.empty:
+                raise IndexError('Deque is empty')
+
+            return EmptyDeque
+
+        return _balance(self._front, self._front_length,
+                        self._back.tail, self._back_length - 1)
+
+    def __iter__(self):
+        for item in self._front:
+            yield item
+
+        for item in reversed(tuple(self._back)):
+            yield item
+
+    def __reversed__(self):
+        for item in self._back:
+            yield item
+
+        for item in reversed(tuple(self._front)):
+            yield item
+
+    def __eq__(self, other):
+        if isinstance(other, Deque):
+            if len(self) != len(other):
+                return False
+
+            if self._hash is not None and other._hash is not None and \
+                    self._hash != other._hash:
+                return False
+
+            return all(a == b for (a, b) in izip(self, other))
+
+        if not hasattr(other, 'empty') or not hasattr(other, 'tail'):
+            return NotImplemented
+
+        cell = other
+        for item in self:
+            if cell.empty or cell.head != item:
+                return False
+
+            cell = cell.tail
+
+        return cell.empty
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        if self._hash is None:
+            hash_ = hash(IterativeNil)
+            for item in reversed(self):
+                hash_ = hash(31 * hash_ + hash(item))
+
+            self._hash = hash_
+
+        return self._hash
+
+    _stringify = lambda self, fun: \
+            'Deque([' + ', '.join(fun(item) for item in self) + '])'
+    __str__ = lambda self: self._stringify(str)
+    __unicode__ = lambda self: unicode(self._stringify(unicode))
+    __repr__ = lambda self: self._stringify(repr)
+
+    __reduce__ = lambda self: (deque_from_iterable, (tuple(self), ))
+
+EmptyDeque = Deque(IterativeNil, 0, IterativeNil, 0) #pylint: disable-msg=C0103
+
+def deque_from_iterable(iterable):
+    '''Create a deque from an iterable
+
+    :param iterable: items of the deque
+    :type iterable: iterable
+
+    :return: new deque
+    :rtype: Deque
+    '''
+    items = tuple(iterable)
+    if not items:
+        return EmptyDeque
+
+    length = (len(items) + 1) // 2
+    return Deque(iterative_from_iterable(items[:length]), length,
+                 iterative_from_iterable(reversed(items[length:])),
+                 len(items) - length)
@@ -0,0 +1,490 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Persistent hash array mapped trie (HAMT) map
+
+Every level of the trie consumes 5 bits of the hash of a key, so lookups,
+`assoc` and `dissoc` visit at most 13 nodes, and only copy the nodes on the
+path to the key, sharing all others with the previous version of the map.
+Keys whose hashes are equal end up in a collision node.
+
+The shape of the trie only depends on the keys in it: nodes holding a
+single key are collapsed into their parent when removing keys.  This allows
+comparing maps node by node, stopping at shared nodes, and caching the hash
+of every node.
+'''
+
+from .cons import const
+
+BITS = 5
+MASK = (1 << BITS) - 1
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+
+# Key of an entry whose value is a subnode
+_NODE = object()
+# Lookup result for missing keys
+_MISSING = object()
+
+_hash = lambda key: hash(key) & HASH_MASK
+_popcount = lambda value: bin(value).count('1')
+
+class _BitmapNode(object): #pylint: disable-msg=R0903
+    '''Trie node holding up to 32 entries
+
+    `_entries` holds a `key, value` pair for every bit set in `_bitmap`,
+    `key` being `_NODE` for subnodes.
+    '''
+    __slots__ = '_bitmap', '_entries', '_hash',
+
+    def __init__(self, bitmap, entries):
+        self._bitmap = bitmap
+        self._entries = entries
+        self._hash = None
+
+
+class _CollisionNode(object): #pylint: disable-msg=R0903
+    '''Trie node holding keys of which all hash bits are equal
+
+    `_entries` holds a `key, value` pair for every key.
+    '''
+    __slots__ = '_keyhash', '_entries', '_hash',
+
+    def __init__(self, keyhash, entries):
+        self._keyhash = keyhash
+        self._entries = entries
+        self._hash = None
+
+
+def _lookup(node, hash_, key):
+    '''Retrieve the value of `key`, or `_MISSING`'''
+    #pylint: disable-msg=W0212
+    shift = 0
+    while True:
+        entries = node._entries
+
+        if type(node) is _CollisionNode:
+            for index in xrange(0, len(entries), 2):
+                if entries[index] == key:
+                    return entries[index + 1]
+
+            return _MISSING
+
+        bit = 1 << ((hash_ >> shift) & MASK)
+        if not node._bitmap & bit:
+            return _MISSING
+
+        index = 2 * _popcount(node._bitmap & (bit - 1))
+        entry_key = entries[index]
+        if entry_key is _NODE:
+            node = entries[index + 1]
+            shift += BITS
+        elif entry_key is key or entry_key == key:
+            return entries[index + 1]
+        else:
+            return _MISSING
+
+def _pair(shift, key1, hash1, value1, key2, hash2, value2):
+    '''Create the node holding two keys, starting at `shift`'''
+    if shift >= HASH_BITS:
+        return _CollisionNode(hash1, (key1, value1, key2, value2))
+
+    index1 = (hash1 >> shift) & MASK
+    index2 = (hash2 >> shift) & MASK
+
+    if index1 == index2:
+        return _BitmapNode(1 << index1, (_NODE, _pair(
+            shift + BITS, key1, hash1, value1, key2, hash2, value2)))
+
+    if index1 > index2:
+        key1, value1, key2, value2 = key2, value2, key1, value1
+
+    return _BitmapNode((1 << index1) | (1 << index2),
+                       (key1, value1, key2, value2))
+
+def _assoc(node, shift, hash_, key, value):
+    '''Create a node with `key` set to `value`
+
+    :return: `(node, added)` tuple, `added` telling whether `key` is new,
+        `node` being `node` itself if nothing changed
+    :rtype: tuple
+    '''
+    #pylint: disable-msg=W0212
+    entries = node._entries
+
+    if type(node) is _CollisionNode:
+        for index in xrange(0, len(entries), 2):
+            if entries[index] == key:
+                if entries[index + 1] is value:
+                    return node, False
+
+                return _CollisionNode(node._keyhash, entries[:index + 1] +
+                                      (value, ) + entries[index + 2:]), False
+
+        return _CollisionNode(node._keyhash, entries + (key, value)), True
+
+    bit = 1 << ((hash_ >> shift) & MASK)
+    index = 2 * _popcount(node._bitmap & (bit - 1))
+
+    if not node._bitmap & bit:
+        return _BitmapNode(node._bitmap | bit, entries[:index] +
+                           (key, value) + entries[index:]), True
+
+    entry_key, entry_value = entries[index], entries[index + 1]
+    if entry_key is _NODE:
+        subnode, added = _assoc(entry_value, shift + BITS, hash_, key,
+                                value)
+        if subnode is entry_value:
+            return node, False
+        entry_key, entry_value = _NODE, subnode
+    elif entry_key is key or entry_key == key:
+        if entry_value is value:
+            return node, False
+        entry_value, added = value, False
+    else:
+        entry_value = _pair(shift + BITS, entry_key, _hash(entry_key),
+                            entry_value, key, hash_, value)
+        entry_key, added = _NODE, True
+
+    return _BitmapNode(node._bitmap, entries[:index] +
+                       (entry_key, entry_value) + entries[index + 2:]), added
+
+def _dissoc(node, shift, hash_, key):
+    '''Create a node without `key`
+
+    :return: `node` itself if `key` isn't present, `None` if the node
+        becomes empty, a `(key, value)` tuple if a single key remains which
+        should be moved into the parent, or else the new node
+    :rtype: object
+    '''
+    #pylint: disable-msg=W0212
+    entries = node._entries
+
+    if type(node) is _CollisionNode:
+        for index in xrange(0, len(entries), 2):
+            if entries[index] == key:
+                entries = entries[:index] + entries[index + 2:]
+                if len(entries) == 2:
+                    return entries
+
+                return _CollisionNode(node._keyhash, entries)
+
+        return node
+
+    bit = 1 << ((hash_ >> shift) & MASK)
+    if not node._bitmap & bit:
+        return node
+
+    index = 2 * _popcount(node._bitmap & (bit - 1))
+    entry_key, entry_value = entries[index], entries[index + 1]
+
+    if entry_key is _NODE:
+        result = _dissoc(entry_value, shift + BITS, hash_, key)
+        if result is entry_value:
+            return node
+
+        if result is not None:
+            if type(result) is tuple:
+                entries = entries[:index] + result + entries[index + 2:]
+            else:
+                entries = entries[:index] + (_NODE, result) + \
+                        entries[index + 2:]
+
+            if shift and len(entries) == 2 and entries[0] is not _NODE:
+                return entries
+
+            return _BitmapNode(node._bitmap, entries)
+    elif not (entry_key is key or entry_key == key):
+        return node
+
+    bitmap = node._bitmap & ~bit
+    entries = entries[:index] + entries[index + 2:]
+
+    if not entries:
+        return None
+
+    if shift and len(entries) == 2 and entries[0] is not _NODE:
+        return entries
+
+    return _BitmapNode(bitmap, entries)
+
+def _items(node):
+    '''Generate all `(key, value)` pairs of a node'''
+    #pylint: disable-msg=W0212
+    stack = [node]
+    while stack:
+        entries = stack.pop()._entries
+        for index in xrange(0, len(entries), 2):
+            key = entries[index]
+            if key is _NODE:
+                stack.append(entries[index + 1])
+            else:
+                yield key, entries[index + 1]
+
+def _node_hash(node):
+    '''Calculate the hash of a node, independent of the order of entries'''
+    #pylint: disable-msg=W0212
+    if node._hash is None:
+        entries = node._entries
+        hash_ = 0
+        for index in xrange(0, len(entries), 2):
+            key = entries[index]
+            if key is _NODE:
+                hash_ += _node_hash(entries[index + 1])
+            else:
+                hash_ += hash((key, entries[index + 1]))
+
+        node._hash = hash_ & HASH_MASK
+
+    return node._hash
+
+def _node_eq(node1, node2):
+    '''Compare two nodes, stopping at shared nodes'''
+    #pylint: disable-msg=W0212
+    if node1 is node2:
+        return True
+
+    if type(node1) is not type(node2) or \
+            len(node1._entries) != len(node2._entries):
+        return False
+
+    if node1._hash is not None and node2._hash is not None and \
+            node1._hash != node2._hash:
+        return False
+
+    entries1, entries2 = node1._entries, node2._entries
+
+    if type(node1) is _CollisionNode:
+        for index in xrange(0, len(entries1), 2):
+            value = _lookup(node2, node1._keyhash, entries1[index])
+            if value is _MISSING or value != entries1[index + 1]:
+                return False
+
+        return True
+
+    if node1._bitmap != node2._bitmap:
+        return False
+
+    for index in xrange(0, len(entries1), 2):
+        key1, key2 = entries1[index], entries2[index]
+        if key1 is _NODE or key2 is _NODE:
+            if key1 is not key2 or \
+                    not _node_eq(entries1[index + 1], entries2[index + 1]):
+                return False
+        elif key1 != key2 or entries1[index + 1] != entries2[index + 1]:
+            return False
+
+    return True
+
+def _build(items, shift):
+    '''Create the node holding `(hash, key, value)` items, or the single
+    `key, value` entry if there's only one'''
+    if len(items) == 1:
+        return items[0][1:]
+
+    if shift >= HASH_BITS:
+        entries = ()
+        for (_, key, value) in items:
+            entries += (key, value)
+        return _CollisionNode(items[0][0], entries)
+
+    groups = dict()
+    for item in items:
+        groups.setdefault((item[0] >> shift) & MASK, list()).append(item)
+
+    bitmap = 0
+    entries = ()
+    for index in sorted(groups):
+        bitmap |= 1 << index
+        entry = _build(groups[index], shift + BITS)
+        entries += entry if type(entry) is tuple else (_NODE, entry)
+
+    return _BitmapNode(bitmap, entries)
+
+
+class Map(object):
+    '''Persistent map
+
+    Maps are created by `EmptyMap.assoc` or `map_from_iterable`.
+    Iterating a map yields its keys, in no particular order.
+    '''
+    __slots__ = '_root', '_count',
+
+    def __init__(self, root, count):
+        '''Initialize a new map
+
+        :param root: root node
+        :type root: _BitmapNode
+        :param count: number of keys
+        :type count: int
+        '''
+        self._root = root
+        self._count = count
+
+    __len__ = lambda self: self._count
+    __nonzero__ = const(True)
+    empty = property(const(False), doc='Map is empty')
+
+    def get(self, key, default=None):
+        '''Retrieve the value of a key
+
+        :param key: key to look up
+        :type key: object
+        :param default: value to return if `key` isn't present
+        :type default: object
+
+        :return: value of `key`, or `default`
+        :rtype: object
+        '''
+        value = _lookup(self._root, _hash(key), key)
+        return default if value is _MISSING else value
+
+    def __getitem__(self, key):
+        value = _lookup(self._root, _hash(key), key)
+        if value is _MISSING:
+            raise KeyError(key)
+
+        return value
+
+    __contains__ = lambda self, key: \
+            _lookup(self._root, _hash(key), key) is not _MISSING
+
+    def assoc(self, key, value):
+        '''Create a map with `key` set to `value`
+
+        :param key: key to set
+        :type key: object
+        :param value: value to set
+        :type value: object
+
+        :return: new map, or this map if `key` is set to `value` already
+        :rtype: Map
+        '''
+        root, added = _assoc(self._root, 0, _hash(key), key, value)
+        if root is self._root:
+            return self
+
+        return Map(root, self._count + added)
+
+    def dissoc(self, key):
+        '''Create a map without `key`
+
+        :param key: key to remove
+        :type key: object
+
+        :return: new map, or this map if `key` isn't present
+        :rtype: Map
+        '''
+        root = _dissoc(self._root, 0, _hash(key), key)
+        if root is self._root:
+            return self
+
+        if root is None:
+            return EmptyMap
+
+        return Map(root, self._count - 1)
+
+    iteritems = lambda self: _items(self._root)
+    iterkeys = lambda self: (key for (key, _) in _items(self._root))
+    itervalues = lambda self: (value for (_, value) in _items(self._root))
+    __iter__ = iterkeys
+
+    items = lambda self: list(self.iteritems())
+    keys = lambda self: list(self.iterkeys())
+    values = lambda self: list(self.itervalues())
+
+    def __eq__(self, other):
+        if not isinstance(other, Map):
+            return NotImplemented
+
+        #pylint: disable-msg=W0212
+        return self._count == other._count and \
+                _node_eq(self._root, other._root)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = lambda self: hash(_node_hash(self._root))
+
+    __reduce__ = lambda self: (map_from_iterable, (self.items(), ))
+
+    _stringify = lambda self, fun: 'Map({%s})' % ', '.join(
+        '%s: %s' % (fun(key), fun(value)) for (key, value) in self.iteritems())
+    __str__ = lambda self: self._stringify(str)
+    __unicode__ = lambda self: unicode(self._stringify(unicode))
+    __repr__ = lambda self: self._stringify(repr)
+
+
+class EmptyMap(Map):
+    '''Empty map'''
+    __slots__ = tuple()
+
+    #pylint: disable-msg=W0231
+    __init__ = const(None)
+
+    __len__ = const(0)
+    __nonzero__ = const(False)
+    empty = property(const(True), doc='Map is empty')
+
+    get = lambda self, key, default=None: default
+
+    def __getitem__(self, key):
+        raise KeyError(key)
+
+    __contains__ = const(False)
+
+    assoc = lambda self, key, value: \
+            Map(_BitmapNode(1 << (_hash(key) & MASK), (key, value)), 1)
+    dissoc = lambda self, key: self
+
+    iteritems = iterkeys = itervalues = __iter__ = lambda _: iter(tuple())
+
+    __eq__ = lambda self, other: self is other if isinstance(other, Map) \
+            else NotImplemented
+    __hash__ = const(8723487234987L)
+
+    _stringify = const('EmptyMap')
+    __reduce__ = lambda self: 'EmptyMap'
+EmptyMap = EmptyMap() #pylint: disable-msg=C0103
+
+def map_from_iterable(iterable):
+    '''Create a map from `(key, value)` pairs
+
+    The trie is built directly from all keys, without creating intermediate
+    maps.  Later pairs override earlier pairs with an equal key.
+
+    :param iterable: `(key, value)` pairs
+    :type iterable: iterable
+
+    :return: new map
+    :rtype: Map
+    '''
+    items = dict(iterable)
+    if not items:
+        return EmptyMap
+
+    root = _build([(_hash(key), key, value)
+                   for (key, value) in items.iteritems()], 0)
+    if type(root) is tuple:
+        key, value = root
+        return EmptyMap.assoc(key, value)
+
+    return Map(root, len(items))
@@ -0,0 +1,201 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Opt-in instrumentation of Cons list operations and Maybe binding
+
+Once `enable` is called, the operations of all Cons cell classes defined at
+that time and `Just.bind` are replaced by instrumented versions, until
+`disable` restores the originals.  Nothing is instrumented by default, so
+this costs nothing unless enabled.
+
+The following is recorded:
+
+- the number of cells allocated, per class
+- per operation (`__len__`, `__getitem__`, `__contains__`, `__eq__`,
+  `__hash__` and `_stringify`): the number of calls, the number of cells
+  traversed, and the wall time spent
+- the number of `Just.bind` calls, the wall time spent in them, and the
+  exceptions turned into `Nothing`, per exception type
+
+Cells are counted as traversed when their `tail` is accessed, so
+implementations walking internal blocks (e.g. unrolled lists) report fewer
+cells.  Operations called by an operation of the same kind, e.g. through
+`super`, are accounted to the outer call only; the time of other nested
+operations is included in the time of both.
+'''
+
+import threading
+import collections
+
+from timeit import default_timer
+
+from .cons import ConsCell
+from .maybe import Just
+
+OPERATIONS = '__len__', '__getitem__', '__contains__', '__eq__', \
+        '__hash__', '_stringify',
+
+_allocations = collections.defaultdict(int) #pylint: disable-msg=C0103
+_calls = collections.defaultdict(int) #pylint: disable-msg=C0103
+_cells = collections.defaultdict(int) #pylint: disable-msg=C0103
+_time = collections.defaultdict(float) #pylint: disable-msg=C0103
+_exceptions = collections.defaultdict(int) #pylint: disable-msg=C0103
+
+# Stack of operations being executed, per thread
+_local = threading.local() #pylint: disable-msg=C0103
+# Replaced attributes as `(class, name, original)` tuples
+_patched = list() #pylint: disable-msg=C0103
+
+def _stack():
+    '''Retrieve the operation stack of the current thread'''
+    try:
+        return _local.stack
+    except AttributeError:
+        stack = _local.stack = list()
+        return stack
+
+def _subclasses(cls):
+    '''Generate a class and all its subclasses'''
+    yield cls
+    for subclass in cls.__subclasses__():
+        for cls_ in _subclasses(subclass):
+            yield cls_
+
+def _patch(cls, name, value):
+    '''Replace an attribute of a class, remembering the original'''
+    _patched.append((cls, name, cls.__dict__[name]))
+    setattr(cls, name, value)
+
+def _instrument_operation(name, fun):
+    '''Create an instrumented version of an operation'''
+    def instrumented(*args, **kwargs):
+        '''Count and time the call, and account traversals to it'''
+        stack = _stack()
+        if stack and stack[-1] == name:
+            return fun(*args, **kwargs)
+
+        _calls[name] += 1
+        stack.append(name)
+        start = default_timer()
+        try:
+            return fun(*args, **kwargs)
+        finally:
+            _time[name] += default_timer() - start
+            stack.pop()
+
+    instrumented.__name__ = fun.__name__
+    instrumented.__doc__ = fun.__doc__
+
+    return instrumented
+
+def _instrument_tail(fget):
+    '''Create an instrumented `tail` getter'''
+    def instrumented(self):
+        '''Account a traversed cell to the current operation'''
+        stack = _stack()
+        _cells[stack[-1] if stack else None] += 1
+        return fget(self)
+
+    return instrumented
+
+def _instrument_init(init):
+    '''Create an instrumented `ConsCell.__init__`'''
+    def instrumented(self, head, tail):
+        '''Count an allocated cell'''
+        _allocations[type(self).__name__] += 1
+        init(self, head, tail)
+
+    instrumented.__doc__ = init.__doc__
+
+    return instrumented
+
+def _bind(self, fun):
+    '''Instrumented version of `Just.bind`'''
+    _calls['bind'] += 1
+    start = default_timer()
+    try:
+        return fun(self._value) #pylint: disable-msg=W0212
+    except Exception, exc: #pylint: disable-msg=W0703
+        _exceptions[type(exc).__name__] += 1
+        return self.fail(exc)
+    finally:
+        _time['bind'] += default_timer() - start
+
+def enabled():
+    '''Check whether instrumentation is enabled
+
+    :rtype: bool
+    '''
+    return bool(_patched)
+
+def enable():
+    '''Enable instrumentation
+
+    Only Cons cell classes defined when this is called are instrumented.
+    '''
+    if enabled():
+        return
+
+    _patch(ConsCell, '__init__', _instrument_init(ConsCell.__dict__[
+        '__init__']))
+
+    for cls in _subclasses(ConsCell):
+        for name in OPERATIONS:
+            fun = cls.__dict__.get(name)
+            if callable(fun):
+                _patch(cls, name, _instrument_operation(name, fun))
+
+        tail = cls.__dict__.get('tail')
+        if isinstance(tail, property):
+            _patch(cls, 'tail', property(_instrument_tail(tail.fget),
+                                         doc=tail.__doc__))
+
+    _patch(Just, 'bind', _bind)
+
+def disable():
+    '''Disable instrumentation, restoring the original operations
+
+    Recorded data is kept until `reset` is called.
+    '''
+    while _patched:
+        cls, name, value = _patched.pop()
+        setattr(cls, name, value)
+
+def reset():
+    '''Clear all recorded data'''
+    for data in (_allocations, _calls, _cells, _time, _exceptions):
+        data.clear()
+
+def snapshot():
+    '''Retrieve the data recorded since the last `reset`
+
+    :return: dictionary with `allocations` (cells allocated per class
+        name), `operations` (`calls`, `cells` and `time` per operation name,
+        including `bind`), `exceptions` (exceptions caught by `Just.bind`
+        per exception type name) and `untracked` (cells traversed outside
+        instrumented operations, e.g. by iteration)
+    :rtype: dict
+    '''
+    operations = dict((name, dict(calls=_calls[name], cells=_cells[name],
+                                  time=_time[name]))
+                      for name in OPERATIONS + ('bind', ))
+
+    return dict(allocations=dict(_allocations), operations=operations,
+                exceptions=dict(_exceptions), untracked=_cells[None])
@@ -17,7 +17,12 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
 # MA  02110-1301  USA
 
-from .monad import Monad, NumericMonadMixin
+import array
+
+from itertools import islice, izip, repeat
+
+from .monad import Monad, NumericMonadMixin, liftM, BINARY_OPERATORS, \
+        UNARY_OPERATORS
 
 class Maybe(Monad, NumericMonadMixin):
     __slots__ = tuple()
@@ -42,6 +47,8 @@ class Nothing(Maybe):
 
     __hash__ = lambda *_: 9873983764589L
 
+    __reduce__ = lambda *_: 'Nothing'
+
 Nothing = Nothing()
 
 
@@ -69,3 +76,330 @@ class Just(Maybe):
     _stringify = lambda self, fun: 'Just(' + fun(self._value) + ')'
 
     __hash__ = lambda self: hash(self._value)
+
+    __reduce__ = lambda self: (Just, (self._value, ))
+
+
+def pipeline(*funs):
+    '''Compose functions into a single bind chain
+
+    `pipeline(f, g, h)(m)` results in the same value as
+    `m.bind(f).bind(g).bind(h)`, but the chain of `Just` values runs in a
+    single exception handler, without creating intermediate binds.  Chaining
+    falls back to `bind` when a function returns anything but `Just` or
+    `Nothing`.
+
+    :param funs: functions taking a value and returning a Maybe value
+    :type funs: tuple
+
+    :return: function taking a Maybe value and returning the result
+    :rtype: callable
+    '''
+    count = len(funs)
+
+    def bound(value):
+        index = 0
+
+        while index < count:
+            if value is Nothing:
+                return value
+
+            if type(value) is not Just:
+                for fun in funs[index:]:
+                    value = value.bind(fun)
+                return value
+
+            result = value
+            try:
+                for fun in funs[index:]:
+                    index += 1
+                    result = fun(result._value)
+                    if type(result) is not Just:
+                        break
+            except Exception, exc:
+                return value.fail(exc)
+
+            value = result
+
+        return value
+
+    return bound
+
+def lift_pipeline(*funs):
+    '''Compose functions into a single lifted bind chain
+
+    `lift_pipeline(f, g)(m)` results in the same value as
+    `liftM(g)(liftM(f)(m))`, but creates no intermediate `Just` values.
+
+    :param funs: functions taking and returning a plain value
+    :type funs: tuple
+
+    :return: function taking a Maybe value and returning the result
+    :rtype: callable
+    '''
+    def bound(value):
+        if value is Nothing:
+            return value
+
+        if type(value) is not Just:
+            for fun in funs:
+                value = liftM(fun)(value)
+            return value
+
+        result = value._value
+        try:
+            for fun in funs:
+                result = fun(result)
+        except Exception, exc:
+            return value.fail(exc)
+
+        return value.return_(result)
+
+    return bound
+
+Maybe.pipeline = staticmethod(pipeline)
+Maybe.lift_pipeline = staticmethod(lift_pipeline)
+
+
+def _apply(fun, mask, *columns):
+    '''Apply a function to the valid rows of some columns
+
+    Rows are calculated in a single loop, which is only guarded row by row
+    once a row raises an exception, masking the rows raising one.  Every
+    valid row is calculated exactly once.
+
+    :return: `(values, mask)` tuple, masked values being `0`
+    :rtype: tuple
+    '''
+    values = list()
+    append = values.append
+    rows = izip(mask, izip(*columns))
+
+    try:
+        for (valid, row) in rows:
+            append(fun(*row) if valid else 0)
+    except Exception: #pylint: disable-msg=W0703
+        pass
+    else:
+        return values, array.array('B', mask)
+
+    # The row following the calculated ones raised an exception
+    result_mask = array.array('B', islice(mask, len(values)))
+    append(0)
+    result_mask.append(0)
+
+    for (valid, row) in rows:
+        if valid:
+            try:
+                append(fun(*row))
+            except Exception: #pylint: disable-msg=W0703
+                pass
+            else:
+                result_mask.append(1)
+                continue
+
+        append(0)
+        result_mask.append(0)
+
+    return values, result_mask
+
+_INTEGER_TYPECODES = 'bBhHiIlL'
+_FLOAT_TYPECODES = 'fd'
+
+def _store(values, mask, typecode):
+    '''Store values in an array of `typecode`, or in an array of integers
+    or floats if all valid values are either, or else in a list
+
+    `typecode` is only used if it fits the type of the valid values, so
+    values are never converted between integers and floats.
+    '''
+    types = set(type(value)
+                for (value, valid) in izip(values, mask) if valid)
+
+    if types <= set((int, )):
+        typecodes, default = _INTEGER_TYPECODES, 'l'
+    elif types == set((float, )):
+        typecodes, default = _FLOAT_TYPECODES, 'd'
+    else:
+        return values
+
+    if typecode is not None and typecode in typecodes:
+        try:
+            return array.array(typecode, values)
+        except OverflowError:
+            pass
+
+    return array.array(default, values)
+
+
+class MaybeArray(object):
+    '''Batch of Maybe values
+
+    Values are stored in an `array.array` (or a list, if they don't fit in
+    one) together with a mask marking valid values, the others being
+    `Nothing`.  Numeric operators are applied to all valid values in one
+    go, values for which the operator raises an exception become `Nothing`.
+    Other operands are either MaybeArray values of the same length, which
+    are combined element by element, or used for every value.
+    '''
+    __slots__ = '_values', '_mask',
+
+    def __init__(self, values, mask=None):
+        '''Initialize a new batch
+
+        :param values: values of the batch, masked values are ignored
+        :type values: sequence
+        :param mask: validity of every value, all valid if not given
+        :type mask: sequence
+        '''
+        self._values = values
+        if mask is None:
+            self._mask = array.array('B', [1]) * len(values)
+        else:
+            self._mask = array.array('B', (1 if valid else 0
+                                           for valid in mask))
+
+        if len(self._mask) != len(values):
+            raise ValueError('Mask and values differ in length')
+
+    @classmethod
+    def from_maybes(cls, maybes, typecode=None):
+        '''Create a batch from Maybe values
+
+        Values are stored in an array of `typecode` if they are integers or
+        floats matching it, in an array of integers (`'l'`) or floats
+        (`'d'`) if they are integers or floats, or else in a list.
+
+        :param maybes: `Just` and `Nothing` values
+        :type maybes: iterable
+        :param typecode: preferred typecode of the value array
+        :type typecode: str
+
+        :return: new batch
+        :rtype: MaybeArray
+        '''
+        values = list()
+        mask = array.array('B')
+        for maybe in maybes:
+            if maybe is Nothing:
+                values.append(0)
+                mask.append(0)
+            else:
+                values.append(maybe._value) #pylint: disable-msg=W0212
+                mask.append(1)
+
+        return cls._create(values, mask, typecode)
+
+    @classmethod
+    def _create(cls, values, mask, typecode):
+        '''Create a batch from a list of values and a mask array'''
+        batch = cls.__new__(cls)
+        batch._values = _store(values, mask, typecode)
+        batch._mask = mask
+        return batch
+
+    values = property(lambda self: self._values,
+                      doc='Values, including masked values')
+    mask = property(lambda self: self._mask, doc='Validity of values')
+    typecode = property(lambda self: getattr(self._values, 'typecode', None),
+                        doc='Typecode of the value array, if any')
+
+    __len__ = lambda self: len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            batch = type(self).__new__(type(self))
+            batch._values = self._values[index] #pylint: disable-msg=W0212
+            batch._mask = self._mask[index] #pylint: disable-msg=W0212
+            return batch
+
+        if self._mask[index]:
+            return Just(self._values[index])
+
+        return Nothing
+
+    def __iter__(self):
+        for (value, valid) in izip(self._values, self._mask):
+            yield Just(value) if valid else Nothing
+
+    def _columns(self, other):
+        '''Create the mask and columns of an operation with `other`'''
+        if other is Nothing:
+            return array.array('B', [0]) * len(self), \
+                    (self._values, repeat(0))
+
+        if isinstance(other, Maybe):
+            other = other._value #pylint: disable-msg=W0212
+
+        if not isinstance(other, MaybeArray):
+            return self._mask, (self._values, repeat(other))
+
+        if len(other) != len(self):
+            raise ValueError('Batches differ in length')
+
+        mask = array.array('B', (a & b for (a, b) in
+                                 izip(self._mask, other._mask)))
+        return mask, (self._values, other._values)
+
+    def bind(self, fun):
+        '''Bind a function to every valid value
+
+        :param fun: function taking a value and returning a Maybe value
+        :type fun: callable
+
+        :return: batch of results
+        :rtype: MaybeArray
+        '''
+        return self.from_maybes((maybe.bind(fun) for maybe in self),
+                                self.typecode)
+
+    def __eq__(self, other):
+        if not isinstance(other, MaybeArray):
+            return NotImplemented
+
+        return len(self) == len(other) and \
+                all(a == b for (a, b) in izip(self, other))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    _stringify = lambda self, fun: \
+            'MaybeArray([' + ', '.join(fun(maybe) for maybe in self) + '])'
+    __str__ = lambda self: self._stringify(str)
+    __repr__ = lambda self: self._stringify(repr)
+    __unicode__ = lambda self: self._stringify(unicode)
+
+
+def _unary_operator(fun):
+    '''Create an operator applying `fun` to a batch'''
+    def operator_(self):
+        #pylint: disable-msg=W0212
+        values, mask = _apply(fun, self._mask, self._values)
+        return MaybeArray._create(values, mask, self.typecode)
+
+    return operator_
+
+def _binary_operator(fun, reflected=False):
+    '''Create an operator applying `fun` to a batch and an operand'''
+    def operator_(self, other):
+        #pylint: disable-msg=W0212
+        mask, columns = self._columns(other)
+        if reflected:
+            columns = columns[::-1]
+
+        values, mask = _apply(fun, mask, *columns)
+        return MaybeArray._create(values, mask, self.typecode)
+
+    return operator_
+
+for (name, fun) in BINARY_OPERATORS:
+    setattr(MaybeArray, '__%s__' % name, _binary_operator(fun))
+    setattr(MaybeArray, '__r%s__' % name, _binary_operator(fun, True))
+
+for (name, fun) in UNARY_OPERATORS:
+    setattr(MaybeArray, '__%s__' % name, _unary_operator(fun))
+
+del name, fun
@@ -0,0 +1,224 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Memoization of pure functions on persistent values
+
+Cons lists and Maybe values cache their hashes, and compare equal right
+away when they share structure, so they make cheap cache keys.  `memoize`
+builds on that:
+
+- arguments are hashed once per call, reusing cached hashes
+- calls with the very same argument objects as a cached call are found by
+  identity, without hashing or comparing anything
+- arguments are compared by identity before comparing them by value
+
+The cache is bounded by the number of entries and optionally by their
+total weight, evicting the least recently used entries first.
+'''
+
+import types
+import threading
+import functools
+import collections
+
+from itertools import izip
+
+class _Key(object):
+    '''Cache key of a call, holding its hash'''
+    __slots__ = '_items', '_hash',
+
+    def __init__(self, items):
+        self._items = items
+        self._hash = hash(items)
+
+    __hash__ = lambda self: self._hash
+
+    def __eq__(self, other):
+        #pylint: disable-msg=W0212
+        if self is other:
+            return True
+
+        if self._hash != other._hash or \
+                len(self._items) != len(other._items):
+            return False
+
+        for (item1, item2) in izip(self._items, other._items):
+            if item1 is not item2 and not item1 == item2:
+                return False
+
+        return True
+
+    __ne__ = lambda self, other: not self.__eq__(other)
+
+
+class Memo(object):
+    '''Memoized function
+
+    `stats` holds the number of `hits` (of which `identity_hits` were found
+    by identity), `misses`, `uncached` calls (with unhashable arguments),
+    `evictions`, and the current `size` and `weight` of the cache.
+    '''
+    def __init__(self, fun, maxsize=128, maxweight=None, weight=None):
+        '''Initialize a new memoized function
+
+        :param fun: pure function to memoize
+        :type fun: callable
+        :param maxsize: maximal number of cached results
+        :type maxsize: int
+        :param maxweight: maximal total weight of cached results, if any
+        :type maxweight: float
+        :param weight: function calculating the weight of a result, given
+            the arguments tuple, the keyword arguments dictionary and the
+            result, every result weighing 1 if not given
+        :type weight: callable
+        '''
+        for name in functools.WRAPPER_ASSIGNMENTS:
+            if hasattr(fun, name):
+                setattr(self, name, getattr(fun, name))
+
+        self._fun = fun
+        self._maxsize = maxsize
+        self._maxweight = maxweight
+        self._weigh = weight
+
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._identities = dict()
+        self._weight = 0
+        self._stats = collections.defaultdict(int)
+
+    def _lookup(self, items):
+        '''Look up a cached result
+
+        :return: `(key, identity, entry)` tuple, `key` being `None` for
+            unhashable arguments, `entry` being `None` if not cached
+        :rtype: tuple
+        '''
+        identity = tuple(id(item) for item in items)
+
+        key = self._identities.get(identity)
+        if key is not None:
+            #pylint: disable-msg=W0212
+            if all(item1 is item2 for (item1, item2)
+                   in izip(items, key._items)):
+                self._stats['identity_hits'] += 1
+                return key, identity, self._entries[key]
+
+        try:
+            key = _Key(items)
+        except TypeError:
+            return None, identity, None
+
+        return key, identity, self._entries.get(key)
+
+    def __call__(self, *args, **kwargs):
+        items = args
+        if kwargs:
+            items += (_KWARGS, ) + tuple(sorted(kwargs.iteritems()))
+
+        with self._lock:
+            key, identity, entry = self._lookup(items)
+
+            if key is None:
+                self._stats['uncached'] += 1
+            elif entry is not None:
+                self._stats['hits'] += 1
+                # Mark as most recently used
+                del self._entries[key]
+                self._entries[key] = entry
+                return entry[0]
+            else:
+                self._stats['misses'] += 1
+
+        result = self._fun(*args, **kwargs)
+
+        if key is not None:
+            weight = 1 if self._weigh is None else \
+                    self._weigh(args, kwargs, result)
+            self._store(key, identity, result, weight)
+
+        return result
+
+    def _store(self, key, identity, result, weight):
+        '''Cache a result, evicting other results if necessary'''
+        if self._maxweight is not None and weight > self._maxweight:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+
+            self._entries[key] = result, identity, weight
+            self._identities[identity] = key
+            self._weight += weight
+
+            while len(self._entries) > self._maxsize or \
+                    (self._maxweight is not None and
+                     self._weight > self._maxweight):
+                evicted, (_, identity, weight) = \
+                        self._entries.popitem(last=False)
+                if self._identities.get(identity) is evicted:
+                    del self._identities[identity]
+                self._weight -= weight
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        '''Remove all cached results and reset the statistics'''
+        with self._lock:
+            self._entries.clear()
+            self._identities.clear()
+            self._weight = 0
+            self._stats.clear()
+
+    def _get_stats(self):
+        '''Collect the cache statistics'''
+        stats = dict((name, self._stats[name]) for name in
+                     ('hits', 'identity_hits', 'misses', 'uncached',
+                      'evictions'))
+        stats.update(size=len(self._entries), weight=self._weight)
+        return stats
+
+    stats = property(_get_stats, doc='Cache statistics')
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        return types.MethodType(self, instance, owner)
+
+# Separates positional from keyword arguments in cache keys
+_KWARGS = object()
+
+def memoize(maxsize=128, maxweight=None, weight=None):
+    '''Create a decorator memoizing a pure function
+
+    :param maxsize: maximal number of cached results
+    :type maxsize: int
+    :param maxweight: maximal total weight of cached results, if any
+    :type maxweight: float
+    :param weight: function calculating the weight of a result, given the
+        arguments tuple, the keyword arguments dictionary and the result,
+        every result weighing 1 if not given
+    :type weight: callable
+
+    :return: decorator
+    :rtype: callable
+    '''
+    return lambda fun: Memo(fun, maxsize, maxweight, weight)
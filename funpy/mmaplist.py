@@ -0,0 +1,311 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Memory-mapped, read-only Cons lists
+
+A list is saved to a file as a sequence of records, either fixed-width
+records packed using a `struct` format, or length-prefixed strings.  When
+loaded, the file is mapped into memory: a cell only holds the offset of its
+record in the mapping, heads are decoded on access, and no other data is
+copied.  Processes loading the same file share its pages.
+
+Prepending to a mapped list creates an in-memory iterative cell.
+'''
+
+import mmap
+import struct
+
+from .cons import Nil, IterativeConsCell, iterative_from_iterable, \
+        not_implemented
+
+MAGIC = 'FUNPYMAP'
+VERSION = 1
+
+_HEADER = struct.Struct('<8sBH')
+_PREFIX = struct.Struct('<I')
+
+class _Records(object): #pylint: disable-msg=R0903
+    '''Base class for record layouts in a mapping
+
+    Offsets are relative to the start of the mapping, the records span up to
+    the end of it.
+    '''
+    __slots__ = '_data', '_end',
+
+    def __init__(self, data):
+        '''Initialize a new record layout
+
+        :param data: mapped file
+        :type data: mmap.mmap
+        '''
+        self._data = data
+        self._end = len(data)
+
+    def cell(self, offset):
+        '''Create the cell for the record at `offset`
+
+        :param offset: offset of the record
+        :type offset: int
+
+        :return: new cell, or `MappedNil` at the end of the records
+        :rtype: ConsCell
+        '''
+        if offset >= self._end:
+            return MappedNil
+
+        return MappedConsCell._at(self, offset) #pylint: disable-msg=W0212
+
+    def offsets(self, offset):
+        '''Generate the offsets of all records starting at `offset`'''
+        end = self._end
+        next_ = self.next
+        while offset < end:
+            yield offset
+            offset = next_(offset)
+
+    def length(self, offset):
+        '''Calculate the number of records starting at `offset`'''
+        len_ = 0
+        for _ in self.offsets(offset):
+            len_ += 1
+
+        return len_
+
+    def seek(self, offset, index):
+        '''Calculate the offset of the record `index` records further
+
+        :return: offset of the record, or `None` if out of range
+        :rtype: int
+        '''
+        for offset in self.offsets(offset):
+            if not index:
+                return offset
+
+            index -= 1
+
+        return None
+
+    head = not_implemented
+    next = not_implemented
+    items = not_implemented
+
+
+class _FixedRecords(_Records): #pylint: disable-msg=R0903
+    '''Fixed-width records packed using a `struct` format'''
+    __slots__ = '_struct', '_single',
+
+    def __init__(self, data, struct_):
+        '''Initialize a new record layout
+
+        :param data: mapped file
+        :type data: mmap.mmap
+        :param struct_: record format
+        :type struct_: struct.Struct
+        '''
+        super(_FixedRecords, self).__init__(data)
+        self._struct = struct_
+        self._single = _is_single(struct_)
+
+    def head(self, offset):
+        '''Decode the record at `offset`'''
+        value = self._struct.unpack_from(self._data, offset)
+        return value[0] if self._single else value
+
+    next = lambda self, offset: offset + self._struct.size
+
+    def offsets(self, offset):
+        return xrange(offset, self._end, self._struct.size)
+
+    length = lambda self, offset: (self._end - offset) // self._struct.size
+
+    def seek(self, offset, index):
+        offset += index * self._struct.size
+        return offset if offset < self._end else None
+
+    def items(self, offset):
+        '''Generate the decoded records starting at `offset`'''
+        unpack_from = self._struct.unpack_from
+        data = self._data
+
+        if self._single:
+            for offset in self.offsets(offset):
+                yield unpack_from(data, offset)[0]
+        else:
+            for offset in self.offsets(offset):
+                yield unpack_from(data, offset)
+
+
+class _PrefixedRecords(_Records): #pylint: disable-msg=R0903
+    '''String records prefixed by their length'''
+    __slots__ = tuple()
+
+    def head(self, offset):
+        '''Decode the record at `offset`'''
+        start = offset + _PREFIX.size
+        return self._data[start:start + _PREFIX.unpack_from(self._data,
+                                                            offset)[0]]
+
+    next = lambda self, offset: \
+            offset + _PREFIX.size + _PREFIX.unpack_from(self._data, offset)[0]
+
+    def items(self, offset):
+        '''Generate the decoded records starting at `offset`'''
+        for offset in self.offsets(offset):
+            yield self.head(offset)
+
+def _is_single(struct_):
+    '''Check whether a record format holds a single field'''
+    return len(struct_.unpack('\0' * struct_.size)) == 1
+
+
+class MappedConsCell(IterativeConsCell): #pylint: disable-msg=R0903
+    '''Read-only Cons list backed by a memory-mapped file
+
+    Cells are created by `load`, every cell refers to the offset of its
+    record.  Fixed-width records allow constant-time length calculation and
+    indexing.
+    '''
+    __slots__ = '_records', '_offset',
+
+    # Serialized cells are loaded as regular cells, like the ones created by
+    # prepending to a mapped list
+    _SERIALIZED_CLASS = IterativeConsCell
+
+    def __init__(self, head, tail): #pylint: disable-msg=W0231
+        raise TypeError('Mapped Cons lists are read-only')
+
+    @classmethod
+    def _at(cls, records, offset):
+        '''Create a cell for the record at `offset`
+
+        :param records: record layout of the mapping
+        :type records: _Records
+        :param offset: offset of the record
+        :type offset: int
+
+        :return: new cell
+        :rtype: MappedConsCell
+        '''
+        #pylint: disable-msg=W0212
+        cell = cls.__new__(cls)
+        cell._records = records
+        cell._offset = offset
+        cell._hash = None
+        return cell
+
+    head = property(lambda self: self._records.head(self._offset),
+                    doc='Head value')
+    tail = property(lambda self: self._records.cell(
+                        self._records.next(self._offset)),
+                    doc='Tail cell')
+
+    __lshift__ = lambda self, other: IterativeConsCell(other, self)
+
+    __len__ = lambda self: self._records.length(self._offset)
+    _length_hint = lambda self: self._records.length(self._offset) \
+            if isinstance(self._records, _FixedRecords) else None
+    __iter__ = lambda self: self._records.items(self._offset)
+
+    def __getitem__(self, key):
+        if not isinstance(key, (int, long)):
+            raise TypeError
+
+        if key < 0:
+            key = len(self) - abs(key)
+            if key < 0:
+                raise IndexError
+
+        offset = self._records.seek(self._offset, key)
+        if offset is None:
+            raise IndexError
+
+        return self._records.head(offset)
+
+    def __eq__(self, other):
+        #pylint: disable-msg=W0212
+        if isinstance(other, MappedConsCell) and \
+                other._records is self._records and \
+                other._offset == self._offset:
+            return True
+
+        return super(MappedConsCell, self).__eq__(other)
+
+class MappedNil(Nil): #pylint: disable-msg=R0903
+    '''Nil value terminating mapped Cons lists'''
+    _CONS = IterativeConsCell
+MappedNil = MappedNil() #pylint: disable-msg=C0103
+
+#pylint: disable-msg=W0212
+MappedConsCell._build = staticmethod(iterative_from_iterable)
+#pylint: enable-msg=W0212
+
+def save(iterable, file_, format_=None):
+    '''Save the items of an iterable as a list which can be mapped
+
+    :param iterable: items to save
+    :type iterable: iterable
+    :param file_: file to write to
+    :type file_: file
+    :param format_: `struct` format of fixed-width records, or `None` to
+        save strings prefixed by their length
+    :type format_: str
+    '''
+    format_ = format_ or ''
+    file_.write(_HEADER.pack(MAGIC, VERSION, len(format_)))
+    file_.write(format_)
+
+    if format_:
+        struct_ = struct.Struct(format_)
+        if _is_single(struct_):
+            records = (struct_.pack(item) for item in iterable)
+        else:
+            records = (struct_.pack(*item) for item in iterable)
+    else:
+        records = (_PREFIX.pack(len(item)) + item for item in iterable)
+
+    for record in records:
+        file_.write(record)
+
+def load(file_):
+    '''Map a list saved by `save`
+
+    The mapping remains valid after the file is closed.
+
+    :param file_: file to map
+    :type file_: file
+
+    :return: mapped list
+    :rtype: MappedConsCell
+    '''
+    data = mmap.mmap(file_.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, format_length = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not a mapped Cons list')
+
+    start = _HEADER.size + format_length
+    format_ = data[_HEADER.size:start]
+
+    if format_:
+        records = _FixedRecords(data, struct.Struct(format_))
+    else:
+        records = _PrefixedRecords(data)
+
+    return records.cell(start)
@@ -32,34 +32,62 @@ class Monad(object):
         raise NotImplementedError
 
 
+class Deferred(object):
+    '''Base class of values which build their own result when combined with
+    a Monad value using an operator, like expressions of deferred
+    arithmetic'''
+    __slots__ = tuple()
+
+
 liftM = lambda fun: lambda m: m.bind(lambda x: m.return_(fun(x)))
+liftM2 = lambda fun: lambda m1, m2: \
+        m1.bind(lambda x: m2.bind(lambda y: m1.return_(fun(x, y))))
 
 
 unary_proxy = lambda fun: \
         lambda self: liftM(lambda x: fun(x))(self)
 binary_proxy = lambda fun: \
-        lambda self, other: liftM(lambda x: fun(x, other))(self)
+        lambda self, other: NotImplemented \
+            if isinstance(other, Deferred) \
+            else liftM2(fun)(self, other) \
+            if isinstance(other, Monad) \
+            else liftM(lambda x: fun(x, other))(self)
+reflected_proxy = lambda fun: \
+        lambda self, other: liftM(lambda x: fun(other, x))(self)
+
+BINARY_OPERATORS = (
+    ('add', operator.add),
+    ('sub', operator.sub),
+    ('mul', operator.mul),
+    ('floordiv', operator.floordiv),
+    ('mod', operator.mod),
+    ('divmod', lambda a, b: ((a - (a % b)) / b, a % b)),
+    ('pow', operator.pow),
+    ('lshift', operator.lshift),
+    ('rshift', operator.rshift),
+    ('and', operator.and_),
+    ('xor', operator.xor),
+    ('or', operator.or_),
+
+    ('div', operator.div),
+    ('truediv', operator.truediv),
+)
+
+UNARY_OPERATORS = (
+    ('neg', operator.neg),
+    ('pos', operator.pos),
+    ('abs', operator.abs),
+    ('invert', operator.invert),
+)
 
 class NumericMonadMixin:
-    __add__ = binary_proxy(operator.add)
-    __sub__ = binary_proxy(operator.sub)
-    __mul__ = binary_proxy(operator.mul)
-    __floordiv__ = binary_proxy(operator.floordiv)
-    __mod__ = binary_proxy(operator.mod)
-    __divmod__ = binary_proxy(lambda a, b: ((a - (a % b)) / b, a % b))
-    __pow__ = binary_proxy(operator.pow)
-    __lshift__ = binary_proxy(operator.lshift)
-    __rshift__ = binary_proxy(operator.rshift)
-    __and__ = binary_proxy(operator.and_)
-    __xor__ = binary_proxy(operator.xor)
-    __or__ = binary_proxy(operator.or_)
-
-    __div__ = binary_proxy(operator.div)
-    __truediv__ = binary_proxy(operator.truediv)
-
-    __neg__ = unary_proxy(operator.neg)
-    __pos__ = unary_proxy(operator.pos)
-    __abs__ = unary_proxy(operator.abs)
-    __invert__ = unary_proxy(operator.invert)
-
-del unary_proxy, binary_proxy
+    pass
+
+for (name, fun) in BINARY_OPERATORS:
+    setattr(NumericMonadMixin, '__%s__' % name, binary_proxy(fun))
+    setattr(NumericMonadMixin, '__r%s__' % name, reflected_proxy(fun))
+
+for (name, fun) in UNARY_OPERATORS:
+    setattr(NumericMonadMixin, '__%s__' % name, unary_proxy(fun))
+
+del unary_proxy, binary_proxy, reflected_proxy, name, fun
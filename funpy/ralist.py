@@ -0,0 +1,366 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Skew-binary random-access list implementation
+
+A random-access list is a sequence of complete binary trees whose sizes
+are the digits of the skew-binary representation of its length, smallest
+tree first, as described in Okasaki's "Purely Functional Data Structures".
+Prepending, `head` and `tail` take constant time, indexing and updating an
+item take logarithmic time.
+'''
+
+from .cons import ConsCell, Nil, _equal_items
+
+def _tree_items(tree):
+    '''Generate the items of a tree in list order
+
+    :param tree: `(value, left, right)` node or `(value, )` leaf
+    :type tree: tuple
+
+    :return: iterator over all items of the tree
+    :rtype: iterator
+    '''
+    stack = [tree]
+    while stack:
+        tree = stack.pop()
+        yield tree[0]
+
+        if len(tree) == 3:
+            stack.append(tree[2])
+            stack.append(tree[1])
+
+def _tree_lookup(tree, size, index):
+    '''Retrieve the item at `index` of a tree of `size` items'''
+    while index:
+        size //= 2
+        if index <= size:
+            tree = tree[1]
+            index -= 1
+        else:
+            tree = tree[2]
+            index -= 1 + size
+
+    return tree[0]
+
+def _tree_update(tree, size, index, value):
+    '''Create a copy of a tree of `size` items with `index` set to `value`'''
+    if index == 0:
+        return (value, ) + tree[1:]
+
+    size //= 2
+    if index <= size:
+        return (tree[0], _tree_update(tree[1], size, index - 1, value),
+                tree[2])
+
+    return (tree[0], tree[1],
+            _tree_update(tree[2], size, index - 1 - size, value))
+
+def _tree_build(items, start, size):
+    '''Create a tree of `size` items from `items`, starting at `start`'''
+    if size == 1:
+        return (items[start], )
+
+    size //= 2
+    return (items[start], _tree_build(items, start + 1, size),
+            _tree_build(items, start + 1 + size, size))
+
+
+class SkewConsCell(ConsCell): #pylint: disable-msg=R0903
+    '''Cons list implementation supporting random access
+
+    Every cell holds the tree its head is the root of in `_tree`, the size
+    of this tree in `_size`, and the cell following the tree in `_rest`.
+    Trees are `(value, left, right)` tuples, or `(value, )` for leaves.
+    The tail of a cell holding a non-leaf tree consists of cells holding the
+    subtrees, which is created when first requested.
+    '''
+    __slots__ = '_tree', '_size', '_rest',
+
+    #pylint: disable-msg=W0212
+    def __init__(self, head, tail):
+        '''Initialize a new cell
+
+        If the first two trees of `tail` are of equal size, they're merged
+        into a single tree having `head` as its root.
+
+        :param head: value of head element
+        :type head: object
+        :param tail: tail element of cons list
+        :type tail: ConsCell
+        '''
+        if isinstance(tail, SkewConsCell):
+            rest = tail._rest
+            if isinstance(rest, SkewConsCell) and rest._size == tail._size:
+                self._init((head, tail._tree, rest._tree),
+                           2 * tail._size + 1, rest._rest, tail)
+                return
+
+        self._init((head, ), 1, tail, tail)
+
+    def _init(self, tree, size, rest, tail):
+        '''Initialize the slots of a cell
+
+        :param tree: tree of the cell
+        :type tree: tuple
+        :param size: number of items in `tree`
+        :type size: int
+        :param rest: cell following `tree`
+        :type rest: ConsCell
+        :param tail: tail of the cell, or `None` if not known yet
+        :type tail: ConsCell
+        '''
+        super(SkewConsCell, self).__init__(tree[0], tail)
+        self._tree = tree
+        self._size = size
+        self._rest = rest
+
+    @classmethod
+    def _from_tree(cls, tree, size, rest):
+        '''Create a cell holding `tree`, followed by `rest`
+
+        :param tree: tree of the cell
+        :type tree: tuple
+        :param size: number of items in `tree`
+        :type size: int
+        :param rest: cell following `tree`
+        :type rest: ConsCell
+
+        :return: new cell
+        :rtype: SkewConsCell
+        '''
+        cell = cls.__new__(cls)
+        cell._init(tree, size, rest, rest if size == 1 else None)
+        return cell
+
+    def _get_tail(self):
+        '''Retrieve the tail of the cell, splitting its tree if necessary'''
+        if self._tail is None:
+            size = self._size // 2
+            self._tail = self._from_tree(self._tree[1], size,
+                self._from_tree(self._tree[2], size, self._rest))
+
+        return self._tail
+
+    tail = property(_get_tail, doc='Tail cell')
+
+    def __len__(self):
+        len_ = 0
+
+        cell = self
+        while isinstance(cell, SkewConsCell):
+            len_ += cell._size
+            cell = cell._rest
+
+        return len_ + len(cell)
+
+    def _length_hint(self):
+        len_ = 0
+
+        cell = self
+        while isinstance(cell, SkewConsCell):
+            len_ += cell._size
+            cell = cell._rest
+
+        tail_length = cell._length_hint()
+        return None if tail_length is None else len_ + tail_length
+
+    def __getitem__(self, key):
+        if not isinstance(key, (int, long)):
+            raise TypeError
+
+        if key < 0:
+            key = len(self) + key
+            if key < 0:
+                raise IndexError
+
+        cell = self
+        while isinstance(cell, SkewConsCell):
+            if key < cell._size:
+                return _tree_lookup(cell._tree, cell._size, key)
+
+            key -= cell._size
+            cell = cell._rest
+
+        return cell[key]
+
+    def update(self, index, value):
+        '''Create a copy of the list with the item at `index` set to `value`
+
+        Only the trees in front of the one holding `index` and the path to
+        `index` in that tree are copied, all other trees are shared.
+
+        :param index: index of the item to replace
+        :type index: int
+        :param value: new value of the item
+        :type value: object
+
+        :return: updated list
+        :rtype: SkewConsCell
+        '''
+        if not isinstance(index, (int, long)):
+            raise TypeError
+
+        if index < 0:
+            index = len(self) + index
+            if index < 0:
+                raise IndexError
+
+        cells = list()
+
+        cell = self
+        while isinstance(cell, SkewConsCell) and index >= cell._size:
+            cells.append(cell)
+            index -= cell._size
+            cell = cell._rest
+
+        if isinstance(cell, SkewConsCell):
+            result = self._from_tree(
+                _tree_update(cell._tree, cell._size, index, value),
+                cell._size, cell._rest)
+        elif cell.empty:
+            raise IndexError
+        else:
+            items = list(cell)
+            items[index] = value
+            result = skew_from_iterable(items)
+
+        for cell in reversed(cells):
+            result = self._from_tree(cell._tree, cell._size, result)
+
+        return result
+
+    def __contains__(self, item):
+        for value in self:
+            if value == item:
+                return True
+
+        return False
+
+    def __iter__(self):
+        cell = self
+        while isinstance(cell, SkewConsCell):
+            for item in _tree_items(cell._tree):
+                yield item
+
+            cell = cell._rest
+
+        for item in cell:
+            yield item
+
+    def __eq__(self, other):
+        if not hasattr(other, 'head') or not hasattr(other, 'tail'):
+            return NotImplemented
+
+        cell1 = self
+        cell2 = other
+
+        # Only compare lengths known without traversing the lists, which
+        # may be infinite
+        length1 = self._length_hint()
+        length2 = getattr(other, '_length_hint', lambda: None)()
+        if length1 is not None and length2 is not None and \
+                length1 != length2:
+            return False
+
+        # Trees of equal sizes are compared as a whole
+        while isinstance(cell1, SkewConsCell) and \
+                isinstance(cell2, SkewConsCell) and \
+                cell1._size == cell2._size:
+            if cell1 is cell2:
+                return True
+
+            if cell1._tree is not cell2._tree and \
+                    list(_tree_items(cell1._tree)) != \
+                    list(_tree_items(cell2._tree)):
+                return False
+
+            cell1 = cell1._rest
+            cell2 = cell2._rest
+
+        return _equal_items(cell1, cell2)
+
+    def __hash__(self):
+        cells = list()
+
+        cell = self
+        while isinstance(cell, SkewConsCell) and cell._hash is None:
+            cells.append(cell)
+            cell = cell._rest
+
+        hash_ = cell._hash if isinstance(cell, SkewConsCell) else hash(cell)
+        for cell in reversed(cells):
+            for item in reversed(list(_tree_items(cell._tree))):
+                hash_ = hash(31 * hash_ + hash(item))
+
+            cell._hash = hash_
+
+        return hash_
+    #pylint: enable-msg=W0212
+
+class SkewNil(Nil): #pylint: disable-msg=R0903
+    '''Nil value to construct random-access Cons lists'''
+    _CONS = SkewConsCell
+
+    def update(self, _, __):
+        '''Nil has no items to update'''
+        raise IndexError
+SkewNil = SkewNil() #pylint: disable-msg=C0103
+
+def skew_from_iterable(iterable):
+    '''Create a random-access Cons list from an iterable
+
+    The trees of the list are built directly from the items, instead of
+    prepending them one by one.
+
+    :param iterable: items of the list
+    :type iterable: iterable
+
+    :return: random-access Cons list
+    :rtype: ConsCell
+    '''
+    #pylint: disable-msg=W0212
+    items = list(iterable)
+
+    # Greedy decomposition of the length in trees of size 2 ** k - 1
+    sizes = list()
+    remaining = len(items)
+    size = 1
+    while size * 2 + 1 <= remaining:
+        size = size * 2 + 1
+    while remaining:
+        while size > remaining:
+            size //= 2
+        sizes.append(size)
+        remaining -= size
+
+    # Trees are created back to front, i.e. largest first
+    cell = SkewNil
+    end = len(items)
+    for size in sizes:
+        end -= size
+        cell = SkewConsCell._from_tree(_tree_build(items, end, size),
+                                       size, cell)
+
+    return cell
+
+#pylint: disable-msg=W0212
+SkewConsCell._build = staticmethod(skew_from_iterable)
+#pylint: enable-msg=W0212
@@ -0,0 +1,176 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Compact serialization of Cons lists
+
+Any number of lists can be saved in a single dump.  Cells shared between
+these lists, e.g. common tails of several versions of a list, are stored
+once, and are shared again when loading the dump.
+
+A dump is a pickle of a tuple holding the cell classes and terminal (Nil)
+values used, the heads of all cells, and the packed arrays of class
+indices and tail references of all cells, followed by the references to the
+lists themselves.  Arrays are packed little-endian, class indices as
+unsigned 16-bit and references as signed 64-bit integers, so dumps load on
+any platform.  Cells are stored tail-first, so every cell can be
+created once its tail exists.  Since heads are pickled, dumps should only
+be loaded from trusted sources.
+
+Cells are recreated by calling their class with their head and tail.  Cell
+classes which can't be created like that, e.g. read-only ones, name the
+class to recreate their cells with in a `_SERIALIZED_CLASS` attribute.
+'''
+
+import struct
+import cPickle
+
+MAGIC = 'funpy-cons'
+VERSION = 2
+
+def _pack(code, values):
+    '''Pack a sequence of integers into a little-endian string
+
+    :param code: `struct` format character of a fixed-size integer
+    :type code: str
+    :param values: integers to pack
+    :type values: sequence
+
+    :return: packed integers
+    :rtype: str
+    '''
+    return struct.pack('<%d%s' % (len(values), code), *values)
+
+def _unpack(code, data):
+    '''Unpack a string packed by `_pack`'''
+    return struct.unpack('<%d%s' % (len(data) // struct.calcsize('<' + code),
+                                    code), data)
+
+def dumps(lists):
+    '''Serialize Cons lists into a string
+
+    :param lists: lists to serialize
+    :type lists: iterable
+
+    :return: serialized lists
+    :rtype: str
+    '''
+    classes = list()
+    class_indices = dict()
+    terminals = list()
+    terminal_indices = dict()
+
+    cells = list()
+    cell_indices = dict()
+    heads = list()
+    cell_classes = list()
+    tails = list()
+    roots = list()
+
+    def reference(cell):
+        '''Retrieve the reference to a stored cell or terminal'''
+        index = cell_indices.get(id(cell))
+        if index is not None:
+            return index
+
+        index = terminal_indices.get(id(cell))
+        if index is None:
+            index = terminal_indices[id(cell)] = len(terminals)
+            terminals.append(cell)
+
+        return -index - 1
+
+    for cell in lists:
+        # Collect the cells which haven't been stored yet
+        path = list()
+        while not cell.empty and id(cell) not in cell_indices:
+            path.append(cell)
+            cell = cell.tail
+
+        ref = reference(cell)
+        for cell in reversed(path):
+            cls = type(cell)
+            cls = getattr(cls, '_SERIALIZED_CLASS', cls)
+            index = class_indices.get(cls)
+            if index is None:
+                index = class_indices[cls] = len(classes)
+                classes.append(cls)
+
+            # Keep the cell alive, so its id can't be reused
+            cells.append(cell)
+            cell_indices[id(cell)] = len(heads)
+
+            cell_classes.append(index)
+            heads.append(cell.head)
+            tails.append(ref)
+
+            ref = len(heads) - 1
+
+        roots.append(ref)
+
+    return cPickle.dumps((MAGIC, VERSION, tuple(classes), tuple(terminals),
+                          heads, _pack('H', cell_classes), _pack('q', tails),
+                          _pack('q', roots)), cPickle.HIGHEST_PROTOCOL)
+
+def loads(data):
+    '''Deserialize Cons lists from a string created by `dumps`
+
+    :param data: serialized lists
+    :type data: str
+
+    :return: deserialized lists
+    :rtype: list
+    '''
+    loaded = cPickle.loads(data)
+    if not isinstance(loaded, tuple) or loaded[:2] != (MAGIC, VERSION):
+        raise ValueError('Not a serialized Cons list')
+
+    classes, terminals, heads, cell_classes, tails, roots = loaded[2:]
+    cell_classes = _unpack('H', cell_classes)
+    tails = _unpack('q', tails)
+
+    cells = list()
+    for index, head in enumerate(heads):
+        ref = tails[index]
+        tail = cells[ref] if ref >= 0 else terminals[-ref - 1]
+        cells.append(classes[cell_classes[index]](head, tail))
+
+    return [cells[ref] if ref >= 0 else terminals[-ref - 1]
+            for ref in _unpack('q', roots)]
+
+def dump(lists, file_):
+    '''Serialize Cons lists into a file
+
+    :param lists: lists to serialize
+    :type lists: iterable
+    :param file_: file to write to
+    :type file_: file
+    '''
+    file_.write(dumps(lists))
+
+def load(file_):
+    '''Deserialize Cons lists from a file written by `dump`
+
+    :param file_: file to read from
+    :type file_: file
+
+    :return: deserialized lists
+    :rtype: list
+    '''
+    return loads(file_.read())
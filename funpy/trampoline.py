@@ -0,0 +1,111 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Trampoline to run recursive algorithms in constant stack space
+
+Every step of a trampolined algorithm returns either a `Call` describing
+the next step to run, or a `Return` holding a result.  Steps which need to
+post-process the result of a recursive call pass a continuation to `then`,
+which is kept on an explicit stack by `run` instead of the Python call
+stack.
+'''
+
+class Call(object): #pylint: disable-msg=R0903
+    '''Deferred call of the next step of a trampolined algorithm'''
+    __slots__ = 'fun', 'args', 'cont',
+
+    def __init__(self, fun, args, cont=None):
+        '''Initialize a new deferred call
+
+        :param fun: step to call
+        :type fun: callable
+        :param args: arguments to pass to `fun`
+        :type args: tuple
+        :param cont: continuation to pass the result of `fun` to
+        :type cont: callable
+        '''
+        self.fun = fun
+        self.args = args
+        self.cont = cont
+
+class Return(object): #pylint: disable-msg=R0903
+    '''Result of a trampolined algorithm'''
+    __slots__ = 'value',
+
+    def __init__(self, value):
+        '''Initialize a new result
+
+        :param value: result value
+        :type value: object
+        '''
+        self.value = value
+
+
+call = lambda fun, *args: Call(fun, args) #pylint: disable-msg=C0103
+call.__doc__ = '''
+Create a tail call to `fun`
+
+:param fun: step to call
+:type fun: callable
+
+:return: deferred call
+:rtype: Call
+'''.strip()
+
+#pylint: disable-msg=C0103
+then = lambda cont, fun, *args: Call(fun, args, cont)
+#pylint: enable-msg=C0103
+then.__doc__ = '''
+Create a call to `fun`, whose result will be passed to `cont`
+
+:param cont: continuation, returning a `Call` or `Return`
+:type cont: callable
+:param fun: step to call
+:type fun: callable
+
+:return: deferred call
+:rtype: Call
+'''.strip()
+
+done = Return #pylint: disable-msg=C0103
+
+
+def run(fun, *args):
+    '''Run a trampolined algorithm until it returns a result
+
+    :param fun: first step of the algorithm
+    :type fun: callable
+
+    :return: result of the algorithm
+    :rtype: object
+    '''
+    conts = list()
+
+    result = fun(*args)
+    while True:
+        if type(result) is Call:
+            if result.cont is not None:
+                conts.append(result.cont)
+
+            result = result.fun(*result.args)
+        elif conts:
+            result = conts.pop()(result.value)
+        else:
+            return result.value
@@ -0,0 +1,458 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Persistent vector
+
+A vector is a trie of 32-way tuples, holding its items in the leaves,
+except for the last up to 32 items, which are kept in a separate tail
+tuple.  Indexing and updating visit one node per 5 bits of the index,
+appending and removing the last item mostly only copy the tail.  All
+versions of a vector share their unchanged nodes.
+
+Vectors compare equal to Cons lists holding the same items, and have the
+same hash.
+'''
+
+from itertools import izip
+
+from .cons import const, iterative_from_iterable
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+# Hash of an empty sequence, which is the hash of Nil
+EMPTY_HASH = 94598459345L
+
+def _leaves(node, level):
+    '''Generate all leaves of a node at `level`, in order'''
+    stack = [(node, level)]
+    while stack:
+        node, level = stack.pop()
+        if not level:
+            yield node
+        else:
+            stack.extend((child, level - BITS) for child in reversed(node))
+
+def _new_path(level, node):
+    '''Create a path of single-child nodes from `level` down to `node`'''
+    while level:
+        node = (node, )
+        level -= BITS
+
+    return node
+
+def _push_tail(count, level, parent, tail):
+    '''Create a copy of `parent` with `tail` as its last leaf'''
+    index = ((count - 1) >> level) & MASK
+
+    if level == BITS:
+        child = tail
+    elif index < len(parent):
+        child = _push_tail(count, level - BITS, parent[index], tail)
+    else:
+        child = _new_path(level - BITS, tail)
+
+    return parent[:index] + (child, ) + parent[index + 1:]
+
+def _pop_tail(count, level, node):
+    '''Create a copy of `node` without its last leaf, or `None` if it
+    becomes empty'''
+    index = ((count - 2) >> level) & MASK
+
+    if level > BITS:
+        child = _pop_tail(count, level - BITS, node[index])
+        if child is not None:
+            return node[:index] + (child, )
+
+    return node[:index] or None
+
+def _assoc(level, node, index, value):
+    '''Create a copy of `node` with `index` set to `value`'''
+    subindex = (index >> level) & MASK
+
+    if level:
+        value = _assoc(level - BITS, node[subindex], index, value)
+
+    return node[:subindex] + (value, ) + node[subindex + 1:]
+
+
+class Vector(object):
+    '''Base class for vector implementations'''
+    __slots__ = '_hash',
+
+    def __init__(self):
+        self._hash = None
+
+    empty = property(const(False), doc='Vector is empty')
+    __nonzero__ = const(True)
+
+    __len__ = None
+    __iter__ = None
+    __reversed__ = None
+    _get = None
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return vector_from_iterable(tuple(self)[key])
+
+            return self._slice(start, max(start, stop))
+
+        if not isinstance(key, (int, long)):
+            raise TypeError
+
+        count = len(self)
+        if key < 0:
+            key += count
+
+        if not 0 <= key < count:
+            raise IndexError
+
+        return self._get(key)
+
+    def _slice(self, start, stop):
+        '''Create a vector of the items from `start` up to `stop`'''
+        if stop == start:
+            return EmptyVector
+
+        if stop - start == len(self):
+            return self
+
+        return SubVector(self, start, stop)
+
+    def __eq__(self, other):
+        if isinstance(other, Vector):
+            if len(self) != len(other):
+                return False
+
+            if self._hash is not None and other._hash is not None and \
+                    self._hash != other._hash:
+                return False
+
+            return all(a == b for (a, b) in izip(self, other))
+
+        if not hasattr(other, 'head') or not hasattr(other, 'tail'):
+            return NotImplemented
+
+        cell = other
+        for item in self:
+            if cell.empty or cell.head != item:
+                return False
+
+            cell = cell.tail
+
+        return cell.empty
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        if self._hash is None:
+            hash_ = EMPTY_HASH
+            for item in reversed(self):
+                hash_ = hash(31 * hash_ + hash(item))
+
+            self._hash = hash_
+
+        return self._hash
+
+    _stringify = lambda self, fun: \
+            'Vector([' + ', '.join(fun(item) for item in self) + '])'
+    __str__ = lambda self: self._stringify(str)
+    __unicode__ = lambda self: unicode(self._stringify(unicode))
+    __repr__ = lambda self: self._stringify(repr)
+
+    __reduce__ = lambda self: (vector_from_iterable, (tuple(self), ))
+
+    def to_cons(self, from_iterable=iterative_from_iterable):
+        '''Convert the vector into a Cons list
+
+        :param from_iterable: function creating a Cons list from an iterable
+        :type from_iterable: callable
+
+        :return: Cons list of the items of the vector
+        :rtype: ConsCell
+        '''
+        return from_iterable(self)
+
+
+class TrieVector(Vector):
+    '''Vector stored in a trie
+
+    `_root` holds the trie, `_shift` the number of index bits above its
+    leaves.  `_tail` holds the last 1 up to 32 items.
+    '''
+    __slots__ = '_count', '_shift', '_root', '_tail',
+
+    def __init__(self, count, shift, root, tail):
+        '''Initialize a new vector
+
+        :param count: number of items
+        :type count: int
+        :param shift: number of index bits above the leaves of `root`
+        :type shift: int
+        :param root: root node of the trie
+        :type root: tuple
+        :param tail: last items
+        :type tail: tuple
+        '''
+        super(TrieVector, self).__init__()
+        self._count = count
+        self._shift = shift
+        self._root = root
+        self._tail = tail
+
+    __len__ = lambda self: self._count
+
+    _tail_offset = property(lambda self: (self._count - 1) & ~MASK)
+
+    def _leaf(self, index):
+        '''Retrieve the leaf holding `index`'''
+        if index >= self._tail_offset:
+            return self._tail
+
+        node = self._root
+        for level in xrange(self._shift, 0, -BITS):
+            node = node[(index >> level) & MASK]
+
+        return node
+
+    _get = lambda self, index: self._leaf(index)[index & MASK]
+
+    def __iter__(self):
+        for leaf in _leaves(self._root, self._shift):
+            for item in leaf:
+                yield item
+
+        for item in self._tail:
+            yield item
+
+    def __reversed__(self):
+        for item in reversed(self._tail):
+            yield item
+
+        for index in xrange(self._tail_offset - WIDTH, -1, -WIDTH):
+            for item in reversed(self._leaf(index)):
+                yield item
+
+    def assoc(self, index, value):
+        '''Create a vector with the item at `index` set to `value`
+
+        :param index: index of the item
+        :type index: int
+        :param value: new value of the item
+        :type value: object
+
+        :return: new vector
+        :rtype: Vector
+        '''
+        if index < 0:
+            index += self._count
+
+        if not 0 <= index < self._count:
+            raise IndexError
+
+        if index >= self._tail_offset:
+            subindex = index & MASK
+            return TrieVector(self._count, self._shift, self._root,
+                              self._tail[:subindex] + (value, ) +
+                              self._tail[subindex + 1:])
+
+        return TrieVector(self._count, self._shift,
+                          _assoc(self._shift, self._root, index, value),
+                          self._tail)
+
+    def append(self, value):
+        '''Create a vector with `value` appended
+
+        :param value: value to append
+        :type value: object
+
+        :return: new vector
+        :rtype: Vector
+        '''
+        count = self._count
+        if len(self._tail) < WIDTH:
+            return TrieVector(count + 1, self._shift, self._root,
+                              self._tail + (value, ))
+
+        shift = self._shift
+        if (count >> BITS) > (1 << shift):
+            root = (self._root, _new_path(shift, self._tail))
+            shift += BITS
+        else:
+            root = _push_tail(count, shift, self._root, self._tail)
+
+        return TrieVector(count + 1, shift, root, (value, ))
+
+    def pop(self):
+        '''Create a vector without the last item
+
+        :return: new vector
+        :rtype: Vector
+        '''
+        count = self._count
+        if count == 1:
+            return EmptyVector
+
+        if len(self._tail) > 1:
+            return TrieVector(count - 1, self._shift, self._root,
+                              self._tail[:-1])
+
+        tail = self._leaf(count - 2)
+        shift = self._shift
+        root = _pop_tail(count, shift, self._root) or ()
+
+        if shift > BITS and len(root) == 1:
+            root = root[0]
+            shift -= BITS
+
+        return TrieVector(count - 1, shift, root, tail)
+
+
+class SubVector(Vector):
+    '''Slice of a vector, sharing its items'''
+    __slots__ = '_vector', '_start', '_stop',
+
+    def __init__(self, vector, start, stop):
+        '''Initialize a new slice
+
+        :param vector: sliced vector
+        :type vector: TrieVector
+        :param start: index of the first item in `vector`
+        :type start: int
+        :param stop: index following the last item in `vector`
+        :type stop: int
+        '''
+        super(SubVector, self).__init__()
+        self._vector = vector
+        self._start = start
+        self._stop = stop
+
+    __len__ = lambda self: self._stop - self._start
+
+    _get = lambda self, index: \
+            self._vector._get(self._start + index) #pylint: disable-msg=W0212
+
+    def _slice(self, start, stop):
+        if stop == start or stop - start == len(self):
+            return super(SubVector, self)._slice(start, stop)
+
+        return SubVector(self._vector, self._start + start,
+                         self._start + stop)
+
+    def __iter__(self):
+        get = self._vector._get #pylint: disable-msg=W0212
+        for index in xrange(self._start, self._stop):
+            yield get(index)
+
+    def __reversed__(self):
+        get = self._vector._get #pylint: disable-msg=W0212
+        for index in xrange(self._stop - 1, self._start - 1, -1):
+            yield get(index)
+
+    def assoc(self, index, value):
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError
+
+        return SubVector(self._vector.assoc(self._start + index, value),
+                         self._start, self._stop)
+
+    def append(self, value):
+        if self._stop < len(self._vector):
+            vector = self._vector.assoc(self._stop, value)
+        else:
+            vector = self._vector.append(value)
+
+        return SubVector(vector, self._start, self._stop + 1)
+
+    def pop(self):
+        if len(self) == 1:
+            return EmptyVector
+
+        return SubVector(self._vector, self._start, self._stop - 1)
+
+    assoc.__doc__ = TrieVector.assoc.__doc__
+    append.__doc__ = TrieVector.append.__doc__
+    pop.__doc__ = TrieVector.pop.__doc__
+
+
+class EmptyVector(Vector):
+    '''Empty vector'''
+    __slots__ = tuple()
+
+    empty = property(const(True), doc='Vector is empty')
+    __nonzero__ = const(False)
+
+    __len__ = const(0)
+    __iter__ = __reversed__ = lambda _: iter(tuple())
+
+    def _get(self, _):
+        raise IndexError
+
+    def assoc(self, *_):
+        '''Raise an IndexError, the empty vector has no items'''
+        raise IndexError
+
+    def pop(self):
+        '''Raise an IndexError, the empty vector has no items'''
+        raise IndexError
+
+    append = lambda self, value: TrieVector(1, BITS, (), (value, ))
+    append.__doc__ = TrieVector.append.__doc__
+
+    _stringify = const('EmptyVector')
+    __reduce__ = lambda self: 'EmptyVector'
+EmptyVector = EmptyVector() #pylint: disable-msg=C0103
+
+def vector_from_iterable(iterable):
+    '''Create a vector from an iterable
+
+    The trie is built level by level, without creating intermediate
+    vectors.  Any Cons list can be converted this way.
+
+    :param iterable: items of the vector
+    :type iterable: iterable
+
+    :return: new vector
+    :rtype: Vector
+    '''
+    items = tuple(iterable)
+    count = len(items)
+    if not count:
+        return EmptyVector
+
+    tail_offset = (count - 1) & ~MASK
+    nodes = [items[index:index + WIDTH]
+             for index in xrange(0, tail_offset, WIDTH)]
+
+    shift = BITS
+    while len(nodes) > WIDTH:
+        nodes = [tuple(nodes[index:index + WIDTH])
+                 for index in xrange(0, len(nodes), WIDTH)]
+        shift += BITS
+
+    return TrieVector(count, shift, tuple(nodes), items[tail_offset:])
@@ -0,0 +1,118 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for concurrently computed Maybe values'''
+
+import time
+import threading
+import unittest
+
+from funpy.asyncmaybe import AsyncMaybe, gather, spawn
+from funpy.maybe import Just, Nothing
+
+def delayed(event, value):
+    '''Create a function returning `value` once `event` is set'''
+    def fun():
+        '''Wait for the event'''
+        event.wait()
+        return value
+
+    return fun
+
+class TestAsyncMaybe(unittest.TestCase):
+    '''Test spawning and binding'''
+    def test_spawn(self):
+        '''Assert spawned functions run in the background'''
+        event = threading.Event()
+        pending = spawn(delayed(event, Just(1)))
+
+        self.assertFalse(pending.done)
+        self.assertRaises(RuntimeError, lambda: pending.result(0.01))
+
+        event.set()
+        self.assertEquals(pending.result(), Just(1))
+        self.assert_(pending.done)
+
+    def test_exception(self):
+        '''Assert exceptions result in Nothing'''
+        self.assertEquals(spawn(lambda: 1 / 0).result(), Nothing)
+        self.assertEquals(AsyncMaybe.resolved(Just(0)).bind(
+            lambda x: Just(1 / x)).result(), Nothing)
+
+    def test_bind(self):
+        '''Assert binds are chained without blocking'''
+        event = threading.Event()
+        pending = spawn(delayed(event, Just(1))) \
+                .bind(lambda x: spawn(lambda: Just(x + 1))) \
+                .bind(lambda x: Just(x * 10))
+
+        self.assertFalse(pending.done)
+        event.set()
+        self.assertEquals(pending.result(), Just(20))
+
+        self.assertEquals(AsyncMaybe.resolved(Nothing).bind(Just).result(),
+                          Nothing)
+        self.assertEquals(AsyncMaybe.resolved(Just(1)).return_(2).result(),
+                          Just(2))
+
+    def test_invalid_result(self):
+        '''Assert functions returning anything but Maybe values are errors
+        which propagate to dependent values'''
+        pending = spawn(lambda: Just(1)).bind(lambda x: 5)
+        self.assertRaises(TypeError, lambda: pending.result(2))
+
+        dependent = pending.bind(lambda x: Just(x + 1))
+        self.assertRaises(TypeError, lambda: dependent.result(2))
+
+        self.assertRaises(TypeError, lambda: spawn(lambda: 5).result(2))
+        self.assertRaises(TypeError,
+                          lambda: gather(Just(1), pending).result(2))
+
+        self.assertEquals(spawn(lambda: Just(1)).bind(
+            lambda x: AsyncMaybe.resolved(Just(x + 1))).result(2), Just(2))
+
+
+class TestGather(unittest.TestCase):
+    '''Test combining concurrently computed values'''
+    def test_concurrent(self):
+        '''Assert values are computed concurrently'''
+        start = time.time()
+        result = gather(*[spawn(lambda i=i: time.sleep(0.2) or Just(i))
+                          for i in xrange(5)] + [Just(5)])
+
+        self.assertEquals(result.result(), Just(tuple(xrange(6))))
+        self.assert_(time.time() - start < 0.9)
+
+    def test_short_circuit(self):
+        '''Assert the result is Nothing as soon as any value is Nothing'''
+        event = threading.Event()
+        result = gather(spawn(delayed(event, Just(1))),
+                        spawn(lambda: Nothing))
+
+        self.assertEquals(result.result(5), Nothing)
+        event.set()
+
+    def test_empty(self):
+        '''Assert gathering no values results in an empty tuple'''
+        self.assertEquals(gather().result(), Just(()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for the benchmark runner'''
+
+import unittest
+import StringIO
+
+from bench import BENCHMARKS, compare, load, run, save
+
+class TestRunner(unittest.TestCase):
+    '''Test running, saving and comparing benchmarks'''
+    def setUp(self):
+        self.results = run(BENCHMARKS, (10, ), min_time=0.0001, repeat=1)
+
+    def test_run(self):
+        '''Assert all benchmarks run, skipping unsupported operations'''
+        names = set((result['name'], result['implementation'])
+                    for result in self.results)
+
+        self.assert_(('cons.hash', 'iterative') in names)
+        self.assert_(('cons.hash', 'tuple') in names)
+        self.assert_(('cons.hash', 'list') not in names)
+        self.assert_(('maybe.bind', 'failing') in names)
+        self.assertEquals(len(names), len(BENCHMARKS) - 1)
+
+    def test_save(self):
+        '''Assert results can be saved and loaded'''
+        file_ = StringIO.StringIO()
+        save(self.results, file_)
+
+        file_.seek(0)
+        self.assertEquals(load(file_), self.results)
+
+    def test_compare(self):
+        '''Assert slowdowns beyond the threshold are regressions'''
+        baseline = [dict(name='a', implementation='b', size=1, time=1.)]
+        results = [dict(name='a', implementation='b', size=1, time=1.05),
+                   dict(name='a', implementation='b', size=2, time=1.)]
+
+        self.assertEquals(compare(results, baseline),
+                          [(results[0], 1.05, False)])
+        self.assertEquals(compare(results, baseline, 0.01),
+                          [(results[0], 1.05, True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
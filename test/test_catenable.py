@@ -0,0 +1,151 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for catenable lists'''
+
+import pickle
+import random
+import unittest
+
+from funpy.cons import IterativeNil, RecursiveNil, iterative_from_iterable
+from funpy.cons import recursive_from_iterable, sized_from_iterable
+from funpy.catenable import Catenable, EmptyCatenable, catenable
+
+class TestCatenable(unittest.TestCase):
+    '''Test concatenating and traversing catenable lists'''
+    def setUp(self):
+        rand = random.Random(7)
+        builders = (iterative_from_iterable, recursive_from_iterable,
+                    sized_from_iterable)
+
+        self.parts = list()
+        start = 0
+        for _ in xrange(200):
+            length = rand.randrange(5)
+            self.parts.append(rand.choice(builders)(
+                xrange(start, start + length)))
+            start += length
+
+        self.items = range(start)
+
+    def concatenated(self):
+        '''Concatenate all parts'''
+        result = EmptyCatenable
+        for part in self.parts:
+            result = result + part
+
+        return result
+
+    def test_concat(self):
+        '''Assert concatenation keeps the order of all items'''
+        list_ = self.concatenated()
+
+        self.assertEquals(list(list_), self.items)
+        self.assertEquals(len(list_), len(self.items))
+        self.assertEquals(list_[10], 10)
+        self.assertEquals(list_[-1], self.items[-1])
+        self.assertRaises(IndexError, lambda: list_[len(self.items)])
+        self.assert_(self.items[-1] in list_)
+        self.assert_(-1 not in list_)
+
+    def test_tail(self):
+        '''Assert walking the tails yields all items'''
+        list_ = self.concatenated()
+
+        items = list()
+        while not list_.empty:
+            items.append(list_.head)
+            list_ = list_.tail
+
+        self.assertEquals(items, self.items)
+        self.assert_(list_ is EmptyCatenable)
+
+    def test_tail_cached(self):
+        '''Assert the tail of a list is only created once'''
+        list_ = self.concatenated()
+        while not list_.empty:
+            self.assert_(list_.tail is list_.tail)
+            list_ = list_.tail
+
+    def test_nested(self):
+        '''Assert concatenating catenable lists keeps the order'''
+        half = len(self.parts) // 2
+        left = EmptyCatenable
+        for part in self.parts[:half]:
+            left = left.concat(part)
+        right = EmptyCatenable
+        for part in reversed(self.parts[half:]):
+            right = part + right
+
+        list_ = left + right
+        self.assertEquals(list(list_), self.items)
+        self.assertEquals(list(list_.tail.tail), self.items[2:])
+
+    def test_shared(self):
+        '''Assert wrapped lists aren't copied'''
+        part = iterative_from_iterable(range(10))
+        list_ = catenable(part)
+
+        self.assert_(list_._list is part) #pylint: disable-msg=W0212
+        self.assert_(list_.tail._list is part.tail) #pylint: disable-msg=W0212
+        self.assertEquals(list(list_ + part + list_), range(10) * 3)
+
+    def test_cons(self):
+        '''Assert catenable lists equal Cons lists with the same items'''
+        list_ = self.concatenated()
+        cons = iterative_from_iterable(self.items)
+
+        self.assertEquals(list_, cons)
+        self.assertEquals(cons, list_)
+        self.assertEquals(hash(list_), hash(cons))
+        self.assertEquals(list_, catenable(cons))
+        self.assertNotEquals(list_, cons.tail)
+        self.assertEquals(EmptyCatenable, IterativeNil)
+        self.assertEquals(catenable(RecursiveNil), EmptyCatenable)
+        self.assertRaises(TypeError, lambda: catenable([1]))
+
+    def test_prepend(self):
+        '''Assert items can be prepended'''
+        list_ = (EmptyCatenable << 2) << 1
+
+        self.assertEquals(list(list_), [1, 2])
+        self.assertEquals(list((list_ + list_) << 0), [0, 1, 2, 1, 2])
+        self.assert_(isinstance(list_, Catenable))
+
+    def test_pickle(self):
+        '''Assert catenable lists can be pickled'''
+        list_ = self.concatenated()
+
+        self.assertEquals(pickle.loads(pickle.dumps(list_)), list_)
+        self.assert_(pickle.loads(pickle.dumps(EmptyCatenable)) is
+                     EmptyCatenable)
+
+    def test_str(self):
+        '''Assert the representation lists all items'''
+        list_ = catenable(iterative_from_iterable('a')) + \
+                iterative_from_iterable([1])
+
+        self.assertEquals(str(list_), 'Catenable([a, 1])')
+        self.assertEquals(repr(list_), "Catenable(['a', 1])")
+        self.assertEquals(str(EmptyCatenable), 'EmptyCatenable')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for deferred arithmetic'''
+
+import unittest
+
+from funpy.deferred import Expression, Var, lazy
+from funpy.maybe import Just, Nothing
+
+class TestDeferred(unittest.TestCase):
+    '''Test building and evaluating expressions'''
+    def setUp(self):
+        self.x = Var('x')
+        self.y = Var('y')
+
+    def test_evaluate(self):
+        '''Assert evaluation equals eager arithmetic on Maybe values'''
+        formulas = (lambda x, y: (x + y) * (x - y) / 2,
+                    lambda x, y: 10 // x + y ** 2 % 7,
+                    lambda x, y: -abs(x) << 1 | ~y,
+                    lambda x, y: divmod(x, y),
+                    lambda x, y: 1.5 / x - 3 * y)
+        values = (Just(3), Just(-2), Just(0), Nothing)
+
+        for formula in formulas:
+            expression = formula(self.x, self.y)
+            for x in values:
+                for y in values:
+                    self.assertEquals(expression.evaluate(x=x, y=y),
+                                      formula(x, y))
+                    self.assertEquals(expression.evaluate(x, y),
+                                      formula(x, y))
+
+    def test_plain(self):
+        '''Assert plain values are accepted as inputs and constants'''
+        expression = lazy(2) * self.x + lazy(Just(1))
+
+        self.assertEquals(expression.evaluate(x=5), Just(11))
+        self.assertEquals((lazy(Nothing) + self.x).evaluate(x=1), Nothing)
+        self.assertEquals((lazy(1) + 2).evaluate(), Just(3))
+
+    def test_compile_once(self):
+        '''Assert expressions are compiled once'''
+        expression = self.x * self.y
+        self.assert_(expression.compile() is expression.compile())
+        self.assertEquals(expression.variables, ('x', 'y'))
+
+    def test_shared(self):
+        '''Assert equal subexpressions are calculated once'''
+        calls = [0]
+
+        class Counted(int):
+            '''Integer counting additions'''
+            def __add__(self, other):
+                calls[0] += 1
+                return int(self) + other
+
+        expression = (self.x + self.y) * (self.x + self.y) + (self.x + 1)
+        self.assertEquals(expression.evaluate(x=Counted(2), y=3), Just(28))
+        self.assertEquals(calls[0], 2)
+
+    def test_deep(self):
+        '''Assert deep expressions can be compiled'''
+        expression = self.x
+        for _ in xrange(2000):
+            expression = expression + 1
+
+        self.assertEquals(expression.evaluate(x=0), Just(2000))
+
+    def test_names(self):
+        '''Assert variables must have valid names'''
+        for name in ('', '_x', '1x', 'a b', 'def', 1):
+            self.assertRaises(ValueError, lambda: Var(name))
+
+    def test_shadowing(self):
+        '''Assert variables can't shadow names used by evaluation'''
+        for name in ('Just', 'Nothing', 'Maybe', 'isinstance', 'Exception'):
+            expression = Var(name) + 1
+            self.assertEquals(expression.evaluate(Just(2)), Just(3))
+            self.assertEquals(expression.evaluate(**{name: 2}), Just(3))
+            self.assertEquals(expression.evaluate(Nothing), Nothing)
+            self.assertEquals((Var(name) / 0).evaluate(2), Nothing)
+
+
+class TestReflected(unittest.TestCase):
+    '''Test reflected operators of Maybe values'''
+    def test_reflected(self):
+        '''Assert plain values can be the left operand'''
+        self.assertEquals(10 - Just(3), Just(7))
+        self.assertEquals(10 // Just(0), Nothing)
+        self.assertEquals(2 ** Just(3), Just(8))
+        self.assertEquals(1 + Nothing, Nothing)
+
+    def test_maybe_operands(self):
+        '''Assert Maybe operands are combined by value'''
+        self.assertEquals(Just(1) + Just(2), Just(3))
+        self.assertEquals(Just(1) + Nothing, Nothing)
+        self.assertEquals(Just(1) / Just(0), Nothing)
+
+    def test_expression_operands(self):
+        '''Assert Maybe values on the left of expressions are deferred'''
+        x = Var('x')
+
+        expression = Just(1) + x
+        self.assert_(isinstance(expression, Expression))
+        self.assertEquals(expression.evaluate(x=Just(2)), Just(3))
+        self.assertEquals(expression.evaluate(x=Nothing), Nothing)
+
+        expression = divmod(Just(7), x * 2)
+        self.assertEquals(expression.evaluate(x=2), Just((1, 3)))
+
+        expression = Nothing - x
+        self.assert_(isinstance(expression, Expression))
+        self.assertEquals(expression.evaluate(x=Just(2)), Nothing)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for persistent deques'''
+
+import pickle
+import random
+import unittest
+import collections
+
+from funpy.cons import IterativeConsCell, IterativeNil, \
+        iterative_from_iterable
+from funpy.deque import BALANCE, EmptyDeque, deque_from_iterable
+
+class TestDeque(unittest.TestCase):
+    '''Test deque operations against `collections.deque`'''
+    def assertDeque(self, deque, expected): #pylint: disable-msg=C0103
+        '''Assert a deque holds the expected items and is balanced'''
+        #pylint: disable-msg=W0212
+        self.assertEquals(list(deque), list(expected))
+        self.assertEquals(list(reversed(deque)), list(reversed(expected)))
+        self.assertEquals(len(deque), len(expected))
+        self.assert_(deque._front_length <= BALANCE * deque._back_length + 1)
+        self.assert_(deque._back_length <= BALANCE * deque._front_length + 1)
+        self.assertEquals(len(deque._front), deque._front_length)
+        self.assertEquals(len(deque._back), deque._back_length)
+
+        if expected:
+            self.assertEquals(deque.front, expected[0])
+            self.assertEquals(deque.back, expected[-1])
+
+    def test_operations(self):
+        '''Assert random pushes and pops result in the expected items'''
+        rand = random.Random(42)
+        deque, expected = EmptyDeque, collections.deque()
+
+        for step in xrange(5000):
+            choice = rand.randrange(6)
+            if choice == 0:
+                deque = deque.push_front(step)
+                expected.appendleft(step)
+            elif choice in (1, 2):
+                deque = deque.push_back(step)
+                expected.append(step)
+            elif choice == 3 and expected:
+                deque = deque.pop_front()
+                expected.popleft()
+            elif choice == 4 and expected:
+                deque = deque.pop_back()
+                expected.pop()
+
+            if step % 250 == 0:
+                self.assertDeque(deque, expected)
+
+        self.assertDeque(deque, expected)
+
+    def test_queue(self):
+        '''Assert a deque can be used as a FIFO queue'''
+        deque = EmptyDeque
+        for item in xrange(1000):
+            deque = deque.push_back(item)
+
+        for item in xrange(1000):
+            self.assertEquals(deque.front, item)
+            deque = deque.pop_front()
+
+        self.assert_(deque is EmptyDeque)
+
+    def test_persistent(self):
+        '''Assert updates don't change earlier versions'''
+        deque = deque_from_iterable(xrange(10))
+        deque.push_front(-1).pop_back().push_back(10)
+
+        self.assertDeque(deque, range(10))
+
+    def test_empty(self):
+        '''Assert the empty deque can't be popped'''
+        self.assertRaises(IndexError, EmptyDeque.pop_front)
+        self.assertRaises(IndexError, EmptyDeque.pop_back)
+        self.assertRaises(IndexError, lambda: EmptyDeque.front)
+        self.assertRaises(IndexError, lambda: EmptyDeque.back)
+        self.assertFalse(EmptyDeque)
+        self.assert_(EmptyDeque.empty)
+        self.assert_(deque_from_iterable([]) is EmptyDeque)
+        self.assert_(EmptyDeque.push_back(1).pop_front() is EmptyDeque)
+        self.assert_(EmptyDeque.push_front(1).pop_back() is EmptyDeque)
+
+    def test_cons(self):
+        '''Assert deques equal Cons lists holding the same items'''
+        items = range(100)
+        deque = deque_from_iterable(items).push_front(-1)
+        list_ = iterative_from_iterable(items) << -1
+
+        self.assertEquals(deque, list_)
+        self.assertEquals(list_, deque)
+        self.assertEquals(hash(deque), hash(list_))
+        self.assertNotEquals(deque.pop_back(), list_)
+        self.assertEquals(deque, deque_from_iterable([-1] + items))
+        self.assertEquals(EmptyDeque, IterativeNil)
+
+        #pylint: disable-msg=W0212
+        self.assert_(type(deque._front) is IterativeConsCell)
+
+    def test_pickle(self):
+        '''Assert deques can be pickled'''
+        deque = deque_from_iterable(xrange(10))
+
+        self.assertEquals(pickle.loads(pickle.dumps(deque)), deque)
+        self.assert_(pickle.loads(pickle.dumps(EmptyDeque)) is EmptyDeque)
+
+    def test_str(self):
+        '''Assert the representation lists all items'''
+        deque = deque_from_iterable(['a', 1])
+
+        self.assertEquals(str(deque), 'Deque([a, 1])')
+        self.assertEquals(repr(deque), "Deque(['a', 1])")
+
+
+if __name__ == '__main__':
+    unittest.main()
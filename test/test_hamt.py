@@ -0,0 +1,156 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for persistent maps'''
+
+import pickle
+import random
+import unittest
+
+from funpy.hamt import EmptyMap, Map, map_from_iterable
+
+class Colliding(object):
+    '''Key of which the hash collides with other keys'''
+    def __init__(self, value, hash_):
+        self.value = value
+        self.hash_ = hash_
+
+    __hash__ = lambda self: self.hash_
+    __eq__ = lambda self, other: isinstance(other, Colliding) and \
+            self.value == other.value
+    __ne__ = lambda self, other: not self == other
+    __repr__ = lambda self: 'Colliding(%r, %r)' % (self.value, self.hash_)
+
+
+class TestMap(unittest.TestCase):
+    '''Test map operations against a dictionary'''
+    def setUp(self):
+        self.random = random.Random(1234)
+
+    def keys(self):
+        '''Generate random keys, including colliding ones'''
+        while True:
+            choice = self.random.random()
+            if choice < 0.6:
+                yield self.random.randint(-2000, 2000)
+            elif choice < 0.8:
+                yield Colliding(self.random.randint(0, 50),
+                                self.random.choice((1, -1, 2 ** 40 + 1)))
+            else:
+                yield str(self.random.randint(0, 500))
+
+    def assertMap(self, map_, dict_): #pylint: disable-msg=C0103
+        '''Assert a map has the same items as a dictionary'''
+        self.assertEquals(len(map_), len(dict_))
+        self.assertEquals(dict(map_.items()), dict_)
+        self.assertEquals(len(map_.items()), len(dict_))
+        for (key, value) in dict_.iteritems():
+            self.assertEquals(map_[key], value)
+            self.assert_(key in map_)
+
+        self.assertEquals(map_, map_from_iterable(dict_.iteritems()))
+        self.assertEquals(hash(map_),
+                          hash(map_from_iterable(dict_.iteritems())))
+
+    def test_operations(self):
+        '''Assert random updates result in the same items as a dict'''
+        map_, dict_ = EmptyMap, dict()
+        keys = self.keys()
+
+        for step in xrange(3000):
+            key = keys.next()
+            if self.random.random() < 0.6:
+                map_ = map_.assoc(key, step)
+                dict_[key] = step
+            else:
+                map_ = map_.dissoc(key)
+                dict_.pop(key, None)
+
+            if step % 300 == 0:
+                self.assertMap(map_, dict_)
+
+        self.assertMap(map_, dict_)
+
+        for key in dict_.keys():
+            map_ = map_.dissoc(key)
+
+        self.assert_(map_ is EmptyMap)
+
+    def test_persistent(self):
+        '''Assert updates don't change earlier versions'''
+        map1 = map_from_iterable((i, i) for i in xrange(100))
+        map2 = map1.assoc(5, 'five').dissoc(6).assoc(100, 100)
+
+        self.assertEquals(map1[5], 5)
+        self.assert_(6 in map1)
+        self.assert_(100 not in map1)
+        self.assertEquals(map2[5], 'five')
+        self.assert_(6 not in map2)
+        self.assertNotEquals(map1, map2)
+
+    def test_unchanged(self):
+        '''Assert updates changing nothing return the map itself'''
+        map_ = map_from_iterable((i, i) for i in xrange(100))
+
+        self.assert_(map_.assoc(5, 5) is map_)
+        self.assert_(map_.dissoc(100) is map_)
+        self.assert_(EmptyMap.dissoc(1) is EmptyMap)
+
+    def test_lookup(self):
+        '''Assert missing keys are handled like in dictionaries'''
+        map_ = EmptyMap.assoc(None, 1)
+
+        self.assertEquals(map_[None], 1)
+        self.assertEquals(map_.get(2), None)
+        self.assertEquals(map_.get(2, 3), 3)
+        self.assertRaises(KeyError, lambda: map_[2])
+        self.assertRaises(KeyError, lambda: EmptyMap[2])
+        self.assertEquals(EmptyMap.get(2, 3), 3)
+
+    def test_empty(self):
+        '''Assert the empty map is a singleton'''
+        self.assert_(map_from_iterable([]) is EmptyMap)
+        self.assertFalse(EmptyMap)
+        self.assert_(EmptyMap.empty)
+        self.assertEquals(len(EmptyMap), 0)
+        self.assertEquals(list(EmptyMap), [])
+        self.assertEquals(EmptyMap, EmptyMap)
+        self.assertNotEquals(EmptyMap, EmptyMap.assoc(1, 1))
+        self.assert_(pickle.loads(pickle.dumps(EmptyMap)) is EmptyMap)
+
+    def test_pickle(self):
+        '''Assert maps can be pickled'''
+        map_ = map_from_iterable((i, str(i)) for i in xrange(100))
+        for protocol in xrange(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEquals(pickle.loads(pickle.dumps(map_, protocol)),
+                              map_)
+
+    def test_str(self):
+        '''Assert the representation lists all items'''
+        map_ = map_from_iterable([('a', 1)])
+
+        self.assertEquals(str(map_), 'Map({a: 1})')
+        self.assertEquals(repr(map_), "Map({'a': 1})")
+        self.assertEquals(repr(EmptyMap), 'EmptyMap')
+        self.assert_(isinstance(map_, Map))
+
+
+if __name__ == '__main__':
+    unittest.main()
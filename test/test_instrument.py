@@ -0,0 +1,116 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for instrumentation'''
+
+import unittest
+
+from funpy import instrument
+from funpy.cons import IterativeConsCell, RecursiveConsCell, \
+        iterative_from_iterable, recursive_from_iterable
+from funpy.maybe import Just, Nothing
+
+class TestInstrument(unittest.TestCase):
+    '''Test recording data while instrumentation is enabled'''
+    def setUp(self):
+        instrument.reset()
+        instrument.enable()
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_restore(self):
+        '''Assert disabling restores the original operations'''
+        self.assert_(instrument.enabled())
+        instrument.disable()
+
+        self.assertFalse(instrument.enabled())
+        self.assert_(IterativeConsCell.__dict__['__len__'].__module__ ==
+                     'funpy.cons')
+        self.assertEquals(Just.__dict__['bind'].__module__, 'funpy.maybe')
+
+        len(iterative_from_iterable(range(10)))
+        self.assertEquals(instrument.snapshot()['allocations'], dict())
+
+    def test_allocations(self):
+        '''Assert allocated cells are counted per class'''
+        iterative_from_iterable(range(10))
+        recursive_from_iterable(range(5))
+
+        self.assertEquals(instrument.snapshot()['allocations'],
+                          dict(IterativeConsCell=10, RecursiveConsCell=5))
+
+    def test_traversals(self):
+        '''Assert traversed cells are accounted to their operation'''
+        list_ = iterative_from_iterable(range(10))
+        instrument.reset()
+
+        len(list_)
+        list_[3]
+        5 in list_
+
+        operations = instrument.snapshot()['operations']
+        self.assertEquals(operations['__len__']['calls'], 1)
+        self.assertEquals(operations['__len__']['cells'], 10)
+        self.assertEquals(operations['__getitem__']['cells'], 3)
+        self.assertEquals(operations['__contains__']['cells'], 5)
+        self.assert_(operations['__len__']['time'] >= 0)
+
+    def test_nested(self):
+        '''Assert operations called through `super` are counted once'''
+        list_ = recursive_from_iterable(range(10))
+        self.assertEquals(list_, recursive_from_iterable(range(10)))
+        hash(list_)
+
+        operations = instrument.snapshot()['operations']
+        self.assertEquals(operations['__eq__']['calls'], 1)
+        self.assertEquals(operations['__hash__']['calls'], 1)
+        self.assertEquals(operations['__hash__']['cells'], 10)
+
+    def test_untracked(self):
+        '''Assert traversals outside operations are reported separately'''
+        list(iterative_from_iterable(range(10)))
+        self.assertEquals(instrument.snapshot()['untracked'], 10)
+
+    def test_bind(self):
+        '''Assert binds and swallowed exceptions are counted'''
+        self.assertEquals(Just(10) / 2 / 0 / 1, Nothing)
+        self.assertEquals(Just(1).bind(lambda x: Just(x + 1)), Just(2))
+
+        snapshot = instrument.snapshot()
+        self.assertEquals(snapshot['operations']['bind']['calls'], 3)
+        self.assertEquals(snapshot['exceptions'],
+                          dict(ZeroDivisionError=1))
+
+    def test_enable_twice(self):
+        '''Assert enabling twice doesn't instrument twice'''
+        instrument.enable()
+        len(iterative_from_iterable(range(3)))
+
+        self.assertEquals(
+            instrument.snapshot()['operations']['__len__']['calls'], 1)
+        instrument.disable()
+        self.assertEquals(RecursiveConsCell.__dict__['__eq__'].__module__,
+                          'funpy.cons')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,13 +19,29 @@
 
 '''Tests for Cons lists'''
 
+import gc
+import array
 import new
+import multiprocessing
+import sys
+import pickle
 import unittest
 import operator
+import weakref
+import itertools
+import StringIO
 
-from funpy.cons import ConsCell
+from funpy.cons import ConsCell, from_iterable
 from funpy.cons import IterativeConsCell, IterativeNil, iterative_from_iterable
 from funpy.cons import RecursiveConsCell, RecursiveNil, recursive_from_iterable
+from funpy.cons import SizedConsCell, SizedNil, sized_from_iterable
+from funpy.cons import UnrolledConsCell, UnrolledNil, unrolled_from_iterable
+from funpy.cons import UNROLLED_BLOCK_SIZE, STRINGIFY_LIMIT
+from funpy.cons import LazyConsCell, LazyNil, lazy_from_iterable
+from funpy.cons import InternedConsCell, InternedNil, interned_from_iterable
+from funpy.cons import ArrayNil, array_from_iterable
+from funpy.cons import parallel_map, parallel_reduce
+from funpy.ralist import SkewConsCell, SkewNil, skew_from_iterable
 
 class TestIterative:
     '''Base class for tests testing the iterative Cons implementation'''
@@ -41,19 +57,59 @@ class TestRecursive:
 
     from_iterable = staticmethod(recursive_from_iterable)
 
+class TestSized:
+    '''Base class for tests testing the sized Cons implementation'''
+    zero = SizedNil
+    unit = SizedConsCell
+
+    from_iterable = staticmethod(sized_from_iterable)
+
+class TestUnrolled:
+    '''Base class for tests testing the unrolled Cons implementation'''
+    zero = UnrolledNil
+    unit = UnrolledConsCell
+
+    from_iterable = staticmethod(unrolled_from_iterable)
+
+class TestLazy:
+    '''Base class for tests testing the lazy Cons implementation'''
+    zero = LazyNil
+    unit = LazyConsCell
+
+    from_iterable = staticmethod(lazy_from_iterable)
+
+class TestSkew:
+    '''Base class for tests testing the random-access Cons implementation'''
+    zero = SkewNil
+    unit = SkewConsCell
+
+    from_iterable = staticmethod(skew_from_iterable)
+
+class TestInterned:
+    '''Base class for tests testing the interned Cons implementation'''
+    zero = InternedNil
+    unit = InternedConsCell
+
+    from_iterable = staticmethod(interned_from_iterable)
+
 
 def case(test):
-    '''Create iterative and recursive tests from a given case
+    '''Create tests for all Cons implementations from a given case
 
     :param test: testcase implementation
     :type test: `unittest.TestCase`
 
-    :return: iterative and recursive testcases
-    :rtype: (class, class)
+    :return: testcases for every Cons implementation
+    :rtype: list
     '''
     types = (
         ('Iterative', TestIterative, ),
         ('Recursive', TestRecursive, ),
+        ('Sized', TestSized, ),
+        ('Unrolled', TestUnrolled, ),
+        ('Lazy', TestLazy, ),
+        ('Skew', TestSkew, ),
+        ('Interned', TestInterned, ),
     )
     suffix = test.__name__[len('Test'):]
 
@@ -91,7 +147,8 @@ class TestNil:
         self.assertRaises(IndexError, lambda: self.zero[0])
         self.assertRaises(IndexError, lambda: self.zero[1])
 
-TestIterativeNil, TestRecursiveNil = case(TestNil)
+(TestIterativeNil, TestRecursiveNil, TestSizedNil, TestUnrolledNil,
+ TestLazyNil, TestSkewNil, TestInternedNil) = case(TestNil)
 del TestNil
 
 
@@ -139,6 +196,73 @@ class TestCons:
 
         self.assertEquals(str(list_), 'cons(3, cons(2, cons(1, Nil)))')
 
+    def test_repr(self):
+        '''Assert only the items of a cons list are quoted by repr'''
+        list_ = self.unit('a', self.unit(1, self.zero))
+
+        self.assertEquals(repr(list_), "cons('a', cons(1, Nil))")
+
+    def test_unicode(self):
+        '''Assert a cons list can be turned into a unicode string'''
+        list_ = self.unit(u'\xe9', self.unit(1, self.zero))
+
+        self.assertEquals(unicode(list_), u'cons(\xe9, cons(1, Nil))')
+        self.assert_(isinstance(unicode(list_), unicode))
+
+    def test_write(self):
+        '''Assert a cons list can be written to a file'''
+        list_ = self.test_creation()
+
+        file_ = StringIO.StringIO()
+        list_.write(file_)
+        self.assertEquals(file_.getvalue(), str(list_))
+
+        file_ = StringIO.StringIO()
+        list_.write(file_, repr)
+        self.assertEquals(file_.getvalue(), repr(list_))
+
+        file_ = StringIO.StringIO()
+        self.zero.write(file_)
+        self.assertEquals(file_.getvalue(), 'Nil')
+
+    def test_write_limit(self):
+        '''Assert the items of a long cons list beyond a limit are elided'''
+        list_ = self.from_iterable(range(10))
+
+        file_ = StringIO.StringIO()
+        list_.write(file_, limit=5)
+        #pylint: disable-msg=W0212
+        if list_._length_hint() is None:
+            expected = 'cons(0, cons(1, cons(2, cons(3, cons(4, ..., Nil' \
+                    ')))))'
+        else:
+            expected = 'cons(0, cons(1, cons(2, ..., cons(8, cons(9, Nil' \
+                    ')))))'
+        self.assertEquals(file_.getvalue(), expected)
+
+        file_ = StringIO.StringIO()
+        list_.write(file_, limit=10)
+        self.assertEquals(file_.getvalue(),
+                          'cons(0, cons(1, cons(2, cons(3, cons(4, '
+                          'cons(5, cons(6, cons(7, cons(8, cons(9, Nil'
+                          '))))))))))')
+
+        file_ = StringIO.StringIO()
+        list_.write(file_, limit=0)
+        self.assertEquals(file_.getvalue(), '..., Nil')
+
+        self.assertRaises(ValueError, list_.write, file_, limit=-1)
+
+    def test_str_limit(self):
+        '''Assert stringifying a long cons list elides items'''
+        list_ = self.from_iterable(range(STRINGIFY_LIMIT + 1))
+        str_ = str(list_)
+
+        self.assert_(str_.startswith('cons(0, cons(1, '))
+        self.assert_(str_.endswith('Nil%s' % (')' * STRINGIFY_LIMIT)))
+        self.assertEquals(str_.count('cons('), STRINGIFY_LIMIT)
+        self.assertEquals(str_.count('...'), 1)
+
     def test_equality(self):
         '''Assert equality testing on cons lists works as expected'''
         self.assertEquals(self.test_creation(), self.test_creation())
@@ -163,6 +287,37 @@ class TestCons:
 
         self.assertNotEquals(hash(list1), hash(self.zero))
 
+    def test_hash_cached(self):
+        '''Assert the hash value of a cell is only calculated once'''
+        counter = [0]
+
+        class Counted(object):
+            '''Value counting calls to its hash function'''
+            def __hash__(self):
+                counter[0] += 1
+                return 1
+
+        list_ = self.unit(Counted(), self.unit(Counted(), self.zero))
+
+        self.assertEquals(hash(list_), hash(list_))
+        self.assertEquals(counter[0], 2)
+
+        self.assertEquals(hash(list_.tail), hash(list_.tail))
+        self.assertEquals(counter[0], 2)
+
+    def test_shared_tail_equality(self):
+        '''Assert equality checking stops at a tail shared by both lists'''
+        class Incomparable(object):
+            '''Value which can't be compared'''
+            def __eq__(self, other):
+                raise AssertionError('Shared tail should not be compared')
+            __ne__ = __eq__
+
+        tail = self.unit(Incomparable(), self.zero)
+
+        self.assertEquals(tail << 1, tail << 1)
+        self.assertNotEquals(tail << 1, tail << 2)
+
     def test_shift(self):
         '''Assert a cons list can be created using '<<\''''
         list1 = self.test_creation()
@@ -220,7 +375,8 @@ class TestCons:
         self.assert_(self.unit(1, self.unit(2, self.zero)) != \
                      self.unit(1, self.zero))
 
-TestIterativeCons, TestRecursiveCons = case(TestCons)
+(TestIterativeCons, TestRecursiveCons, TestSizedCons, TestUnrolledCons,
+ TestLazyCons, TestSkewCons, TestInternedCons) = case(TestCons)
 del TestCons
 
 
@@ -240,6 +396,34 @@ class TestFromIterable:
 
         self.assertEquals(self.from_iterable(list1), self.from_iterable(list1))
 
+    def test_from_generator(self):
+        '''Assert a cons list can be created from a generator'''
+        list1 = self.from_iterable(i * 2 for i in xrange(10))
+        list2 = self.from_iterable(range(0, 20, 2))
+
+        self.assertEquals(list1, list2)
+        self.assertEquals(len(list1), 10)
+        self.assertEquals(list1[-1], 18)
+
+    def test_from_file(self):
+        '''Assert a cons list can be created from a file-like object'''
+        list_ = self.from_iterable(StringIO.StringIO('a\nb\nc\n'))
+
+        self.assertEquals(list(list_), ['a\n', 'b\n', 'c\n'])
+
+    def test_other_unit(self):
+        '''Assert lists can be built using any unit function'''
+        build = from_iterable(lambda head, tail: self.unit(head, tail),
+                              self.zero)
+
+        self.assertEquals(build(i * 2 for i in xrange(10)),
+                          self.from_iterable(range(0, 20, 2)))
+        self.assert_(build(iter([])) is self.zero)
+
+    def test_from_empty(self):
+        '''Assert an empty iterable results in Nil'''
+        self.assert_(self.from_iterable(iter([])) is self.zero)
+
     def test_inverse(self):
         '''Assert list . from_iterable results in an equal list'''
         list1 = [1, 3, 5, 7, 9, 8, 6, 4, 2]
@@ -248,10 +432,26 @@ class TestFromIterable:
 
         self.assertEquals(list1, list3)
 
-TestIterativeFromIterable, TestRecursiveFromIterable = case(TestFromIterable)
+(TestIterativeFromIterable, TestRecursiveFromIterable, TestSizedFromIterable,
+ TestUnrolledFromIterable, TestLazyFromIterable,
+ TestSkewFromIterable, TestInternedFromIterable) = case(TestFromIterable)
 del TestFromIterable
 
 
+class TestFromIterableHelper(unittest.TestCase):
+    '''Test the `from_iterable` helper'''
+    def test_opt_in(self):
+        '''Assert cells are only linked in place for classes opting in'''
+        for (unit, zero) in ((SkewConsCell, SkewNil),
+                             (InternedConsCell, InternedNil),
+                             (LazyConsCell, LazyNil)):
+            build = from_iterable(unit, zero)
+
+            self.assertEquals(list(build([1, 2, 3])), [1, 2, 3])
+            self.assertEquals(list(build([1, 1, 1])), [1, 1, 1])
+            self.assertEquals(list(zero << 1), [1])
+
+
 class TestBuiltins:
     def setUp(self):
         self.list_ = self.unit(1, self.unit(2, self.unit(3, self.unit(4,
@@ -271,7 +471,9 @@ class TestBuiltins:
         fun = lambda iterable: filter(lambda p: p % 2 == 0, iterable)
         self.assertEquals(fun(self.list_), fun(xrange(1, 6)))
 
-TestIterativeBuiltins, TestRecursiveBuiltins = case(TestBuiltins)
+(TestIterativeBuiltins, TestRecursiveBuiltins, TestSizedBuiltins,
+ TestUnrolledBuiltins, TestLazyBuiltins,
+ TestSkewBuiltins, TestInternedBuiltins) = case(TestBuiltins)
 del TestBuiltins
 
 
@@ -292,6 +494,543 @@ class TestMixedTypes(unittest.TestCase):
         self.assertEquals(list2, recursive_from_iterable(list2))
         self.assertEquals(list3, iterative_from_iterable(list3))
 
+    def test_hash(self):
+        '''Assert iterative and recursive cons lists hash equally'''
+        list1 = range(100)
+
+        self.assertEquals(hash(iterative_from_iterable(list1)),
+                          hash(recursive_from_iterable(list1)))
+        self.assertEquals(hash(sized_from_iterable(list1)),
+                          hash(recursive_from_iterable(list1)))
+
+
+class TestSizedLength(unittest.TestCase):
+    '''Test length bookkeeping of sized cons lists'''
+    def test_shared_tail(self):
+        '''Assert cells sharing a tail each know their own length'''
+        tail = sized_from_iterable(range(10))
+        list1 = tail << 1
+        list2 = list1 << 2
+
+        self.assertEquals(len(tail), 10)
+        self.assertEquals(len(list1), 11)
+        self.assertEquals(len(list2), 12)
+        self.assertEquals(len(list2.tail.tail), 10)
+
+    def test_negative_index(self):
+        '''Assert negative indices are resolved against the stored length'''
+        list_ = sized_from_iterable(range(100))
+
+        self.assertEquals(list_[-1], 99)
+        self.assertEquals(list_[-100], 0)
+        self.assertRaises(IndexError, lambda: list_[-101])
+        self.assertRaises(IndexError, lambda: list_[100])
+
+
+class TestUnrolledBlocks(unittest.TestCase):
+    '''Test block handling of unrolled cons lists'''
+    def setUp(self):
+        self.items = range(3 * UNROLLED_BLOCK_SIZE + 5)
+        self.list_ = unrolled_from_iterable(self.items)
+
+    def test_roundtrip(self):
+        '''Assert items spanning several blocks are retained in order'''
+        self.assertEquals(list(self.list_), self.items)
+        self.assertEquals(len(self.list_), len(self.items))
+
+    def test_index(self):
+        '''Assert indexing works across block boundaries'''
+        for index in xrange(-len(self.items), len(self.items)):
+            self.assertEquals(self.list_[index], self.items[index])
+
+        self.assertRaises(IndexError, lambda: self.list_[len(self.items)])
+
+    def test_tail(self):
+        '''Assert tails share the block of their parent cell'''
+        tail = self.list_.tail
+
+        #pylint: disable-msg=W0212
+        self.assert_(tail._block is self.list_._block)
+        self.assertEquals(list(tail), self.items[1:])
+        self.assertEquals(tail, unrolled_from_iterable(self.items[1:]))
+        self.assertEquals(hash(tail),
+                          hash(iterative_from_iterable(self.items[1:])))
+
+    def test_tail_not_kept(self):
+        '''Assert cells don't keep the views created as their tail alive'''
+        self.assert_(self.list_.tail is not self.list_.tail)
+        self.assertEquals(self.list_.tail, self.list_.tail)
+
+    def test_shift(self):
+        '''Assert prepending fills up partial blocks'''
+        list_ = self.list_
+        for i in xrange(2 * UNROLLED_BLOCK_SIZE):
+            list_ <<= i
+
+        self.assertEquals(list(list_),
+                          range(2 * UNROLLED_BLOCK_SIZE - 1, -1, -1) +
+                          self.items)
+        self.assertEquals(list_, iterative_from_iterable(list(list_)))
+
+    def test_hash_shared(self):
+        '''Assert tails reuse the hashes calculated for their block'''
+        counter = [0]
+
+        class Counted(object):
+            '''Value counting calls to its hash function'''
+            def __hash__(self):
+                counter[0] += 1
+                return 1
+
+        for first in (lambda list_: list_, lambda list_: list_.tail):
+            counter[0] = 0
+            list_ = unrolled_from_iterable(Counted() for _ in self.items)
+
+            hash(first(list_))
+            cell = list_
+            while cell:
+                hash(cell)
+                cell = cell.tail
+
+            self.assertEquals(counter[0], len(self.items))
+
+
+class TestCombinators:
+    '''Test list combinators'''
+    def setUp(self):
+        self.list_ = self.from_iterable(range(1, 6))
+
+    def test_map(self):
+        '''Assert a function can be mapped over a list'''
+        result = self.list_.map(lambda x: x * 2)
+
+        self.assertEquals(list(result), [2, 4, 6, 8, 10])
+        self.assertEquals(result, self.from_iterable([2, 4, 6, 8, 10]))
+        self.assertEquals(len(result), 5)
+        self.assertEquals(result.head, 2)
+        self.assertEquals(list(result.tail), [4, 6, 8, 10])
+        self.assertEquals(str(result), str(self.from_iterable(result)))
+        self.assert_(isinstance(result.force(), self.unit))
+
+    def test_filter(self):
+        '''Assert a list can be filtered'''
+        result = self.list_.filter(lambda x: x % 2)
+
+        self.assertEquals(list(result), [1, 3, 5])
+        self.assertEquals(result, self.from_iterable([1, 3, 5]))
+        self.assert_(self.list_.filter(lambda _: False).force() is self.zero)
+
+    def test_fold(self):
+        '''Assert the items of a list can be folded'''
+        self.assertEquals(self.list_.fold(operator.add, 0), 15)
+        self.assertEquals(self.list_.fold(lambda a, b: a + [b], []),
+                          [1, 2, 3, 4, 5])
+        self.assertEquals(self.zero.fold(operator.add, 0), 0)
+
+    def test_fused(self):
+        '''Assert chained calls are applied in a single pass when folding'''
+        calls = list()
+
+        def double(value):
+            '''Double a value, recording the call'''
+            calls.append(('map', value))
+            return value * 2
+
+        def small(value):
+            '''Test whether a value is small, recording the call'''
+            calls.append(('filter', value))
+            return value < 7
+
+        pipeline = self.list_.map(double).filter(small)
+        self.assertEquals(calls, [])
+
+        self.assertEquals(pipeline.fold(operator.add, 0), 2 + 4 + 6)
+        self.assertEquals(calls[:4], [('map', 1), ('filter', 2),
+                                      ('map', 2), ('filter', 4)])
+        self.assertEquals(len(calls), 10)
+
+    def test_reverse(self):
+        '''Assert a list can be reversed'''
+        self.assertEquals(self.list_.reverse(),
+                          self.from_iterable([5, 4, 3, 2, 1]))
+        self.assertEquals(self.list_.map(str).reverse(),
+                          self.from_iterable(['5', '4', '3', '2', '1']))
+        self.assert_(self.zero.reverse() is self.zero)
+
+    def test_append(self):
+        '''Assert lists can be appended, sharing the second one'''
+        other = self.from_iterable([6, 7])
+        result = self.list_.append(other)
+
+        self.assertEquals(list(result), range(1, 8))
+        self.assertEquals(result.tail.tail.tail.tail.tail, other)
+
+        result = self.list_.filter(lambda x: x > 4).append(other)
+        self.assertEquals(list(result), [5, 6, 7])
+        self.assert_(self.zero.append(other) is other)
+
+    def test_zip(self):
+        '''Assert lists can be zipped'''
+        result = self.list_.zip('abc')
+
+        self.assertEquals(list(result), [(1, 'a'), (2, 'b'), (3, 'c')])
+        self.assertEquals(list(self.list_.map(str).zip(self.list_)),
+                          [(str(i), i) for i in xrange(1, 6)])
+        self.assert_(self.zero.zip(self.list_) is self.zero)
+
+(TestIterativeCombinators, TestRecursiveCombinators, TestSizedCombinators,
+ TestUnrolledCombinators, TestLazyCombinators, TestSkewCombinators,
+ TestInternedCombinators) = case(TestCombinators)
+del TestCombinators
+
+
+class TestLazyStreams(unittest.TestCase):
+    '''Test evaluation of lazy cons lists'''
+    def test_infinite(self):
+        '''Assert an infinite iterable can be wrapped'''
+        list_ = lazy_from_iterable(itertools.count())
+
+        self.assertEquals(list_.head, 0)
+        self.assertEquals(list_[10], 10)
+        self.assertEquals(list(list_.take(5)), range(5))
+        self.assertEquals(list_.drop(5).head, 5)
+
+    def test_str_infinite(self):
+        '''Assert infinite lists are stringified up to the limit only'''
+        consumed = list()
+
+        def generator():
+            '''Generator recording the items it produced'''
+            for i in itertools.count():
+                consumed.append(i)
+                yield i
+
+        str_ = str(lazy_from_iterable(generator()))
+
+        self.assert_(str_.endswith('cons(%d, ..., Nil%s' % (
+            STRINGIFY_LIMIT - 1, ')' * STRINGIFY_LIMIT)))
+        self.assertEquals(len(consumed), STRINGIFY_LIMIT + 1)
+
+    def test_compare_infinite(self):
+        '''Assert finite lists compare unequal to infinite lists'''
+        infinite = lazy_from_iterable(itertools.count())
+
+        for build in (iterative_from_iterable, recursive_from_iterable,
+                      sized_from_iterable, unrolled_from_iterable,
+                      skew_from_iterable, array_from_iterable):
+            list_ = build(range(3 * UNROLLED_BLOCK_SIZE))
+
+            self.assertNotEquals(list_, infinite)
+            self.assertNotEquals(infinite, list_)
+
+    def test_prefix_only(self):
+        '''Assert only the consumed prefix of an iterable is retrieved'''
+        consumed = list()
+
+        def generator():
+            '''Generator recording the items it produced'''
+            for i in itertools.count():
+                consumed.append(i)
+                yield i
+
+        list_ = lazy_from_iterable(generator())
+        self.assertEquals(consumed, [0])
+
+        taken = list_.take(3)
+        self.assertEquals(consumed, [0])
+
+        self.assertEquals(list(taken), [0, 1, 2])
+        self.assertEquals(consumed, [0, 1, 2])
+
+        self.assertEquals(list_.drop(4).head, 4)
+        self.assertEquals(consumed, range(5))
+
+    def test_memoized(self):
+        '''Assert a thunk is only evaluated once'''
+        calls = list()
+
+        def thunk():
+            '''Thunk recording its calls'''
+            calls.append(None)
+            return LazyNil << 2
+
+        list_ = LazyConsCell(1, thunk)
+        self.assertEquals(calls, [])
+
+        self.assertEquals(list_.tail.head, 2)
+        self.assertEquals(list_.tail.head, 2)
+        self.assertEquals(list(list_), [1, 2])
+        self.assertEquals(len(calls), 1)
+
+    def test_short(self):
+        '''Assert take and drop stop at the end of the list'''
+        list_ = lazy_from_iterable(range(3))
+
+        self.assertEquals(list(list_.take(5)), range(3))
+        self.assert_(list_.drop(5) is LazyNil)
+        self.assert_(list_.take(0) is LazyNil)
+
+
+class TestInterning(unittest.TestCase):
+    '''Test sharing of interned cons lists'''
+    def test_identity(self):
+        '''Assert equal interned lists are the same object'''
+        list1 = interned_from_iterable(range(10))
+        list2 = InternedNil
+        for i in xrange(9, -1, -1):
+            list2 <<= i
+
+        self.assert_(list1 is list2)
+        self.assert_(list1.tail is interned_from_iterable(range(1, 10)))
+
+    def test_types(self):
+        '''Assert equal heads of different types aren't merged'''
+        list1 = InternedNil << 1
+        list2 = InternedNil << 1.0
+
+        self.assert_(list1 is not list2)
+        self.assert_(type(list2.head) is float)
+        self.assertEquals(list1, list2)
+        self.assertEquals(hash(list1), hash(list2))
+
+    def test_unhashable(self):
+        '''Assert unhashable heads result in distinct, equal cells'''
+        list1 = InternedNil << [1] << 2
+        list2 = InternedNil << [1] << 2
+
+        self.assert_(list1 is not list2)
+        self.assertEquals(list1, list2)
+
+    def test_weak(self):
+        '''Assert interned cells don't outlive their users'''
+        list_ = interned_from_iterable([object()])
+        reference = weakref.ref(list_)
+
+        del list_
+        gc.collect()
+        self.assert_(reference() is None)
+
+    def test_other_classes(self):
+        '''Assert interning doesn't affect other implementations'''
+        self.assert_((IterativeNil << 1) is not (IterativeNil << 1))
+
+
+class TestArray(unittest.TestCase):
+    '''Test array-backed cons lists'''
+    def setUp(self):
+        self.array = array.array('l', xrange(100))
+        self.list_ = array_from_iterable(self.array)
+
+    def test_zero_copy(self):
+        '''Assert an array and the tails of its list are shared'''
+        #pylint: disable-msg=W0212
+        self.assert_(self.list_._block is self.array)
+        self.assert_(self.list_.tail.tail._block is self.array)
+
+    def test_cons(self):
+        '''Assert array-backed lists behave like other cons lists'''
+        self.assertEquals(len(self.list_), 100)
+        self.assertEquals(list(self.list_), range(100))
+        self.assertEquals(self.list_[-1], 99)
+        self.assert_(50 in self.list_)
+        self.assert_(100 not in self.list_)
+        self.assertEquals(self.list_, iterative_from_iterable(range(100)))
+        self.assertEquals(hash(self.list_.tail),
+                          hash(iterative_from_iterable(range(1, 100))))
+        self.assertEquals(str(array_from_iterable([1, 2], 'l')),
+                          'cons(1, cons(2, Nil))')
+
+    def test_shift(self):
+        '''Assert items can be prepended to array-backed lists'''
+        list_ = self.list_ << -1 << 2.5
+
+        self.assertEquals(list(list_), [2.5, -1] + range(100))
+        self.assertEquals(len(list_), 102)
+        self.assertEquals(list_.tail.tail, self.list_)
+
+        self.assertEquals(list(ArrayNil << 1 << 2.5), [2.5, 1])
+        self.assert_(type((ArrayNil << 1).head) is int)
+
+    def test_boxed(self):
+        '''Assert items which don't fit in an array are boxed'''
+        list_ = self.list_ << 2 ** 70 << 1
+
+        self.assertEquals(list(list_), [1, 2 ** 70] + range(100))
+        self.assertEquals(list_.tail.tail, self.list_)
+        self.assertEquals(list(list_.map(lambda x: x + 1)),
+                          [2, 2 ** 70 + 1] + range(1, 101))
+        self.assertEquals(list(list_.reverse()),
+                          range(99, -1, -1) + [2 ** 70, 1])
+        self.assertEquals(pickle.loads(pickle.dumps(list_)), list_)
+        self.assertEquals(list(ArrayNil << 'a'), ['a'])
+
+    def test_infer_typecode(self):
+        '''Assert the typecode of new arrays is inferred from the items'''
+        #pylint: disable-msg=W0212
+        self.assertEquals(array_from_iterable([1, 2])._block.typecode, 'l')
+        self.assertEquals(array_from_iterable([1, 2.5])._block.typecode,
+                          'd')
+        self.assertEquals(list(array_from_iterable([7, 3]).map(
+            lambda x: x / 2)), [3, 1])
+        self.assertEquals(array_from_iterable([1], 'd')._block.typecode,
+                          'd')
+
+    def test_sum(self):
+        '''Assert the items of a list can be summed'''
+        self.assertEquals(self.list_.sum(), sum(xrange(100)))
+        self.assertEquals(self.list_.tail.sum(), sum(xrange(100)))
+        self.assertEquals((self.list_ << 5).sum(), sum(xrange(100)) + 5)
+        self.assertEquals(ArrayNil.sum(), 0)
+
+    def test_fold(self):
+        '''Assert the items of a list can be folded'''
+        self.assertEquals(self.list_.fold(operator.add, 0), sum(xrange(100)))
+        self.assertEquals(self.list_.fold(max, -1), 99)
+        self.assertEquals(ArrayNil.fold(operator.add, 1), 1)
+
+    def test_map(self):
+        '''Assert a function can be mapped over a list'''
+        result = self.list_.map(lambda x: x * 2)
+
+        self.assertEquals(list(result), range(0, 200, 2))
+        self.assertEquals(list(self.list_.map(lambda x: x / 2.0, 'd')),
+                          [x / 2.0 for x in xrange(100)])
+
+    def test_map_typecode(self):
+        '''Assert mapping infers the typecode from the results'''
+        #pylint: disable-msg=W0212
+        result = self.list_.map(lambda x: x / 2.0)
+        self.assertEquals(list(result), [x / 2.0 for x in xrange(100)])
+        self.assertEquals(result._block.typecode, 'd')
+
+        self.assertEquals(self.list_.map(lambda x: x * 2)._block.typecode,
+                          'l')
+
+        result = self.list_.map(str)
+        self.assertEquals(list(result), [str(x) for x in xrange(100)])
+        self.assert_(isinstance(result, IterativeConsCell))
+
+    def test_unrolled_equality(self):
+        '''Assert array-backed lists equal unrolled lists'''
+        items = [float(x) for x in xrange(UNROLLED_BLOCK_SIZE * 3)]
+        list_ = array_from_iterable(items)
+        unrolled = unrolled_from_iterable(items)
+
+        self.assertEquals(list_, unrolled)
+        self.assertEquals(unrolled, list_)
+        self.assertEquals(list_.tail, unrolled.tail)
+        self.assertEquals(hash(list_), hash(unrolled))
+        self.assertNotEquals(list_.tail, unrolled)
+        self.assertNotEquals(unrolled_from_iterable(items[:-1] + [-1.]),
+                             list_)
+
+    def test_filter(self):
+        '''Assert a list can be filtered'''
+        result = self.list_.filter(lambda x: x % 2)
+
+        self.assertEquals(list(result), range(1, 100, 2))
+        self.assert_(self.list_.filter(lambda _: False) is ArrayNil)
+
+    def test_reverse(self):
+        '''Assert a list can be reversed into an array of the same type'''
+        result = self.list_.reverse()
+
+        self.assertEquals(list(result), range(99, -1, -1))
+        self.assertEquals(result._block.typecode, 'l')
+
+    def test_zip(self):
+        '''Assert a list can be zipped into an iterative list'''
+        self.assertEquals(self.list_.zip('ab'), iterative_from_iterable(
+            [(0, 'a'), (1, 'b')]))
+
+
+class TestRecursiveDepth(unittest.TestCase):
+    '''Test recursive cons lists don't exhaust the stack'''
+    def setUp(self):
+        self.items = range(sys.getrecursionlimit() * 10)
+        self.list_ = recursive_from_iterable(self.items)
+
+    def test_length(self):
+        '''Assert the length of a long list can be calculated'''
+        self.assertEquals(len(self.list_), len(self.items))
+
+    def test_index(self):
+        '''Assert the last item of a long list can be retrieved'''
+        self.assertEquals(self.list_[-1], self.items[-1])
+
+    def test_contains(self):
+        '''Assert the 'in' operator works on long lists'''
+        self.assert_(self.items[-1] in self.list_)
+        self.assert_(-1 not in self.list_)
+
+    def test_equality(self):
+        '''Assert long lists can be compared'''
+        self.assertEquals(self.list_, recursive_from_iterable(self.items))
+
+    def test_hash(self):
+        '''Assert the hash value of a long list can be calculated'''
+        self.assertEquals(hash(self.list_),
+                          hash(iterative_from_iterable(self.items)))
+
+    def test_combinators(self):
+        '''Assert combinators work on long lists'''
+        result = self.list_.map(lambda x: x + 1).filter(lambda x: x % 2)
+
+        self.assertEquals(result.fold(operator.add, 0),
+                          sum(x for x in xrange(1, len(self.items) + 1)
+                              if x % 2))
+        self.assertEquals(len(result.force()), len(self.items) // 2)
+        self.assertEquals(self.list_.reverse()[0], self.items[-1])
+        self.assertEquals(len(self.list_.append(self.list_)),
+                          2 * len(self.items))
+        self.assertEquals(len(self.list_.zip(self.list_)), len(self.items))
+
+    def test_str(self):
+        '''Assert a long list can be stringified'''
+        self.assertEquals(str(self.list_),
+                          str(iterative_from_iterable(self.items)))
+
+
+class TestParallel(unittest.TestCase):
+    '''Test parallel map and reduce'''
+    def setUp(self):
+        self.pool = multiprocessing.Pool(2)
+        self.items = range(1001)
+
+    def tearDown(self):
+        self.pool.close()
+        self.pool.join()
+
+    def test_map(self):
+        '''Assert mapping keeps the order and the implementation'''
+        for from_iterable in (iterative_from_iterable,
+                              recursive_from_iterable, sized_from_iterable,
+                              unrolled_from_iterable):
+            list_ = from_iterable(self.items)
+            result = parallel_map(operator.neg, list_, self.pool)
+
+            self.assertEquals(result, from_iterable([-x for x in self.items]))
+            self.assert_(type(result) is type(list_))
+
+    def test_reduce(self):
+        '''Assert reducing equals reducing sequentially'''
+        list_ = iterative_from_iterable(self.items)
+
+        self.assertEquals(parallel_reduce(operator.add, list_, 0, self.pool),
+                          sum(self.items))
+        self.assertEquals(parallel_reduce(operator.add, list_.tail, 0,
+                                          processes=2), sum(self.items[1:]))
+
+    def test_small(self):
+        '''Assert lists smaller than the number of chunks are handled'''
+        list_ = iterative_from_iterable('ab')
+
+        self.assertEquals(parallel_map(ord, list_, self.pool),
+                          iterative_from_iterable([97, 98]))
+        self.assert_(parallel_map(ord, IterativeNil) is IterativeNil)
+        self.assertEquals(parallel_reduce(operator.add, IterativeNil, 'x'),
+                          'x')
+
 
 # This fives us 100% coverage (for now), so why not...
 class VoidTest(unittest.TestCase):
@@ -19,7 +19,9 @@
 
 import unittest
 
-from funpy.maybe import Just, Nothing
+from funpy.maybe import Maybe, MaybeArray, Just, Nothing, pipeline, \
+        lift_pipeline
+from funpy.monad import liftM, BINARY_OPERATORS, UNARY_OPERATORS
 
 class TestMonadDiv(unittest.TestCase):
     '''Test Maybe division, the most obvious example'''
@@ -79,3 +81,168 @@ class TestNumericFunctions(unittest.TestCase):
         self.assertEquals(Just(10) + Nothing, Nothing)
         self.assertEquals(Nothing + 10, Nothing)
         self.assertEquals(Nothing + Nothing, Nothing)
+
+
+class TestPipeline(unittest.TestCase):
+    '''Test fused bind chains'''
+    funs = (lambda x: Just(x + 1), lambda x: Just(10 / x),
+            lambda x: Nothing if x > 5 else Just(x), lambda x: Just(x * 2))
+
+    def test_bind(self):
+        '''Assert pipelines result in the same values as chaining bind'''
+        for value in (Just(0), Just(-1), Just(1), Just(10), Just('a'),
+                      Nothing):
+            for count in xrange(len(self.funs) + 1):
+                funs = self.funs[:count]
+
+                expected = value
+                for fun in funs:
+                    expected = expected.bind(fun)
+
+                self.assertEquals(pipeline(*funs)(value), expected)
+                self.assertEquals(Maybe.pipeline(*funs)(value), expected)
+
+    def test_fallback(self):
+        '''Assert other results are chained using their bind'''
+        class Other(Just):
+            bind = lambda self, fun: Just(('other', fun(self._value)))
+
+        self.assertEquals(pipeline(lambda x: Other(x), lambda x: x)(Just(1)),
+                          Just(('other', 1)))
+        self.assertRaises(AttributeError, pipeline(lambda x: x, Just), Just(1))
+
+    def test_lift(self):
+        '''Assert lifted pipelines equal chaining liftM'''
+        funs = (lambda x: x + 1, lambda x: 10 / x, str)
+
+        for value in (Just(-1), Just(1), Just('a'), Nothing):
+            expected = value
+            for fun in funs:
+                expected = liftM(fun)(expected)
+
+            self.assertEquals(lift_pipeline(*funs)(value), expected)
+            self.assertEquals(Maybe.lift_pipeline(*funs)(value), expected)
+
+
+class TestMaybeArray(unittest.TestCase):
+    '''Test batches of Maybe values'''
+    def setUp(self):
+        self.maybes = [Just(1), Nothing, Just(0), Just(-4), Just(7)]
+        self.batch = MaybeArray.from_maybes(self.maybes, 'l')
+
+    def test_convert(self):
+        '''Assert batches convert from and to Maybe values'''
+        self.assertEquals(list(self.batch), self.maybes)
+        self.assertEquals(len(self.batch), len(self.maybes))
+        self.assertEquals(self.batch[1], Nothing)
+        self.assertEquals(self.batch[-1], Just(7))
+        self.assertEquals(self.batch.typecode, 'l')
+        self.assertEquals(list(self.batch.mask), [1, 0, 1, 1, 1])
+        self.assertEquals(MaybeArray([1, 2], [True, False]),
+                          MaybeArray.from_maybes([Just(1), Nothing]))
+        self.assertRaises(ValueError, lambda: MaybeArray([1], [1, 1]))
+
+    def test_operators(self):
+        '''Assert operators equal applying them to every Maybe value'''
+        operators = (lambda m: m + 1, lambda m: m * 2.5, lambda m: m // 2,
+                     lambda m: m / 0, lambda m: -m, lambda m: abs(m),
+                     lambda m: divmod(m, 3), lambda m: m ** 2,
+                     lambda m: m << 2, lambda m: ~m, lambda m: m + 'a',
+                     lambda m: 10 // m, lambda m: 2 - m,
+                     lambda m: m + Just(1))
+
+        for operator_ in operators:
+            self.assertEquals(list(operator_(self.batch)),
+                              [operator_(maybe) for maybe in self.maybes])
+
+    def test_default_typecode(self):
+        '''Assert operators equal applying them to every Maybe value when
+        the typecode is inferred'''
+        unwrap = lambda maybes: [(type(maybe._value), maybe._value)
+                                 if maybe is not Nothing else None
+                                 for maybe in maybes]
+
+        for maybes in (self.maybes, [Just(7), Nothing, Just(3)],
+                       [Just(1.5), Nothing, Just(-2.0)]):
+            batch = MaybeArray.from_maybes(maybes)
+            self.assertEquals(unwrap(batch), unwrap(maybes))
+
+            for (name, _) in BINARY_OPERATORS:
+                for (method, operands) in (('__%s__', (2, 2.5, Just(3))),
+                                           ('__r%s__', (2, 2.5))):
+                    method = method % name
+                    for operand in operands:
+                        self.assertEquals(
+                            unwrap(getattr(batch, method)(operand)),
+                            unwrap([getattr(maybe, method)(operand)
+                                    for maybe in maybes]))
+
+            for (name, fun) in UNARY_OPERATORS:
+                self.assertEquals(unwrap(fun(batch)),
+                                  unwrap([fun(maybe) for maybe in maybes]))
+
+    def test_batches(self):
+        '''Assert batches are combined element by element'''
+        other = MaybeArray.from_maybes([Just(2), Just(2), Nothing, Just(0),
+                                        Just(3)])
+
+        self.assertEquals(list(self.batch * other),
+                          [Just(2), Nothing, Nothing, Just(0), Just(21)])
+        self.assertEquals(list(self.batch % other),
+                          [Just(1), Nothing, Nothing, Nothing, Just(1)])
+        self.assertRaises(ValueError,
+                          lambda: self.batch + MaybeArray([1]))
+
+    def test_failing_rows(self):
+        '''Assert rows are calculated once when some of them fail'''
+        calls = list()
+
+        class Operand(object):
+            '''Operand counting the rows added to it'''
+            def __radd__(self, other):
+                calls.append(other)
+                if other == 0:
+                    raise ZeroDivisionError()
+                return other
+
+        self.assertEquals(list(self.batch + Operand()),
+                          [Just(1), Nothing, Nothing, Just(-4), Just(7)])
+        self.assertEquals(calls, [1, 0, -4, 7])
+
+    def test_mask_copied(self):
+        '''Assert results do not share the mask of their operands'''
+        result = self.batch + 1
+        self.assert_(result.mask is not self.batch.mask)
+        self.assertEquals(list(result.mask), list(self.batch.mask))
+
+    def test_slice(self):
+        '''Assert slicing a batch creates a batch'''
+        batch = self.batch[1:4]
+        self.assert_(isinstance(batch, MaybeArray))
+        self.assertEquals(list(batch), self.maybes[1:4])
+        self.assertEquals(batch.typecode, 'l')
+        self.assertEquals(list(self.batch[::-2]), self.maybes[::-2])
+        self.assertEquals(list(batch + 1), [Nothing, Just(1), Just(-3)])
+
+    def test_storage(self):
+        '''Assert results are stored in arrays if possible'''
+        self.assertEquals((self.batch + 1).typecode, 'l')
+        self.assertEquals((self.batch * 0.5).typecode, 'd')
+        self.assertEquals((self.batch + 2 ** 100).typecode, None)
+        self.assertEquals(list(self.batch + 2 ** 100),
+                          [maybe + 2 ** 100 for maybe in self.maybes])
+
+    def test_bind(self):
+        '''Assert functions are bound to every value'''
+        fun = lambda x: Just(x * 2) if x else Nothing
+        self.assertEquals(list(self.batch.bind(fun)),
+                          [maybe.bind(fun) for maybe in self.maybes])
+
+    def test_str(self):
+        '''Assert the representation lists all Maybe values'''
+        batch = MaybeArray.from_maybes([Just('a'), Nothing], None)
+
+        self.assertEquals(str(batch), 'MaybeArray([Just(a), Nothing])')
+        self.assertEquals(repr(batch), "MaybeArray([Just('a'), Nothing])")
+        self.assertEquals(unicode(batch), u'MaybeArray([Just(a), Nothing])')
+
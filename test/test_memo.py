@@ -0,0 +1,150 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for memoization'''
+
+import unittest
+
+from funpy.cons import iterative_from_iterable
+from funpy.maybe import Just, Nothing
+from funpy.memo import memoize
+
+class Counted(object):
+    '''Function counting its calls'''
+    def __init__(self, fun):
+        self.fun = fun
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.fun(*args, **kwargs)
+
+
+class TestMemoize(unittest.TestCase):
+    '''Test caching results'''
+    def test_cache(self):
+        '''Assert results are cached by argument value'''
+        fun = Counted(lambda list_, maybe: len(list_) + maybe)
+        memo = memoize()(fun)
+
+        list_ = iterative_from_iterable(range(100))
+        self.assertEquals(memo(list_, Just(1)), Just(101))
+        self.assertEquals(memo(iterative_from_iterable(range(100)),
+                               Just(1)), Just(101))
+        self.assertEquals(memo(list_.tail, Just(1)), Just(100))
+        self.assertEquals(memo(list_, Nothing), Nothing)
+        self.assertEquals(fun.calls, 3)
+
+        stats = memo.stats
+        self.assertEquals(stats['hits'], 1)
+        self.assertEquals(stats['misses'], 3)
+        self.assertEquals(stats['size'], 3)
+
+    def test_identity(self):
+        '''Assert calls with the same arguments are found by identity'''
+        memo = memoize()(len)
+        list_ = iterative_from_iterable(range(100))
+
+        memo(list_)
+        memo(list_)
+        memo(iterative_from_iterable(range(100)))
+
+        self.assertEquals(memo.stats['hits'], 2)
+        self.assertEquals(memo.stats['identity_hits'], 1)
+
+    def test_lru(self):
+        '''Assert the least recently used results are evicted'''
+        fun = Counted(lambda x: x * 2)
+        memo = memoize(maxsize=2)(fun)
+
+        memo(1)
+        memo(2)
+        memo(1)
+        memo(3)
+        self.assertEquals(fun.calls, 3)
+        memo(1)
+        self.assertEquals(fun.calls, 3)
+        memo(2)
+        self.assertEquals(fun.calls, 4)
+        self.assertEquals(memo.stats['evictions'], 2)
+        self.assertEquals(memo.stats['size'], 2)
+
+    def test_weight(self):
+        '''Assert results are evicted by total weight'''
+        weigh = lambda args, kwargs, result: len(result)
+        fun = Counted(lambda n: iterative_from_iterable(range(n)))
+        memo = memoize(maxsize=100, maxweight=10, weight=weigh)(fun)
+
+        memo(4)
+        memo(5)
+        self.assertEquals(memo.stats['weight'], 9)
+        memo(3)
+        self.assertEquals(memo.stats['weight'], 8)
+        memo(5)
+        memo(20)
+        self.assertEquals(fun.calls, 4)
+        self.assertEquals(memo.stats['size'], 2)
+        memo(20)
+        self.assertEquals(fun.calls, 5)
+
+    def test_arguments(self):
+        '''Assert keyword and unhashable arguments are handled'''
+        fun = Counted(lambda a, b=0: len(a) + b)
+        memo = memoize()(fun)
+
+        self.assertEquals(memo((1, ), b=2), 3)
+        self.assertEquals(memo((1, ), b=2), 3)
+        self.assertEquals(memo((1, ), 2), 3)
+        self.assertEquals(memo([1], b=2), 3)
+        self.assertEquals(memo([1], b=2), 3)
+
+        self.assertEquals(fun.calls, 4)
+        self.assertEquals(memo.stats['uncached'], 2)
+
+    def test_clear(self):
+        '''Assert clearing removes all results'''
+        fun = Counted(abs)
+        memo = memoize()(fun)
+
+        memo(-1)
+        memo.clear()
+        memo(-1)
+
+        self.assertEquals(fun.calls, 2)
+        self.assertEquals(memo.stats['misses'], 1)
+        self.assertEquals(memoize()(abs).__name__, 'abs')
+
+    def test_method(self):
+        '''Assert methods can be memoized'''
+        class Test(object):
+            '''Class with a memoized method'''
+            @memoize()
+            def double(self, value):
+                '''Double a value'''
+                return 2 * value
+
+        test = Test()
+        self.assertEquals(test.double(2), 4)
+        self.assertEquals(test.double(2), 4)
+        self.assertEquals(Test.double.stats['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
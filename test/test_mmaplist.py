@@ -0,0 +1,142 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for memory-mapped Cons lists'''
+
+import unittest
+import tempfile
+
+from funpy.cons import IterativeConsCell, iterative_from_iterable
+from funpy.mmaplist import MappedConsCell, MappedNil, load, save
+from funpy.serialize import dumps, loads
+
+class MappedTestCase(unittest.TestCase):
+    '''Base class for tests of mapped lists'''
+    def mapped(self, items, format_=None):
+        '''Save `items` to a temporary file and map it'''
+        file_ = tempfile.TemporaryFile()
+        save(items, file_, format_)
+        file_.flush()
+
+        list_ = load(file_)
+        file_.close()
+
+        return list_
+
+
+class TestFixed(MappedTestCase):
+    '''Test lists of fixed-width records'''
+    def setUp(self):
+        self.items = range(-500, 500)
+        self.list_ = self.mapped(self.items, '<q')
+
+    def test_items(self):
+        '''Assert the items are decoded from the mapping'''
+        self.assert_(isinstance(self.list_, MappedConsCell))
+        self.assertEquals(list(self.list_), self.items)
+        self.assertEquals(len(self.list_), len(self.items))
+        self.assertEquals(self.list_.head, -500)
+        self.assertEquals(self.list_.tail.head, -499)
+
+    def test_index(self):
+        '''Assert every item can be retrieved by index'''
+        for index in xrange(-len(self.items), len(self.items)):
+            self.assertEquals(self.list_[index], self.items[index])
+
+        self.assertRaises(IndexError, lambda: self.list_[len(self.items)])
+        self.assertRaises(IndexError,
+                          lambda: self.list_[-len(self.items) - 1])
+        self.assertRaises(TypeError, lambda: self.list_['a'])
+
+    def test_compare(self):
+        '''Assert mapped lists compare and hash like iterative lists'''
+        list_ = iterative_from_iterable(self.items)
+
+        self.assertEquals(self.list_, list_)
+        self.assertEquals(list_, self.list_)
+        self.assertEquals(hash(self.list_), hash(list_))
+        self.assertEquals(self.list_.tail, self.list_.tail)
+        self.assertNotEquals(self.list_.tail, self.list_)
+        self.assertEquals(str(self.list_.tail.tail), str(list_.tail.tail))
+        self.assert_(500 not in self.list_)
+        self.assert_(499 in self.list_)
+
+    def test_end(self):
+        '''Assert the list is terminated by MappedNil'''
+        cell = self.list_
+        for _ in self.items:
+            cell = cell.tail
+
+        self.assert_(cell is MappedNil)
+
+    def test_prepend(self):
+        '''Assert prepending creates an in-memory cell'''
+        list_ = self.list_ << 1
+
+        self.assert_(type(list_) is IterativeConsCell)
+        self.assert_(list_.tail is self.list_)
+        self.assertEquals(list(list_), [1] + self.items)
+        self.assertRaises(TypeError, lambda: MappedConsCell(1, MappedNil))
+
+    def test_serialize(self):
+        '''Assert mapped lists can be serialized'''
+        list_ = self.list_ << 1000
+        first, second = loads(dumps([list_, self.list_.tail]))
+
+        self.assertEquals(first, list_)
+        self.assertEquals(second, self.list_.tail)
+        self.assert_(isinstance(first.tail, IterativeConsCell))
+
+    def test_records(self):
+        '''Assert records with several fields are decoded into tuples'''
+        items = [(i, i / 2.) for i in xrange(10)]
+        self.assertEquals(list(self.mapped(items, '<id')), items)
+
+
+class TestPrefixed(MappedTestCase):
+    '''Test lists of length-prefixed strings'''
+    def test_items(self):
+        '''Assert strings of any length can be mapped'''
+        items = ['a' * i for i in xrange(100)] + ['\0\1\2']
+        list_ = self.mapped(items)
+
+        self.assertEquals(list(list_), items)
+        self.assertEquals(len(list_), len(items))
+        self.assertEquals(list_[50], items[50])
+        self.assertEquals(list_[-1], items[-1])
+        self.assertEquals(list_, iterative_from_iterable(items))
+        self.assertRaises(IndexError, lambda: list_[len(items)])
+
+    def test_empty(self):
+        '''Assert an empty list maps to MappedNil'''
+        self.assert_(self.mapped([]) is MappedNil)
+        self.assert_(self.mapped([], 'd') is MappedNil)
+
+    def test_invalid(self):
+        '''Assert other files are refused'''
+        file_ = tempfile.TemporaryFile()
+        file_.write('x' * 100)
+        file_.flush()
+
+        self.assertRaises(ValueError, lambda: load(file_))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for random-access lists'''
+
+import unittest
+
+from funpy.cons import iterative_from_iterable
+from funpy.ralist import SkewNil, skew_from_iterable
+
+class TestRandomAccess(unittest.TestCase):
+    '''Test indexing and updating random-access lists'''
+    def setUp(self):
+        self.items = range(1000)
+        self.list_ = skew_from_iterable(self.items)
+
+    def test_index(self):
+        '''Assert every item can be retrieved by index'''
+        for index in xrange(-len(self.items), len(self.items)):
+            self.assertEquals(self.list_[index], self.items[index])
+
+        self.assertRaises(IndexError, lambda: self.list_[len(self.items)])
+        self.assertRaises(IndexError,
+                          lambda: self.list_[-len(self.items) - 1])
+
+    def test_shift(self):
+        '''Assert prepending results in the same list as building it'''
+        list_ = SkewNil
+        for item in reversed(self.items):
+            list_ <<= item
+
+        self.assertEquals(list_, self.list_)
+        self.assertEquals(list(list_), self.items)
+        self.assertEquals(list_[500], 500)
+
+    def test_tail(self):
+        '''Assert the tails of a list are correct'''
+        list_ = self.list_
+        for index in xrange(len(self.items)):
+            self.assertEquals(list_.head, index)
+            self.assertEquals(len(list_), len(self.items) - index)
+            list_ = list_.tail
+
+        self.assert_(list_ is SkewNil)
+
+    def test_update(self):
+        '''Assert updating an item leaves the original list untouched'''
+        for index in (0, 1, 500, 999, -1):
+            updated = self.list_.update(index, 'x')
+
+            expected = list(self.items)
+            expected[index] = 'x'
+
+            self.assertEquals(list(updated), expected)
+            self.assertEquals(list(self.list_), self.items)
+
+        self.assertRaises(IndexError, lambda: self.list_.update(1000, 'x'))
+        self.assertRaises(IndexError, lambda: SkewNil.update(0, 'x'))
+
+    def test_update_shares(self):
+        '''Assert updating an item shares all other trees'''
+        #pylint: disable-msg=W0212
+        updated = self.list_.update(0, 'x')
+        self.assert_(updated._rest is self.list_._rest)
+
+    def test_mixed(self):
+        '''Assert random-access lists compare and hash like cons lists'''
+        list_ = iterative_from_iterable(self.items)
+
+        self.assertEquals(self.list_, list_)
+        self.assertEquals(list_, self.list_)
+        self.assertEquals(hash(self.list_), hash(list_))
+        self.assertEquals(hash(self.list_.tail), hash(list_.tail))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for serialization of Cons lists and Maybe values'''
+
+import pickle
+import struct
+import cPickle
+import unittest
+import StringIO
+
+from funpy.cons import IterativeNil, iterative_from_iterable
+from funpy.cons import RecursiveNil, recursive_from_iterable
+from funpy.cons import SizedNil, sized_from_iterable
+from funpy.cons import UnrolledNil, unrolled_from_iterable
+from funpy.cons import InternedNil, interned_from_iterable
+from funpy.cons import array_from_iterable
+from funpy.maybe import Just, Nothing
+from funpy.ralist import skew_from_iterable
+from funpy.serialize import dump, dumps, load, loads
+
+BUILDERS = (iterative_from_iterable, recursive_from_iterable,
+            sized_from_iterable, unrolled_from_iterable,
+            interned_from_iterable, skew_from_iterable)
+
+class TestPickle(unittest.TestCase):
+    '''Test pickling of Cons lists and Maybe values'''
+    def assertRoundtrip(self, value): #pylint: disable-msg=C0103
+        '''Assert a value survives pickling with all modules and protocols'''
+        for module in (pickle, cPickle):
+            for protocol in xrange(pickle.HIGHEST_PROTOCOL + 1):
+                result = module.loads(module.dumps(value, protocol))
+
+                self.assertEquals(result, value)
+                self.assert_(type(result) is type(value))
+
+    def test_lists(self):
+        '''Assert long lists of all implementations can be pickled'''
+        for builder in BUILDERS:
+            self.assertRoundtrip(builder(range(10000)))
+
+        self.assertRoundtrip(array_from_iterable(range(10000), 'l'))
+
+    def test_nil(self):
+        '''Assert Nil values remain singletons'''
+        for nil in (IterativeNil, RecursiveNil, SizedNil, InternedNil):
+            self.assert_(pickle.loads(pickle.dumps(nil)) is nil)
+            self.assert_(cPickle.loads(cPickle.dumps(nil, 2)) is nil)
+
+        list_ = cPickle.loads(cPickle.dumps(IterativeNil << 1, 2))
+        self.assert_(list_.tail is IterativeNil)
+
+    def test_maybe(self):
+        '''Assert Maybe values can be pickled'''
+        self.assertRoundtrip(Just(1))
+        self.assertRoundtrip(Just(iterative_from_iterable(range(10))))
+        self.assert_(pickle.loads(pickle.dumps(Nothing)) is Nothing)
+        self.assert_(cPickle.loads(cPickle.dumps(Nothing, 2)) is Nothing)
+
+    def test_pipeline(self):
+        '''Assert pipelines are pickled as their resulting list'''
+        list_ = iterative_from_iterable(range(10)).map(str)
+
+        self.assertEquals(pickle.loads(pickle.dumps(list_)),
+                          iterative_from_iterable(map(str, range(10))))
+
+
+class TestSerialize(unittest.TestCase):
+    '''Test the compact serialization format'''
+    def test_roundtrip(self):
+        '''Assert lists of all implementations can be serialized'''
+        lists = [builder(range(1000)) for builder in BUILDERS]
+        lists.append(UnrolledNil)
+        lists.append(RecursiveNil << Just(Nothing))
+
+        result = loads(dumps(lists))
+
+        self.assertEquals(result, lists)
+        self.assertEquals([type(list_) for list_ in result],
+                          [type(list_) for list_ in lists])
+        self.assert_(result[-2] is UnrolledNil)
+
+    def test_shared(self):
+        '''Assert tails shared within a dump are stored once and shared'''
+        tail = iterative_from_iterable(range(1000))
+        lists = [tail << i for i in xrange(100)]
+
+        single = dumps([tail])
+        data = dumps(lists)
+        self.assert_(len(data) < 2 * len(single))
+
+        result = loads(data)
+        self.assertEquals(result, lists)
+        for list_ in result[1:]:
+            self.assert_(list_.tail is result[0].tail)
+
+    def test_file(self):
+        '''Assert lists can be serialized to files'''
+        file_ = StringIO.StringIO()
+        dump([iterative_from_iterable('abc')], file_)
+
+        file_.seek(0)
+        self.assertEquals(load(file_), [iterative_from_iterable('abc')])
+
+    def test_portable(self):
+        '''Assert arrays are packed little-endian, in fixed sizes'''
+        data = cPickle.loads(dumps([iterative_from_iterable([1, 2])]))
+
+        self.assertEquals(data[5:], (struct.pack('<2H', 0, 0),
+                                     struct.pack('<2q', -1, 0),
+                                     struct.pack('<q', 1)))
+
+    def test_invalid(self):
+        '''Assert other pickles are refused'''
+        self.assertRaises(ValueError, lambda: loads(cPickle.dumps(1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for the trampoline'''
+
+import sys
+import unittest
+
+from funpy.trampoline import Call, call, done, run, then
+
+def count_down(count, acc):
+    '''Tail-recursive step summing the numbers up to `count`'''
+    if count == 0:
+        return done(acc)
+
+    return call(count_down, count - 1, acc + count)
+
+def factorial(count):
+    '''Non-tail-recursive step calculating the factorial of `count`'''
+    if count == 0:
+        return done(1)
+
+    return then(lambda result: done(result * count), factorial, count - 1)
+
+class TestRun(unittest.TestCase):
+    '''Test running trampolined algorithms'''
+    def setUp(self):
+        self.depth = sys.getrecursionlimit() * 10
+
+    def test_tail_call(self):
+        '''Assert tail calls don't grow the stack'''
+        self.assertEquals(run(count_down, self.depth, 0),
+                          sum(xrange(self.depth + 1)))
+
+    def test_continuation(self):
+        '''Assert continuations don't grow the stack'''
+        expected = reduce(lambda a, b: a * b, xrange(1, self.depth + 1))
+        self.assertEquals(run(factorial, self.depth), expected)
+
+    def test_call_result(self):
+        '''Assert a Call instance can be returned as a result'''
+        result = Call(None, tuple())
+        self.assert_(run(lambda: done(result)) is result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+# funpy, a library for functional programming in Python
+#
+# Copyright (C) 2009 Nicolas Trangez  <eikke eikke com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1
+# of the License.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA  02110-1301  USA
+
+
+'''Tests for persistent vectors'''
+
+import pickle
+import random
+import unittest
+
+from funpy.cons import IterativeNil, iterative_from_iterable
+from funpy.cons import recursive_from_iterable
+from funpy.vector import EmptyVector, SubVector, vector_from_iterable
+
+class TestVector(unittest.TestCase):
+    '''Test vector operations against a list'''
+    def setUp(self):
+        self.items = range(5000)
+        self.vector = vector_from_iterable(self.items)
+
+    def test_append(self):
+        '''Assert appending equals building from all items'''
+        vector = EmptyVector
+        for item in self.items:
+            vector = vector.append(item)
+
+        self.assertEquals(vector, self.vector)
+        self.assertEquals(list(vector), self.items)
+        self.assertEquals(len(vector), len(self.items))
+
+    def test_pop(self):
+        '''Assert removing the last items keeps the others'''
+        vector = self.vector
+        for count in xrange(len(self.items), 0, -1):
+            if count % 97 == 0:
+                self.assertEquals(list(vector), self.items[:count])
+
+            vector = vector.pop()
+
+        self.assert_(vector is EmptyVector)
+        self.assertRaises(IndexError, EmptyVector.pop)
+
+    def test_index(self):
+        '''Assert items can be retrieved by index'''
+        for index in xrange(-len(self.items), len(self.items), 7):
+            self.assertEquals(self.vector[index], self.items[index])
+
+        self.assertRaises(IndexError, lambda: self.vector[len(self.items)])
+        self.assertRaises(IndexError, lambda: EmptyVector[0])
+        self.assertRaises(TypeError, lambda: self.vector['a'])
+
+    def test_assoc(self):
+        '''Assert updates don't change earlier versions'''
+        rand = random.Random(1)
+        items = list(self.items)
+        vector = self.vector
+
+        for _ in xrange(500):
+            index = rand.randrange(-len(items), len(items))
+            vector = vector.assoc(index, -index)
+            items[index] = -index
+
+        self.assertEquals(list(vector), items)
+        self.assertEquals(list(self.vector), self.items)
+        self.assertRaises(IndexError,
+                          lambda: vector.assoc(len(items), None))
+
+    def test_slice(self):
+        '''Assert slices share the items of the vector'''
+        slice_ = self.vector[100:4000]
+
+        self.assert_(isinstance(slice_, SubVector))
+        self.assertEquals(list(slice_), self.items[100:4000])
+        self.assertEquals(list(slice_[10:-10]), self.items[110:3990])
+        self.assertEquals(list(slice_[::3]), self.items[100:4000:3])
+        self.assertEquals(list(reversed(slice_)), self.items[3999:99:-1])
+        self.assertEquals(slice_[-1], 3999)
+        self.assert_(self.vector[10:5] is EmptyVector)
+        self.assert_(self.vector[:] is self.vector)
+
+        self.assertEquals(list(slice_.append(1)), self.items[100:4000] + [1])
+        self.assertEquals(list(slice_.assoc(0, 'a')),
+                          ['a'] + self.items[101:4000])
+        self.assertEquals(list(slice_.pop()), self.items[100:3999])
+        self.assertEquals(list(self.vector), self.items)
+
+    def test_cons(self):
+        '''Assert vectors equal Cons lists holding the same items'''
+        list_ = iterative_from_iterable(self.items)
+
+        self.assertEquals(self.vector, list_)
+        self.assertEquals(list_, self.vector)
+        self.assertEquals(hash(self.vector), hash(list_))
+        self.assertEquals(hash(self.vector[1:]), hash(list_.tail))
+        self.assertNotEquals(self.vector.pop(), list_)
+        self.assertNotEquals(list_, self.vector.pop())
+        self.assertEquals(EmptyVector, IterativeNil)
+        self.assertEquals(hash(EmptyVector), hash(IterativeNil))
+
+    def test_convert(self):
+        '''Assert vectors convert from and to Cons lists'''
+        list_ = recursive_from_iterable(self.items)
+
+        self.assertEquals(vector_from_iterable(list_), self.vector)
+        self.assertEquals(self.vector.to_cons(), list_)
+        self.assert_(type(self.vector.to_cons(recursive_from_iterable)) is
+                     type(list_))
+
+    def test_pickle(self):
+        '''Assert vectors can be pickled'''
+        self.assertEquals(pickle.loads(pickle.dumps(self.vector)),
+                          self.vector)
+        self.assert_(pickle.loads(pickle.dumps(EmptyVector)) is EmptyVector)
+
+    def test_str(self):
+        '''Assert the representation lists all items'''
+        vector = vector_from_iterable(['a', 1])
+
+        self.assertEquals(str(vector), 'Vector([a, 1])')
+        self.assertEquals(repr(vector), "Vector(['a', 1])")
+        self.assertEquals(repr(EmptyVector), 'EmptyVector')
+        self.assertFalse(EmptyVector)
+        self.assert_(EmptyVector.empty)
+
+
+if __name__ == '__main__':
+    unittest.main()